@@ -1,10 +1,10 @@
-import os
-import logging
-from logging.handlers import RotatingFileHandler
+import atexit
 
 from flask import Flask
 from config import Config
-from mental_health import mental_health
+from mental_health.routes import mental_health
+from mental_health.services import log_pipeline, metrics, stress_engine
+from mental_health.services.conversation_store import create_conversation_store
 
 
 def create_app():
@@ -17,33 +17,31 @@ def create_app():
     app.secret_key = app.config.get("SECRET_KEY", "dev_secret_key")
 
     # ==============================
-    # Logging Setup
+    # Logging Setup (JSON lines, written by a background thread)
     # ==============================
-    log_dir = app.config.get("LOG_DIR", "logs")
-    os.makedirs(log_dir, exist_ok=True)
+    log_pipeline.init_app(app)
 
-    log_file_path = os.path.join(log_dir, "app.log")
-
-    file_handler = RotatingFileHandler(
-        log_file_path,
-        maxBytes=10240,      # 10KB per file
-        backupCount=5       # Keep 5 old logs
-    )
-
-    file_handler.setLevel(logging.INFO)
+    app.logger.info("Application started successfully.")
 
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-    )
-    file_handler.setFormatter(formatter)
+    # ==============================
+    # Metrics (/metrics, Prometheus text format)
+    # ==============================
+    if app.config.get("METRICS_ENABLED", True):
+        metrics.init_app(app)
 
-    # Avoid duplicate log handlers on reload
-    if not app.logger.handlers:
-        app.logger.addHandler(file_handler)
+    # ==============================
+    # Model Preload & Warm-up
+    # ==============================
+    stress_engine.init_app(app)
 
-    app.logger.setLevel(logging.INFO)
+    # ==============================
+    # Conversation Store
+    # ==============================
+    conversation_store = create_conversation_store(app.config)
+    app.extensions["conversation_store"] = conversation_store
 
-    app.logger.info("Application started successfully.")
+    # Flush buffered conversation writes on shutdown
+    atexit.register(conversation_store.close)
 
     # ==============================
     # Register Blueprints
@@ -0,0 +1,81 @@
+"""
+Throughput of bulk_score.py (rows/sec, end to end including pool start-up)
+for each worker count, on a synthetic CSV scored with a synthetic model.
+Speed-up is relative to the first worker count given.
+
+    python benchmarks/bench_bulk_score.py --rows 500000 --workers 1 2 4 8
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+
+from common import PROJECT_ROOT, build_synthetic_pipeline, synthetic_texts
+
+
+def run_bulk_score(input_path, output_path, model_path, workers, chunk_size) -> float:
+    start = time.perf_counter()
+
+    subprocess.run(
+        [
+            sys.executable, os.path.join(PROJECT_ROOT, "bulk_score.py"),
+            input_path, output_path,
+            "--id-column", "id",
+            "--model", model_path,
+            "--workers", str(workers),
+            "--chunk-size", str(chunk_size),
+            "--progress", "0",
+            "--restart"
+        ],
+        cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL
+    )
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bulk_bench_")
+    input_path = os.path.join(directory, "input.csv")
+    output_path = os.path.join(directory, "scores.csv")
+    model_path = os.path.join(directory, "stress_model_benchmark.pkl")
+
+    with open(model_path, "wb") as f:
+        pickle.dump(build_synthetic_pipeline(), f)
+
+    pd.DataFrame({
+        "id": range(args.rows),
+        "text": synthetic_texts(args.rows, words=40)
+    }).to_csv(input_path, index=False)
+
+    results = {"rows": args.rows, "cpus": os.cpu_count(), "runs": []}
+    baseline = None
+
+    for workers in args.workers:
+        seconds = run_bulk_score(input_path, output_path, model_path, workers, args.chunk_size)
+        rows_per_second = args.rows / seconds
+        baseline = baseline or rows_per_second
+
+        results["runs"].append({
+            "workers": workers,
+            "seconds": round(seconds, 2),
+            "rows_per_second": round(rows_per_second),
+            "speedup": round(rows_per_second / baseline, 2)
+        })
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Peak memory (max RSS) of the data path on a synthetic corpus: dataset
+preparation (parent process and its largest cleaning worker, cold ingest
+cache) and the training script's dataset load and train/test split. Each
+stage runs in a fresh interpreter.
+
+The corpus mimics the raw sources: the rows are split between the two
+CSV sources, plus a small Excel sheet.
+
+--ref runs the stages with train/ and mental_health/ as of a git commit
+(extracted with git archive). Commits before the Parquet data path load
+with load_labeled_texts + train_test_split; for example, the numbers
+before and after that change:
+
+    python benchmarks/bench_data_memory.py --rows 5000000 --ref 3c12b2c
+    python benchmarks/bench_data_memory.py --rows 5000000
+"""
+import io
+import os
+import sys
+import json
+import random
+import argparse
+import tarfile
+import tempfile
+import subprocess
+
+import pandas as pd
+
+from common import PROJECT_ROOT
+
+STATUSES = ["Normal", "Anxiety", "Depression", "Stress", "Suicidal", "Moderate", "Bipolar"]
+
+EXCEL_ROWS = 2000
+
+# Each stage prints its own resource usage as the last line (JSON)
+PREPARE = """
+import sys, json, resource
+sys.path.insert(0, {train_dir!r})
+sys.argv = ["prepare_stress_data.py", "--workers", "{workers}"]
+
+import prepare_stress_data as prep
+prep.DATA_PATH = {data_dir!r}
+prep.CACHE_DIR = {cache_dir!r}
+prep.main()
+
+print(json.dumps({{
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "worker_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+}}))
+"""
+
+LOAD = """
+import sys, json, resource
+sys.path.insert(0, {train_dir!r})
+
+try:
+    from train_stress_model import load_train_test_split
+except ImportError:
+    # Before the Parquet data path: whole-file load, then split
+    from sklearn.model_selection import train_test_split
+    from train_stress_model import load_labeled_texts
+
+    def load_train_test_split(path):
+        X, y = load_labeled_texts(path)
+        return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+X_train, X_test, y_train, y_test = load_train_test_split({path!r})
+
+print(json.dumps({{
+    "rows": len(X_train) + len(X_test),
+    "text_dtype": str(X_train.dtype),
+    "label_dtype": str(y_train.dtype),
+    "frame_mb": sum(
+        part.memory_usage(deep=True) for part in (X_train, X_test, y_train, y_test)
+    ) / 2 ** 20,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}}))
+"""
+
+
+# -----------------------------
+# Synthetic Corpus
+# -----------------------------
+def synthetic_rows(count, seed):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(20000)]
+
+    texts = [
+        " ".join(rng.choices(vocabulary, k=rng.randint(8, 40))).capitalize() + "."
+        for _ in range(count)
+    ]
+    labels = rng.choices(STATUSES, k=count)
+
+    return texts, labels
+
+
+def write_corpus(data_dir, rows):
+    first = rows // 2
+
+    for file_name, count, seed in (
+        ("mental_health_text_classification.csv", first, 1),
+        ("sentiment_analysis_mental_health.csv", rows - first, 2),
+    ):
+        texts, labels = synthetic_rows(count, seed)
+        pd.DataFrame({"statement": texts, "status": labels}).to_csv(
+            os.path.join(data_dir, file_name), index=False
+        )
+        del texts, labels
+
+    texts, labels = synthetic_rows(EXCEL_ROWS, 3)
+    pd.DataFrame({"text": texts, "label": labels}).to_excel(
+        os.path.join(data_dir, "student_depression_text.xlsx"), index=False
+    )
+
+
+# -----------------------------
+# Stages
+# -----------------------------
+def checkout(ref, directory):
+    """
+    Extract train/ and mental_health/ as of `ref` into `directory`.
+    """
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", ref, "train", "mental_health"],
+        cwd=PROJECT_ROOT, capture_output=True, check=True
+    ).stdout
+
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+    return directory
+
+
+def run_stage(code, root):
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+
+    return {
+        key: round(value, 1) if isinstance(value, float) else value
+        for key, value in json.loads(output.strip().splitlines()[-1]).items()
+    }
+
+
+def balanced_dataset(data_dir):
+    for name in ("balanced_stress_dataset.parquet", "balanced_stress_dataset.csv"):
+        path = os.path.join(data_dir, name)
+
+        if os.path.exists(path):
+            return path
+
+    raise FileNotFoundError(f"No balanced dataset in {data_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--keep", action="store_true", help="keep the temporary corpus")
+    parser.add_argument("--ref", help="git commit whose data path to measure (default: working tree)")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="data_memory_bench_")
+
+    root = PROJECT_ROOT
+
+    if args.ref:
+        root = checkout(args.ref, os.path.join(data_dir, "source"))
+
+    print(f"Writing {args.rows} synthetic rows to {data_dir}...", flush=True)
+    write_corpus(data_dir, args.rows)
+
+    train_dir = os.path.join(root, "train")
+
+    results = {"rows": args.rows + EXCEL_ROWS, "workers": args.workers, "ref": args.ref}
+
+    results["prepare"] = run_stage(PREPARE.format(
+        train_dir=train_dir,
+        workers=args.workers,
+        data_dir=data_dir,
+        cache_dir=os.path.join(data_dir, ".ingest_cache")
+    ), root)
+
+    path = balanced_dataset(data_dir)
+
+    results["load_and_split"] = run_stage(LOAD.format(train_dir=train_dir, path=path), root)
+    results["load_and_split"]["dataset"] = os.path.basename(path)
+
+    print(json.dumps(results, indent=4))
+
+    if not args.keep:
+        import shutil
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
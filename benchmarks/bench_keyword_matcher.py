@@ -0,0 +1,119 @@
+"""
+Keyword matching in the chatbot: the original per-lexicon substring
+checks versus chatbot_engine.analyze_message, and, over growing random
+lexicons, per-keyword substring checks versus one KeywordMatcher pass.
+The second table shows where the automaton starts to pay off
+(chatbot_engine.AUTOMATON_MIN_KEYWORDS).
+
+    python benchmarks/bench_keyword_matcher.py --calls 2000
+"""
+import argparse
+import json
+import random
+
+from common import long_texts, short_texts, time_calls
+
+from mental_health.services import chatbot_engine
+from mental_health.services.keyword_matcher import KeywordMatcher
+
+LEXICON_SIZES = [30, 100, 300, 1000, 3000]
+
+
+def legacy_detect_emotion_intensity(message):
+    if not isinstance(message, str):
+        return "Low"
+
+    message = message.lower()
+
+    for word in chatbot_engine.HIGH_INTENSITY_WORDS:
+        if word in message:
+            return "High"
+
+    for word in chatbot_engine.MODERATE_INTENSITY_WORDS:
+        if word in message:
+            return "Moderate"
+
+    return "Low"
+
+
+def legacy_detect_topic(message):
+    message = message.lower()
+
+    for topic, words in chatbot_engine.TOPIC_KEYWORDS.items():
+        if any(word in message for word in words):
+            return topic
+
+    return "general"
+
+
+def random_lexicon(size, seed=0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    return [
+        ("".join(rng.choices(letters, k=rng.randint(4, 10))), index % 7)
+        for index in range(size)
+    ]
+
+
+def compare_chatbot(calls):
+    results = {}
+
+    for name, texts in (("short", short_texts(calls)), ("long", long_texts(calls))):
+        for text in texts[:200]:
+            assert legacy_detect_emotion_intensity(text) == chatbot_engine.detect_emotion_intensity(text)
+            assert legacy_detect_topic(text) == chatbot_engine.detect_topic(text)
+
+        results[name] = {
+            "legacy_detect_emotion_intensity": time_calls(legacy_detect_emotion_intensity, texts),
+            "detect_emotion_intensity": time_calls(chatbot_engine.detect_emotion_intensity, texts),
+            "legacy_detect_topic": time_calls(legacy_detect_topic, texts),
+            "detect_topic": time_calls(chatbot_engine.detect_topic, texts),
+        }
+
+    return results
+
+
+def compare_lexicon_sizes(calls):
+    texts = [text.lower() for text in long_texts(max(100, calls // 10))]
+    results = {}
+
+    for size in LEXICON_SIZES:
+        lexicon = random_lexicon(size)
+        matcher = KeywordMatcher(lexicon)
+
+        def substring_scan(text, lexicon=lexicon):
+            return {tag for keyword, tag in lexicon if keyword in text}
+
+        for text in texts[:20]:
+            assert substring_scan(text) == matcher.match(text)
+
+        scan = time_calls(substring_scan, texts, warmup=10)
+        automaton = time_calls(matcher.match, texts, warmup=10)
+
+        results[size] = {
+            "substring_scan_p50_us": scan["p50_us"],
+            "automaton_p50_us": automaton["p50_us"],
+            "automaton_speedup": round(scan["p50_us"] / automaton["p50_us"], 2)
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {
+        "automaton_min_keywords": chatbot_engine.AUTOMATON_MIN_KEYWORDS,
+        "chatbot_lexicon_size": chatbot_engine.lexicon_size(),
+        "chatbot": compare_chatbot(args.calls),
+        "lexicon_sizes": compare_lexicon_sizes(args.calls)
+    }
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure predict_stress throughput under concurrent callers with and
+without the micro-batching scheduler.
+
+    python benchmarks/bench_micro_batching.py --threads 32 --calls 4000
+"""
+import time
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from common import build_synthetic_pipeline, synthetic_texts
+
+from mental_health.services import stress_engine
+
+
+def run_concurrent(texts, threads):
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(stress_engine.predict_stress, texts))
+
+    elapsed = time.perf_counter() - start
+
+    return results, {
+        "ops_per_sec": round(len(texts) / elapsed, 1),
+        "elapsed_s": round(elapsed, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    stress_engine.get_registry().install("synthetic", build_synthetic_pipeline())
+
+    # Measure the inference path itself, not prediction cache hits
+    stress_engine.configure_cache(max_size=0)
+
+    texts = synthetic_texts(args.calls)
+
+    stress_engine.configure_batcher(max_batch_size=1)
+    unbatched, results_unbatched = run_concurrent(texts, args.threads)
+
+    stress_engine.configure_batcher(
+        max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms
+    )
+    batched, results_batched = run_concurrent(texts, args.threads)
+
+    # Batching must not change any prediction
+    assert unbatched == batched
+
+    results = {
+        "threads": args.threads,
+        "unbatched": results_unbatched,
+        "micro_batched": results_batched,
+        "throughput_gain": round(
+            results_batched["ops_per_sec"] / results_unbatched["ops_per_sec"], 2
+        )
+    }
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Report per-worker unique memory (USS) of serve_prefork.py for 1, 4 and 16
+workers, with the model arrays shared (memory-mapped) and private (the
+unpickled objects, copied page by page as workers touch them).
+
+A synthetic model with a production-sized vocabulary is trained into a
+temporary MODEL_DIR; each server gets --requests-per-worker /analyze
+calls before its workers are measured. Linux only (/proc/<pid>/smaps_rollup).
+
+    python benchmarks/bench_prefork_memory.py --workers 1 4 16
+"""
+import os
+import sys
+import time
+import json
+import pickle
+import random
+import socket
+import argparse
+import tempfile
+import subprocess
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from common import PROJECT_ROOT
+
+
+# -----------------------------
+# Synthetic Model
+# -----------------------------
+def random_words(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    return sorted({
+        "".join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(count)
+    })
+
+
+def random_texts(words: list, count: int, length: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(words, k=length)) for _ in range(count)]
+
+
+def build_large_pipeline(words: list, max_features: int):
+    """
+    TF-IDF + LogisticRegression over random word-like tokens, so the
+    vocabulary reaches `max_features` like a model trained on real data.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    rng = random.Random(0)
+
+    texts = random_texts(words, 6000, length=30, seed=0)
+    labels = [rng.choice([0, 1, 2]) for _ in texts]
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(
+            max_features=max_features,
+            ngram_range=(1, 2),
+            stop_words="english",
+            lowercase=True
+        )),
+        ("clf", LogisticRegression(max_iter=200))
+    ])
+
+    return pipeline.fit(texts, labels)
+
+
+# -----------------------------
+# Process Memory
+# -----------------------------
+def memory_kb(pid: int) -> dict:
+    fields = {}
+
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+
+    return {
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "pss": fields.get("Pss", 0),
+        "rss": fields.get("Rss", 0)
+    }
+
+
+def child_pids(pid: int) -> list:
+    children = []
+
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(child) for child in f.read().split())
+
+    return children
+
+
+# -----------------------------
+# Load
+# -----------------------------
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_serving(port: int, timeout: float = 120) -> None:
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def analyze(port: int, text: str) -> int:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    try:
+        connection.request(
+            "POST",
+            "/mental_health/analyze",
+            body=urlencode({"text": text, "age_group": "Adult"}),
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+def measure(workers: int, share: bool, model_dir: str, texts: list) -> dict:
+    port = free_port()
+
+    env = dict(
+        os.environ,
+        MODEL_DIR=model_dir,
+        MODEL_WATCH_INTERVAL="0",
+        CONVERSATION_STORE="memory",
+        PREDICTION_CACHE_SIZE="0"
+    )
+
+    command = [
+        sys.executable,
+        os.path.join(PROJECT_ROOT, "serve_prefork.py"),
+        "--workers", str(workers),
+        "--port", str(port)
+    ]
+
+    if share:
+        command.append("--share")
+
+    server = subprocess.Popen(command, env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL)
+
+    try:
+        wait_until_serving(port)
+
+        with ThreadPoolExecutor(max_workers=workers * 2) as executor:
+            statuses = list(executor.map(lambda text: analyze(port, text), texts))
+
+        assert all(status == 302 for status in statuses), set(statuses)
+
+        per_worker = [memory_kb(pid) for pid in child_pids(server.pid)]
+        parent = memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    uss = [memory["uss"] for memory in per_worker]
+
+    return {
+        "workers": len(per_worker),
+        "mean_worker_uss_mb": round(sum(uss) / len(uss) / 1024, 2),
+        "max_worker_uss_mb": round(max(uss) / 1024, 2),
+        "parent_uss_mb": round(parent["uss"] / 1024, 2),
+        "total_pss_mb": round(
+            (parent["pss"] + sum(memory["pss"] for memory in per_worker)) / 1024, 2
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--max-features", type=int, default=10000)
+    parser.add_argument("--requests-per-worker", type=int, default=50)
+    args = parser.parse_args()
+
+    model_dir = tempfile.mkdtemp(prefix="prefork_bench_")
+    words = random_words(max(1000, args.max_features // 2))
+
+    with open(os.path.join(model_dir, "stress_model_benchmark.pkl"), "wb") as f:
+        pickle.dump(build_large_pipeline(words, args.max_features), f)
+
+    results = {"max_features": args.max_features, "runs": []}
+
+    for workers in args.workers:
+        for share in (True, False):
+            # Requests use the model's words, so lookups hit the vocabulary
+            texts = random_texts(
+                words, workers * args.requests_per_worker, length=40, seed=workers
+            )
+
+            run = measure(workers, share, model_dir, texts)
+            run["model_memory"] = "shared" if share else "private"
+            results["runs"].append(run)
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare the pickled scikit-learn Pipeline with its compact runtime export
+scored by the NumPy-only RuntimeModel: agreement, cold start (fresh
+interpreter: import, load, first prediction) and per-call latency.
+
+    python benchmarks/bench_runtime_model.py --calls 2000
+"""
+import os
+import sys
+import json
+import pickle
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+from common import PROJECT_ROOT, build_synthetic_pipeline, synthetic_texts, time_calls
+
+from mental_health.runtime_model import RuntimeModel, export_runtime_model
+
+COLD_START_PICKLE = """
+import pickle, time
+start = time.perf_counter()
+with open({path!r}, "rb") as f:
+    model = pickle.load(f)
+model.predict_proba(["first request"])
+print(time.perf_counter() - start)
+"""
+
+COLD_START_RUNTIME = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from mental_health.runtime_model import RuntimeModel
+RuntimeModel.load({path!r}).predict_proba(["first request"])
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start_seconds(code: str, runs: int = 5) -> float:
+    timings = [
+        float(subprocess.check_output([sys.executable, "-c", code], text=True))
+        for _ in range(runs)
+    ]
+
+    return round(min(timings), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    pipeline = build_synthetic_pipeline()
+    texts = synthetic_texts(args.calls)
+
+    directory = tempfile.mkdtemp(prefix="runtime_bench_")
+    pickle_path = os.path.join(directory, "stress_model_benchmark.pkl")
+    runtime_path = os.path.join(directory, "stress_model_benchmark.runtime")
+
+    with open(pickle_path, "wb") as f:
+        pickle.dump(pipeline, f)
+
+    export_runtime_model(pipeline, runtime_path, check_texts=texts)
+    runtime = RuntimeModel.load(runtime_path)
+
+    batches = [
+        texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)
+    ]
+
+    results = {
+        "max_abs_probability_diff": float(
+            np.max(np.abs(pipeline.predict_proba(texts) - runtime.predict_proba(texts)))
+        ),
+        "artifact_bytes": {
+            "pickle": os.path.getsize(pickle_path),
+            "runtime": os.path.getsize(runtime_path)
+        },
+        "cold_start_s": {
+            "pickle": cold_start_seconds(COLD_START_PICKLE.format(path=pickle_path)),
+            "runtime": cold_start_seconds(
+                COLD_START_RUNTIME.format(root=PROJECT_ROOT, path=runtime_path)
+            )
+        },
+        "single_text": {
+            "pipeline": time_calls(lambda text: pipeline.predict_proba([text]), texts),
+            "runtime": time_calls(lambda text: runtime.predict_proba([text]), texts)
+        },
+        f"batch_of_{args.batch_size}": {
+            "pipeline": time_calls(pipeline.predict_proba, batches, warmup=1),
+            "runtime": time_calls(runtime.predict_proba, batches, warmup=1)
+        }
+    }
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Cold-start benchmark: per-module import times of `import app` (from
+python -X importtime) and the time from launching a clean interpreter to
+the first successful POST /mental_health/analyze, for each model format
+and MODEL_PRELOAD mode. Exits with status 1 if a budget is exceeded.
+
+A synthetic model is written to a temporary MODEL_DIR in both formats.
+
+    python benchmarks/bench_startup.py --budget-ms 2500 --import-budget-ms 400
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from common import PROJECT_ROOT, build_synthetic_pipeline
+
+from mental_health.runtime_model import export_runtime_model
+
+# Runs in the fresh interpreter; prints its own phase timings
+FIRST_REQUEST = """
+import json, time
+start = time.perf_counter()
+
+from app import create_app
+imported = time.perf_counter()
+
+app = create_app()
+created = time.perf_counter()
+
+response = app.test_client().post(
+    "/mental_health/analyze", data={"text": "I can't sleep before my exams", "age_group": "Adult"}
+)
+assert response.status_code == 302, response.status_code
+done = time.perf_counter()
+
+print(json.dumps({
+    "import_app": imported - start,
+    "create_app": created - imported,
+    "first_analyze": done - created
+}))
+"""
+
+
+# -----------------------------
+# Import Profile
+# -----------------------------
+def import_profile(env: dict) -> list:
+    """
+    (module, self_us, cumulative_us) for every module `import app` loads.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+
+        if self_us.strip().isdigit():
+            modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return modules
+
+
+# -----------------------------
+# Time to First /analyze
+# -----------------------------
+def first_request(env: dict) -> dict:
+    start = time.perf_counter()
+
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+    phases = json.loads(output.strip().splitlines()[-1])
+    phases["total"] = time.perf_counter() - start
+
+    return phases
+
+
+def median_phases(runs: list) -> dict:
+    # Seconds per run -> median milliseconds per phase
+    return {
+        key: round(statistics.median(run[key] for run in runs) * 1000, 1)
+        for key in runs[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--formats", nargs="+", default=["pickle", "runtime"])
+    parser.add_argument("--preload", nargs="+", default=["sync", "background"])
+    parser.add_argument(
+        "--budget-ms", type=float, default=2500,
+        help="max median launch-to-first-/analyze time for every configuration"
+    )
+    parser.add_argument(
+        "--import-budget-ms", type=float, default=400,
+        help="max median cumulative import time of the app module"
+    )
+    args = parser.parse_args()
+
+    model_dir = tempfile.mkdtemp(prefix="startup_bench_")
+    pipeline = build_synthetic_pipeline()
+
+    with open(os.path.join(model_dir, "stress_model_benchmark.pkl"), "wb") as f:
+        pickle.dump(pipeline, f)
+
+    export_runtime_model(pipeline, os.path.join(model_dir, "stress_model_benchmark.runtime"))
+
+    base_env = dict(
+        os.environ,
+        MODEL_DIR=model_dir,
+        MODEL_WATCH_INTERVAL="0",
+        CONVERSATION_STORE="memory"
+    )
+
+    # Import profile
+    profiles = [import_profile(base_env) for _ in range(args.runs)]
+    app_import_us = statistics.median(
+        next(cumulative for name, _, cumulative in profile if name == "app")
+        for profile in profiles
+    )
+    slowest = sorted(profiles[-1], key=lambda module: -module[2])[:args.top]
+
+    results = {
+        "import_app_ms": round(app_import_us / 1000, 1),
+        "slowest_imports_ms": [
+            {"module": name, "self": round(self_us / 1000, 1), "cumulative": round(cumulative_us / 1000, 1)}
+            for name, self_us, cumulative_us in slowest
+        ],
+        "first_analyze_ms": {}
+    }
+
+    # Launch to first successful /analyze
+    for model_format in args.formats:
+        for preload in args.preload:
+            env = dict(base_env, MODEL_FORMAT=model_format, MODEL_PRELOAD=preload)
+            runs = [first_request(env) for _ in range(args.runs)]
+
+            results["first_analyze_ms"][f"{model_format}/{preload}"] = median_phases(runs)
+
+    # Budget check
+    failures = []
+
+    if results["import_app_ms"] > args.import_budget_ms:
+        failures.append(
+            f"import app: {results['import_app_ms']} ms > {args.import_budget_ms} ms"
+        )
+
+    for name, phases in results["first_analyze_ms"].items():
+        if phases["total"] > args.budget_ms:
+            failures.append(
+                f"first /analyze ({name}): {phases['total']} ms > {args.budget_ms} ms"
+            )
+
+    results["budget_failures"] = failures
+
+    print(json.dumps(results, indent=4))
+
+    if failures:
+        print("\nStartup budget exceeded:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
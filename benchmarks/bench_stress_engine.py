@@ -0,0 +1,65 @@
+"""
+Compare the original two-pass predict_stress (predict + predict_proba on
+the same pipeline) against the fused single-pass implementation.
+
+    python benchmarks/bench_stress_engine.py --calls 2000
+"""
+import argparse
+import json
+
+from common import build_synthetic_pipeline, synthetic_texts, time_calls
+
+from mental_health.services import stress_engine
+
+
+def legacy_predict_stress(text):
+    model = stress_engine.load_latest_model()
+
+    processed_text = stress_engine.clean_text(text)
+
+    prediction = model.predict([processed_text])[0]
+    probabilities = model.predict_proba([processed_text])[0]
+
+    confidence = round(max(probabilities) * 100, 2)
+
+    label_map = {
+        0: "Low",
+        1: "Moderate",
+        2: "High"
+    }
+
+    return label_map.get(prediction, "Unknown"), confidence
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    stress_engine.get_registry().install("synthetic", build_synthetic_pipeline())
+
+    # Measure the inference path itself, not prediction cache hits
+    stress_engine.configure_cache(max_size=0)
+
+    texts = synthetic_texts(args.calls)
+
+    # Both implementations must agree before timing them
+    for text in texts[:200]:
+        assert legacy_predict_stress(text) == stress_engine.predict_stress(text)
+
+    results = {
+        "legacy_predict_stress": time_calls(legacy_predict_stress, texts),
+        "fused_predict_stress": time_calls(stress_engine.predict_stress, texts)
+    }
+
+    speedup = (
+        results["legacy_predict_stress"]["p50_us"]
+        / results["fused_predict_stress"]["p50_us"]
+    )
+    results["p50_speedup"] = round(speedup, 2)
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
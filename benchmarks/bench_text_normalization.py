@@ -0,0 +1,101 @@
+"""
+Throughput of text normalization: the original three-pass re.sub
+clean_text applied row by row versus the shared nlp_pipeline
+implementation (scalar, list batch and pandas Series batch).
+
+    python benchmarks/bench_text_normalization.py --rows 1000000
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+import common  # noqa: F401  (puts the project root on sys.path)
+
+import pandas as pd
+
+from mental_health.nlp_pipeline import clean_text, clean_texts
+
+
+def legacy_clean_text(text):
+    if pd.isna(text):
+        return ""
+
+    text = str(text).lower()
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[^a-zA-Z\s]", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def synthetic_rows(rows: int, seed: int = 42):
+    rng = random.Random(seed)
+
+    tokens = (
+        common.STRESS_WORDS + common.CALM_WORDS + common.FILLER_WORDS
+        + ["I'm", "can't", "SO", "2am", "...", "!!!", ":(", "#exams", "@boss"]
+    )
+    urls = ["https://t.co/x9Yz1", "http://example.com/post?id=42"]
+
+    texts = []
+
+    for _ in range(rows):
+        words = rng.choices(tokens, k=rng.randint(5, 60))
+
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(urls))
+
+        texts.append(" ".join(words))
+
+    return texts
+
+
+def measure(name, func, data, rows):
+    start = time.perf_counter()
+    result = func(data)
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<28} {elapsed:8.2f}s  {rows / elapsed:>12,.0f} rows/s")
+
+    return result, {"seconds": round(elapsed, 3), "rows_per_sec": round(rows / elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    texts = synthetic_rows(args.rows)
+    series = pd.Series(texts, name="text")
+
+    results = {}
+
+    expected, results["legacy_series_apply"] = measure(
+        "legacy Series.apply", lambda s: s.apply(legacy_clean_text), series, args.rows
+    )
+    scalar, results["scalar_clean_text"] = measure(
+        "clean_text (list comp)", lambda t: [clean_text(x) for x in t], texts, args.rows
+    )
+    batch, results["batch_clean_texts_list"] = measure(
+        "clean_texts (list)", clean_texts, texts, args.rows
+    )
+    batch_series, results["batch_clean_texts_series"] = measure(
+        "clean_texts (Series)", clean_texts, series, args.rows
+    )
+
+    expected = expected.tolist()
+    assert scalar == expected and batch == expected and batch_series.tolist() == expected
+
+    baseline = results["legacy_series_apply"]["seconds"]
+    results["speedup_vs_legacy"] = {
+        name: round(baseline / value["seconds"], 2)
+        for name, value in results.items()
+        if name != "legacy_series_apply"
+    }
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+import random
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+# -----------------------------
+# Synthetic Inputs
+# -----------------------------
+STRESS_WORDS = [
+    "hopeless", "anxious", "overwhelmed", "exhausted", "panic",
+    "deadline", "exam", "pressure", "crying", "worthless", "burnout"
+]
+
+CALM_WORDS = [
+    "calm", "relaxed", "happy", "weekend", "friends",
+    "walk", "peaceful", "grateful", "rested", "enjoy"
+]
+
+FILLER_WORDS = [
+    "i", "feel", "today", "really", "my", "work", "life", "about",
+    "with", "the", "and", "been", "lately", "very", "sleep", "family"
+]
+
+
+def synthetic_texts(count: int, words: int = 20, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    vocabulary = STRESS_WORDS + CALM_WORDS + FILLER_WORDS
+
+    return [
+        " ".join(rng.choices(vocabulary, k=words)).capitalize() + "!"
+        for _ in range(count)
+    ]
+
+
+def short_texts(count: int, seed: int = 1) -> List[str]:
+    return synthetic_texts(count, words=6, seed=seed)
+
+
+def long_texts(count: int, seed: int = 2) -> List[str]:
+    return synthetic_texts(count, words=300, seed=seed)
+
+
+def url_heavy_texts(count: int, seed: int = 3) -> List[str]:
+    rng = random.Random(seed)
+    texts = synthetic_texts(count, words=30, seed=seed)
+
+    return [
+        " ".join(
+            f"https://example.com/{rng.randrange(10 ** 6)}?ref=feed {word}"
+            if rng.random() < 0.3 else word
+            for word in text.split()
+        )
+        for text in texts
+    ]
+
+
+def synthetic_history(turns: int, seed: int = 4) -> List[Dict]:
+    """
+    Alternating user/assistant chat history with `turns` user messages.
+    """
+    messages = synthetic_texts(turns, words=12, seed=seed)
+    history = []
+
+    for message in messages:
+        history.append({"role": "user", "message": message})
+        history.append({"role": "assistant", "message": "Tell me more about that."})
+
+    return history
+
+
+def build_synthetic_pipeline(samples: int = 3000, seed: int = 42):
+    """
+    Train a small pipeline with the same structure as
+    train/train_stress_model.py so benchmarks run without real data.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    rng = random.Random(seed)
+    texts, labels = [], []
+
+    for _ in range(samples):
+        label = rng.choice([0, 1, 2])
+        keywords = CALM_WORDS if label == 0 else STRESS_WORDS
+        words = rng.choices(keywords, k=2 + 2 * label) + rng.choices(FILLER_WORDS, k=10)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+        labels.append(label)
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(
+            max_features=10000,
+            ngram_range=(1, 2),
+            stop_words="english",
+            lowercase=True
+        )),
+        ("clf", LogisticRegression(
+            max_iter=1000,
+            class_weight="balanced",
+            solver="lbfgs"
+        ))
+    ])
+
+    pipeline.fit(texts, labels)
+
+    return pipeline
+
+
+# -----------------------------
+# Timing
+# -----------------------------
+def time_calls(func: Callable, inputs: List, repeat: int = 1, warmup: int = 100) -> Dict:
+    """
+    Call func once per input (repeat times over the inputs) and return
+    per-call latency percentiles in microseconds plus ops/sec.
+    The first `warmup` inputs are run untimed to settle caches.
+    """
+    for item in inputs[:warmup]:
+        func(item)
+
+    latencies = []
+
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    total = sum(latencies)
+
+    def percentile(p):
+        index = min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))
+        return round(latencies[index] * 1e6, 2)
+
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": round(len(latencies) / total, 2) if total else float("inf"),
+        "p50_us": percentile(50),
+        "p95_us": percentile(95),
+        "p99_us": percentile(99)
+    }
@@ -0,0 +1,200 @@
+"""
+Microbenchmark suite for the inference and chatbot hot paths.
+
+Runs offline on CPU with synthetic inputs (a small synthetic model is
+trained in-process), reports ops/sec and p50/p95/p99 latency per case,
+writes the results as JSON and compares them against a stored baseline
+(by default the committed benchmarks/baselines/baseline.json), exiting
+with status 1 when any case regresses by more than the threshold.
+
+The committed baseline was recorded on a 1-CPU Linux machine; on other
+hardware, record one there first and compare against it:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baselines/local.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baselines/local.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+from common import (
+    build_synthetic_pipeline, long_texts, short_texts, synthetic_history,
+    time_calls, url_heavy_texts
+)
+
+from mental_health.nlp_pipeline import clean_text
+from mental_health.services import stress_engine
+from mental_health.services.chatbot_engine import (
+    ConversationState, detect_emotion_intensity, detect_topic, generate_response
+)
+
+
+HISTORY_TURNS = [1, 10, 100, 500]
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json"
+)
+
+
+# -----------------------------
+# Cases
+# -----------------------------
+def build_cases(calls):
+    inputs = {
+        "short": short_texts(calls),
+        "long": long_texts(calls),
+        "url_heavy": url_heavy_texts(calls),
+    }
+
+    cases = {}
+
+    for name, texts in inputs.items():
+        cases[f"clean_text[{name}]"] = (clean_text, texts)
+        cases[f"predict_stress[{name}]"] = (stress_engine.predict_stress, texts)
+        cases[f"detect_emotion_intensity[{name}]"] = (detect_emotion_intensity, texts)
+        cases[f"detect_topic[{name}]"] = (detect_topic, texts)
+
+    batches = [inputs["short"][i:i + 64] for i in range(0, calls, 64)]
+    cases["predict_stress_batch[64x short]"] = (stress_engine.predict_stress_batch, batches)
+
+    for turns in HISTORY_TURNS:
+        history = synthetic_history(turns)
+        message = history[-2]["message"]
+        state = ConversationState.from_history(history)
+        state_dict = state.to_dict()
+
+        def rescan(_, history=history, message=message):
+            return generate_response(message, "Moderate", history, "Teen")
+
+        def incremental(_, history=history, message=message, state_dict=state_dict):
+            state = ConversationState.from_dict(state_dict)
+            return generate_response(message, "Moderate", history, "Teen", state=state)
+
+        repeats = list(range(max(10, calls // max(1, turns // 10))))
+        cases[f"generate_response[rescan, {turns} turns]"] = (rescan, repeats)
+        cases[f"generate_response[state, {turns} turns]"] = (incremental, repeats)
+
+    return cases
+
+
+def run(calls, selected=None, runs=1):
+    """
+    Time every case `runs` times and keep, per case, the run with the
+    median throughput, so one noisy run neither sets nor fails a baseline.
+    """
+    stress_engine.get_registry().install("synthetic", build_synthetic_pipeline())
+
+    # Benchmark the inference path itself, not prediction cache hits
+    stress_engine.configure_cache(max_size=0)
+
+    cases = {
+        name: case for name, case in build_cases(calls).items()
+        if not selected or any(pattern in name for pattern in selected)
+    }
+    timings = {name: [] for name in cases}
+
+    for _ in range(max(1, runs)):
+        for name, (func, inputs) in cases.items():
+            timings[name].append(time_calls(func, inputs, warmup=min(50, len(inputs))))
+
+    results = {}
+
+    for name, runs_of_case in timings.items():
+        runs_of_case.sort(key=lambda result: result["ops_per_sec"])
+        results[name] = runs_of_case[len(runs_of_case) // 2]
+        print(
+            f"{name:<48} {results[name]['ops_per_sec']:>12,.1f} ops/s  "
+            f"p50 {results[name]['p50_us']:>10,.1f}us  "
+            f"p95 {results[name]['p95_us']:>10,.1f}us  "
+            f"p99 {results[name]['p99_us']:>10,.1f}us"
+        )
+
+    return results
+
+
+# -----------------------------
+# Baseline Comparison
+# -----------------------------
+def compare(results, baseline, threshold):
+    """
+    Cases whose throughput dropped by more than `threshold` (a fraction)
+    relative to the baseline.
+    """
+    regressions = []
+
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+
+        if not previous:
+            continue
+
+        change = current["ops_per_sec"] / previous["ops_per_sec"] - 1
+
+        if change < -threshold:
+            regressions.append((name, previous["ops_per_sec"], current["ops_per_sec"], change))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--calls", type=int, default=1000, help="inputs per case")
+    parser.add_argument(
+        "--runs", type=int, default=3, help="runs per case; the median run is kept (default 3)"
+    )
+    parser.add_argument("--cases", nargs="*", help="only run cases containing these substrings")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE,
+        help="baseline JSON to compare against (default: %(default)s; '' skips the comparison)"
+    )
+    parser.add_argument("--save-baseline", help="write these results as a new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="maximum allowed throughput drop per case (fraction, default 0.25)"
+    )
+    args = parser.parse_args()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "calls": args.calls,
+        "runs": args.runs,
+        "results": run(args.calls, args.cases, args.runs),
+    }
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=4)
+            print("\nResults saved at:", path)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(report["results"], baseline, args.threshold)
+
+    if not regressions:
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+        return 0
+
+    print(f"\nRegressions beyond {args.threshold:.0%}:")
+    for name, before, after, change in regressions:
+        print(f"  {name}: {before:,.1f} -> {after:,.1f} ops/s ({change:+.1%})")
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+Bulk offline scoring: stream a CSV or JSONL file of texts through the
+stress model in chunks, score the chunks on a pool of worker processes
+and stream the results to a CSV or JSONL file, each row stamped with the
+model version that scored it.
+
+Progress is checkpointed after every chunk written (OUTPUT.checkpoint.json);
+running the same command again after an interruption resumes after the
+last checkpointed chunk. Use --restart to start over.
+
+    python bulk_score.py archive.csv scores.csv --text-column text --id-column id --workers 8
+"""
+import os
+import io
+import csv
+import sys
+import json
+import pickle
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from config import Config
+from mental_health.nlp_pipeline import clean_texts
+from mental_health.services.model_registry import ModelRegistry
+from mental_health.services.stress_engine import LABEL_MAP
+
+PATTERNS = {
+    "pickle": "stress_model_*.pkl",
+    "runtime": "stress_model_*.runtime"
+}
+
+ROW_NUMBER_COLUMN = "row"
+
+
+# -----------------------------
+# Model
+# -----------------------------
+def resolve_model(model_path, model_dir, model_format) -> str:
+    """
+    The given artifact, or the newest one in MODEL_DIR for the format.
+    """
+    if model_path:
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model artifact not found: {model_path}")
+
+        return os.path.abspath(model_path)
+
+    registry = ModelRegistry(model_dir, pattern=PATTERNS[model_format])
+    versions = registry.available_versions()
+
+    if not versions:
+        raise FileNotFoundError(f"No trained stress model found in {model_dir}")
+
+    return os.path.join(model_dir, versions[-1])
+
+
+def load_model(path: str):
+    if path.endswith(".runtime"):
+        from mental_health.runtime_model import RuntimeModel
+
+        return RuntimeModel.load(path)
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# -----------------------------
+# Worker Process
+# -----------------------------
+_worker_model = None
+_worker_levels = None
+_worker_version = None
+
+
+def _init_worker(model_path: str) -> None:
+    # Runs once per worker: every chunk it scores reuses the loaded model
+    global _worker_model, _worker_levels, _worker_version
+
+    _worker_model = load_model(model_path)
+    _worker_levels = [LABEL_MAP.get(label, "Unknown") for label in _worker_model.classes_]
+    _worker_version = os.path.basename(model_path)
+
+
+def output_columns(id_column: str) -> list:
+    return [id_column, "stress_level", "confidence"] + [
+        f"probability_{level}" for level in LABEL_MAP.values()
+    ] + ["model_version"]
+
+
+def score_chunk(task) -> str:
+    """
+    Clean and score one chunk and render its output rows, so the parent
+    only reads input and appends text.
+    """
+    ids, texts, id_column, output_format = task
+
+    probabilities = _worker_model.predict_proba(clean_texts(texts))
+    best = probabilities.argmax(axis=1)
+
+    columns = output_columns(id_column)
+    rows = []
+
+    for row_id, row, best_index in zip(ids, probabilities, best):
+        class_probabilities = dict.fromkeys(LABEL_MAP.values(), 0.0)
+        class_probabilities.update(
+            (level, round(float(p), 4)) for level, p in zip(_worker_levels, row)
+        )
+
+        rows.append(
+            [
+                row_id,
+                _worker_levels[best_index],
+                round(float(row[best_index]) * 100, 2)
+            ]
+            + list(class_probabilities.values())
+            + [_worker_version]
+        )
+
+    if output_format == "jsonl":
+        return "".join(
+            json.dumps(dict(zip(columns, values)), default=str) + "\n" for values in rows
+        )
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+
+    return buffer.getvalue()
+
+
+# -----------------------------
+# Input
+# -----------------------------
+def file_format(path: str, requested: str = None) -> str:
+    if requested:
+        return requested
+
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_chunks(path, input_format, text_column, id_column, chunk_size):
+    """
+    Yield (ids, texts) per chunk of `chunk_size` rows. Without an id
+    column, rows are identified by their 0-based position in the input.
+    """
+    import pandas as pd
+
+    columns = [text_column] + ([id_column] if id_column else [])
+
+    if input_format == "jsonl":
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        reader = pd.read_csv(
+            path, usecols=columns, chunksize=chunk_size, dtype=str, keep_default_na=False
+        )
+
+    start = 0
+
+    with reader:
+        for chunk in reader:
+            missing = [column for column in columns if column not in chunk.columns]
+
+            if missing:
+                raise ValueError(f"Input has no column(s): {', '.join(missing)}")
+
+            texts = chunk[text_column].tolist()
+
+            if id_column:
+                ids = chunk[id_column].tolist()
+            else:
+                ids = list(range(start, start + len(texts)))
+
+            start += len(texts)
+
+            yield ids, texts
+
+
+# -----------------------------
+# Checkpoint
+# -----------------------------
+def checkpoint_path(output_path: str) -> str:
+    return output_path + ".checkpoint.json"
+
+
+def input_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def read_checkpoint(path: str):
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_checkpoint(path: str, checkpoint: dict) -> None:
+    # Atomic: an interruption leaves the previous checkpoint intact
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f, indent=4)
+
+    os.replace(tmp_path, path)
+
+
+def resume_point(args, model_version: str) -> dict:
+    """
+    The checkpoint to continue from, or a fresh one. Refuses to resume
+    against a changed input or model; a resumed run keeps the chunk size
+    it was started with.
+    """
+    fresh = {
+        "input": input_signature(args.input),
+        "model_version": model_version,
+        "chunk_size": args.chunk_size,
+        "chunks_done": 0,
+        "rows_done": 0,
+        "output_bytes": 0,
+        "complete": False
+    }
+
+    checkpoint = None if args.restart else read_checkpoint(checkpoint_path(args.output))
+
+    if checkpoint is None:
+        if os.path.exists(args.output) and not args.restart:
+            raise SystemExit(
+                f"{args.output} exists without a checkpoint; use --restart to overwrite it"
+            )
+
+        return fresh
+
+    if not os.path.exists(args.output):
+        raise SystemExit(
+            f"Checkpoint found but {args.output} is missing; use --restart to start over"
+        )
+
+    for key in ("input", "model_version"):
+        if checkpoint[key] != fresh[key]:
+            raise SystemExit(
+                f"Checkpoint {key} does not match this run "
+                f"({checkpoint[key]} != {fresh[key]}); use --restart to start over"
+            )
+
+    # The chunk count only locates the resume point for the same chunk size
+    args.chunk_size = checkpoint["chunk_size"]
+
+    return checkpoint
+
+
+# -----------------------------
+# Run
+# -----------------------------
+def run(args) -> dict:
+    model_path = resolve_model(args.model, args.model_dir, args.model_format)
+    model_version = os.path.basename(model_path)
+
+    checkpoint = resume_point(args, model_version)
+
+    if checkpoint["complete"]:
+        print(f"Already complete: {checkpoint['rows_done']} rows in {args.output}")
+        return checkpoint
+
+    input_format = file_format(args.input, args.input_format)
+    output_format = file_format(args.output, args.output_format)
+    id_column = args.id_column or ROW_NUMBER_COLUMN
+
+    skip = checkpoint["chunks_done"]
+
+    if skip:
+        print(f"Resuming after {checkpoint['rows_done']} rows ({skip} chunks)")
+
+    # Drop rows written after the last checkpoint
+    output = open(args.output, "r+b" if checkpoint["output_bytes"] else "wb")
+    output.truncate(checkpoint["output_bytes"])
+    output.seek(checkpoint["output_bytes"])
+
+    if not checkpoint["output_bytes"] and output_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(output_columns(id_column))
+        output.write(buffer.getvalue().encode("utf-8"))
+
+    chunks = read_chunks(
+        args.input, input_format, args.text_column, args.id_column, args.chunk_size
+    )
+
+    # Already scored chunks are parsed but not scored again
+    tasks = (
+        (ids, texts, id_column, output_format)
+        for index, (ids, texts) in enumerate(chunks)
+        if index >= skip
+    )
+
+    with output, ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(model_path,)
+    ) as executor:
+        # Keep every worker busy without reading the whole input ahead
+        pending = deque()
+
+        def write_next():
+            rendered, rows = pending.popleft()
+            rendered = rendered.result()
+
+            output.write(rendered.encode("utf-8"))
+            output.flush()
+            os.fsync(output.fileno())
+
+            checkpoint["chunks_done"] += 1
+            checkpoint["rows_done"] += rows
+            checkpoint["output_bytes"] = output.tell()
+            write_checkpoint(checkpoint_path(args.output), checkpoint)
+
+            if args.progress and checkpoint["chunks_done"] % args.progress == 0:
+                print(f"{checkpoint['rows_done']} rows scored", flush=True)
+
+        for task in tasks:
+            pending.append((executor.submit(score_chunk, task), len(task[1])))
+
+            if len(pending) >= args.workers * 2:
+                write_next()
+
+        while pending:
+            write_next()
+
+    checkpoint["complete"] = True
+    write_checkpoint(checkpoint_path(args.output), checkpoint)
+
+    print(f"Scored {checkpoint['rows_done']} rows with {model_version} into {args.output}")
+
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", help="CSV or JSONL file of texts")
+    parser.add_argument("output", help="CSV or JSONL file for the scores")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument(
+        "--id-column",
+        help=f"Copied to the output; defaults to the input position ({ROW_NUMBER_COLUMN!r})"
+    )
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="Default: by extension")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="Default: by extension")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model", help="Artifact to score with (default: newest in MODEL_DIR)")
+    parser.add_argument("--model-dir", default=Config.MODEL_DIR)
+    parser.add_argument("--model-format", choices=sorted(PATTERNS), default=Config.MODEL_FORMAT)
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint")
+    parser.add_argument(
+        "--progress", type=int, default=20, help="Report every N chunks (0: quiet)"
+    )
+    args = parser.parse_args()
+
+    args.workers = max(1, args.workers)
+    run(args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
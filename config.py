@@ -8,5 +8,64 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
     LOG_DIR = os.path.join(BASE_DIR, "logs")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate app.log at 10 MB
+    LOG_BACKUP_COUNT = 5
 
-    MODEL_DIR = os.path.join(BASE_DIR, "models", "mental_health")
+    # Fraction of high-volume info logs (per prediction / chat turn) to keep
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 1.0))
+
+    MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(BASE_DIR, "models", "mental_health"))
+
+    # Upper bound on texts accepted by the batched JSON scoring API
+    API_MAX_BATCH_SIZE = int(os.getenv("API_MAX_BATCH_SIZE", 500))
+
+    # Server-side conversation store ("sqlite" or "memory")
+    CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "sqlite")
+    CONVERSATION_DB_PATH = os.path.join(BASE_DIR, "data", "conversations.db")
+    CONVERSATION_MAX_MESSAGES = 50
+    CONVERSATION_TTL_SECONDS = 24 * 60 * 60
+    # Write-behind batching of conversation saves (batch size 1 writes
+    # through; serve_prefork.py forces that so every worker reads the
+    # latest turn)
+    CONVERSATION_WRITE_BATCH_SIZE = int(os.getenv("CONVERSATION_WRITE_BATCH_SIZE", 32))
+    CONVERSATION_FLUSH_INTERVAL = float(os.getenv("CONVERSATION_FLUSH_INTERVAL", 1.0))
+
+    # Load and warm up the stress model at startup instead of on first request:
+    # "sync" (inside create_app), "background" (thread; the app serves
+    # meanwhile and early requests wait for the load) or "off"; unset uses
+    # stress_engine.DEFAULT_PRELOAD_MODE ("background")
+    MODEL_PRELOAD = os.getenv("MODEL_PRELOAD")
+    MODEL_WARMUP_BATCH_SIZE = 32
+    MODEL_WARMUP_TEXTS = None  # None uses stress_engine.WARMUP_TEXTS
+
+    # Seconds between checks of MODEL_DIR for new artifacts (0 disables hot swap)
+    MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", 30))
+
+    # "pickle" serves stress_model_*.pkl through scikit-learn, "runtime" the
+    # compact stress_model_*.runtime exports through the NumPy scorer
+    MODEL_FORMAT = os.getenv("MODEL_FORMAT", "pickle")
+
+    # Serve model arrays memory-mapped from MODEL_SHARED_DIR, so forked
+    # workers (serve_prefork.py) share one copy instead of one each. Off by
+    # default: vectorizing through the mapped vocabulary is about 2x slower
+    # and saves little memory below ~100k features
+    MODEL_SHARED_MEMORY = os.getenv("MODEL_SHARED_MEMORY", "0") == "1"
+    MODEL_SHARED_DIR = None  # None uses MODEL_DIR/.shared
+
+    # Token required by the model admin API (pin/rollback); unset disables it
+    MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN")
+
+    # In-process prediction cache (0 disables); TTL in seconds, None = no expiry
+    PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", 10000))
+    PREDICTION_CACHE_TTL = None
+
+    # Micro-batching of concurrent single-text predictions
+    # (a batch closes when full or after the wait; a lone call is scored
+    # at once; size <= 1 disables)
+    INFERENCE_BATCH_MAX_SIZE = int(os.getenv("INFERENCE_BATCH_MAX_SIZE", 32))
+    INFERENCE_BATCH_MAX_WAIT_MS = float(os.getenv("INFERENCE_BATCH_MAX_WAIT_MS", 2.0))
+
+    # Per-stage latency histograms and counters served at METRICS_PATH
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_PATH = "/metrics"
@@ -1,10 +1,11 @@
-from flask import Blueprint
+# The Blueprint lives in routes; importing it from here is deferred so
+# that training code importing mental_health.nlp_pipeline (or another
+# Flask-free module) does not load the web stack.
 
-mental_health = Blueprint(
-    "mental_health",
-    __name__,
-    template_folder="templates",
-    static_folder="static"
-)
 
-from . import routes
+def __getattr__(name):
+    if name == "mental_health":
+        from .routes import mental_health
+        return mental_health
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,98 @@
 import re
+from typing import Iterable, List
+
+# =====================================================
+# Text Normalization (shared by training and serving)
+# =====================================================
+#
+# clean_text lowercases, drops URLs ("http" up to the next whitespace),
+# drops every character that is not an ASCII letter or whitespace, and
+# collapses whitespace runs into single spaces.
+
+_URL_PATTERN = re.compile(r"http\S+")
+_NON_LETTER_PATTERN = re.compile(r"[^a-zA-Z\s]+")
+
+# ASCII bytes deleted by the bytes.translate fast path: everything except
+# letters and whitespace (as re's \s sees it, including \x1c-\x1f)
+_DELETE_ASCII = bytes(
+    code for code in range(128)
+    if not (chr(code).isalpha() or chr(code).isspace())
+)
+
+# Batch variants that never cross or delete the NUL chunk separator
+_BATCH_SEPARATOR = "\x00"
+_BATCH_URL_PATTERN = re.compile(r"http[^\s\x00]+")
+_BATCH_NON_LETTER_PATTERN = re.compile(r"[^a-zA-Z\s\x00]+")
+_DELETE_ASCII_BATCH = _DELETE_ASCII.replace(b"\x00", b"")
+
+_BATCH_CHUNK_SIZE = 4096
+
+
+def clean_text(text) -> str:
+    if not isinstance(text, str):
+        if text is None or text != text:  # None / NaN
+            return ""
+        text = str(text)
 
-def clean_text(text: str) -> str:
     text = text.lower()
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+
+    if "http" in text:
+        text = _URL_PATTERN.sub("", text)
+
+    if text.isascii():
+        text = text.encode("ascii").translate(None, _DELETE_ASCII).decode("ascii")
+    else:
+        text = _NON_LETTER_PATTERN.sub("", text)
+
+    return " ".join(text.split())
+
+
+def _clean_chunk(texts: List[str]) -> List[str]:
+    """
+    Normalize a chunk of strings with one lower(), one URL pass and one
+    character-deletion pass over the NUL-joined chunk. Falls back to
+    per-text cleaning if a text contains NUL itself.
+    """
+    joined = _BATCH_SEPARATOR.join(texts).lower()
+
+    if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+        return [clean_text(text) for text in texts]
+
+    if "http" in joined:
+        joined = _BATCH_URL_PATTERN.sub("", joined)
+
+    if joined.isascii():
+        joined = joined.encode("ascii").translate(None, _DELETE_ASCII_BATCH).decode("ascii")
+    else:
+        joined = _BATCH_NON_LETTER_PATTERN.sub("", joined)
+
+    return [" ".join(part.split()) for part in joined.split(_BATCH_SEPARATOR)]
+
+
+def clean_texts(texts: Iterable):
+    """
+    Batch version of clean_text.
+
+    A pandas Series returns a Series with the same index and name (missing
+    values become ""); any other iterable returns a list.
+    """
+    if hasattr(texts, "isna") and hasattr(texts, "index"):
+        values = texts.tolist()
+        missing = texts.isna().tolist()
+        cleaned = clean_texts([
+            "" if is_missing else value
+            for value, is_missing in zip(values, missing)
+        ])
+        return type(texts)(cleaned, index=texts.index, name=texts.name)
+
+    texts = [
+        text if isinstance(text, str) else clean_text(text)
+        for text in texts
+    ]
+
+    cleaned = []
+
+    for start in range(0, len(texts), _BATCH_CHUNK_SIZE):
+        cleaned.extend(_clean_chunk(texts[start:start + _BATCH_CHUNK_SIZE]))
+
+    return cleaned
@@ -1,7 +1,39 @@
-from flask import render_template, request, redirect, url_for, session, current_app
-from . import mental_health
-from .services.stress_engine import predict_stress
-from .services.chatbot_engine import generate_response
+import hmac
+import uuid
+
+from flask import (
+    Blueprint, render_template, request, redirect, url_for, session, current_app, jsonify
+)
+from .services.stress_engine import (
+    predict_stress, predict_stress_batch, get_registry
+)
+from .services.chatbot_engine import generate_response, ConversationState
+from .services.log_pipeline import SAMPLED
+from .services.metrics import stage_timer
+
+mental_health = Blueprint(
+    "mental_health",
+    __name__,
+    template_folder="templates",
+    static_folder="static"
+)
+
+
+# -----------------------------
+# Conversation Store Helpers
+# -----------------------------
+def _conversation_store():
+    return current_app.extensions["conversation_store"]
+
+
+def _load_conversation():
+    conversation_id = session.get("conversation_id")
+
+    if not conversation_id:
+        return None, None
+
+    with stage_timer("session_load"):
+        return conversation_id, _conversation_store().load(conversation_id)
 
 
 # -----------------------------
@@ -29,36 +61,51 @@ def analyze():
         # Predict stress level
         stress_level, confidence = predict_stress(user_text)
 
-        # Store in session
-        session["stress_level"] = stress_level
-        session["confidence"] = confidence
-        session["age_group"] = age_group
-
-        # Initialize chat history with first user message
-        session["chat_history"] = [
+        # Initialize chat history with first user message (and its score)
+        chat_history = [
             {
                 "role": "user",
-                "message": user_text
+                "message": user_text,
+                "stress_level": stress_level,
+                "confidence": confidence
             }
         ]
 
         # Generate first assistant reply
-        first_reply = generate_response(
-            user_message=user_text,
-            stress_level=stress_level,
-            chat_history=session["chat_history"],
-            age_group=age_group
-        )
+        state = ConversationState()
+
+        with stage_timer("chatbot_rules"):
+            first_reply = generate_response(
+                user_message=user_text,
+                stress_level=stress_level,
+                chat_history=chat_history,
+                age_group=age_group,
+                state=state
+            )
 
-        session["chat_history"].append({
+        chat_history.append({
             "role": "assistant",
             "message": first_reply
         })
 
-        session.modified = True
+        # Store the conversation server-side; the cookie only keeps its ID
+        conversation_id = uuid.uuid4().hex
+
+        with stage_timer("session_write"):
+            _conversation_store().save(conversation_id, {
+                "stress_level": stress_level,
+                "confidence": confidence,
+                "age_group": age_group,
+                "chat_history": chat_history,
+                "conversation_state": state.to_dict()
+            })
+
+        session.clear()
+        session["conversation_id"] = conversation_id
 
         current_app.logger.info(
-            f"Stress detected: {stress_level} | Confidence: {confidence}"
+            "Stress detected: %s | Confidence: %s", stress_level, confidence,
+            extra=dict(SAMPLED, stress_level=stress_level, confidence=confidence)
         )
 
         return redirect(url_for("mental_health.chat"))
@@ -66,13 +113,104 @@ def analyze():
     return render_template("analyze.html")
 
 
+# -----------------------------
+# Batched Scoring API (JSON)
+# -----------------------------
+@mental_health.route("/api/analyze", methods=["POST"])
+def analyze_batch():
+
+    payload = request.get_json(silent=True)
+
+    if not isinstance(payload, dict):
+        return jsonify({"error": "request body must be a JSON object"}), 400
+
+    texts = payload.get("texts")
+
+    if not isinstance(texts, list) or not texts:
+        return jsonify({"error": "'texts' must be a non-empty list"}), 400
+
+    if not all(isinstance(text, str) for text in texts):
+        return jsonify({"error": "every item in 'texts' must be a string"}), 400
+
+    max_batch_size = current_app.config.get("API_MAX_BATCH_SIZE", 500)
+
+    if len(texts) > max_batch_size:
+        return jsonify({
+            "error": f"at most {max_batch_size} texts per request"
+        }), 413
+
+    results = predict_stress_batch(texts)
+
+    return jsonify({"results": results})
+
+
+# -----------------------------
+# Model Admin API (JSON)
+# -----------------------------
+def _admin_authorized() -> bool:
+    token = current_app.config.get("MODEL_ADMIN_TOKEN")
+    supplied = request.headers.get("X-Admin-Token", "")
+
+    return bool(token) and hmac.compare_digest(supplied, token)
+
+
+@mental_health.route("/api/models", methods=["GET"])
+def model_status():
+
+    if not _admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+
+    return jsonify(get_registry().status())
+
+
+@mental_health.route("/api/models/<action>", methods=["POST"])
+def model_admin(action):
+
+    if not _admin_authorized():
+        return jsonify({"error": "forbidden"}), 403
+
+    registry = get_registry()
+    payload = request.get_json(silent=True)
+
+    if payload is None:
+        payload = {}
+
+    if not isinstance(payload, dict):
+        return jsonify({"error": "request body must be a JSON object"}), 400
+
+    version = payload.get("version")
+
+    if action == "pin" and (not isinstance(version, str) or not version):
+        return jsonify({"error": "'version' must be a non-empty string"}), 400
+
+    try:
+        if action == "pin":
+            registry.pin(version)
+        elif action == "unpin":
+            registry.unpin()
+        elif action == "rollback":
+            registry.rollback()
+        else:
+            return jsonify({"error": f"unknown action: {action}"}), 404
+    except (FileNotFoundError, LookupError) as error:
+        return jsonify({"error": str(error)}), 404
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 422
+
+    current_app.logger.info("Model admin action: %s", action, extra={"action": action})
+
+    return jsonify(registry.status())
+
+
 # -----------------------------
 # Chat (Conversational Mode)
 # -----------------------------
 @mental_health.route("/chat", methods=["GET", "POST"])
 def chat():
 
-    if "chat_history" not in session:
+    conversation_id, conversation = _load_conversation()
+
+    if conversation is None:
         return redirect(url_for("mental_health.home"))
 
     if request.method == "POST":
@@ -81,34 +219,55 @@ def chat():
 
         if user_message:
 
+            chat_history = conversation["chat_history"]
+
+            # Rolling conversation summary (rebuilt once if missing)
+            if "conversation_state" in conversation:
+                state = ConversationState.from_dict(conversation["conversation_state"])
+            else:
+                state = ConversationState.from_history(chat_history)
+
+            # Score only the new turn; earlier turns keep their stored scores
+            stress_level, confidence = predict_stress(user_message)
+
             # Append user message
-            session["chat_history"].append({
+            chat_history.append({
                 "role": "user",
-                "message": user_message
+                "message": user_message,
+                "stress_level": stress_level,
+                "confidence": confidence
             })
 
-            stress_level = session.get("stress_level")
-            age_group = session.get("age_group")
+            age_group = conversation.get("age_group")
 
-            # Generate contextual AI response (FIXED)
-            ai_reply = generate_response(
-                user_message=user_message,
-                stress_level=stress_level,
-                chat_history=session.get("chat_history", []),
-                age_group=age_group
-            )
+            # Generate contextual AI response
+            with stage_timer("chatbot_rules"):
+                ai_reply = generate_response(
+                    user_message=user_message,
+                    stress_level=stress_level,
+                    chat_history=chat_history,
+                    age_group=age_group,
+                    state=state
+                )
 
             # Append assistant reply
-            session["chat_history"].append({
+            chat_history.append({
                 "role": "assistant",
                 "message": ai_reply
             })
 
-            session.modified = True
+            conversation["conversation_state"] = state.to_dict()
+
+            # The badge follows the rolling trajectory, not the first message
+            conversation["stress_level"] = state.trajectory_level() or stress_level
+            conversation["confidence"] = confidence
+
+            with stage_timer("session_write"):
+                _conversation_store().save(conversation_id, conversation)
 
     return render_template(
         "chat.html",
-        chat_history=session.get("chat_history", []),
-        stress_level=session.get("stress_level"),
-        confidence=session.get("confidence")
+        chat_history=conversation.get("chat_history", []),
+        stress_level=conversation.get("stress_level"),
+        confidence=conversation.get("confidence")
     )
@@ -0,0 +1,386 @@
+import os
+import re
+import json
+import struct
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+# =====================================================
+# Compact Runtime Model (shared by training and serving)
+# =====================================================
+#
+# A fitted TF-IDF + linear classifier Pipeline reduced to what scoring
+# needs, in one memory-mappable file:
+#
+#   magic (8 bytes) | header length (uint64 LE) | JSON header | arrays
+#
+# The header holds the analyzer settings (lowercasing, accent stripping,
+# token pattern, stop words, n-gram range, tf weighting, norm) and the
+# class labels; each array starts on a 64-byte boundary:
+#
+#   terms      sorted vocabulary as fixed-width UTF-8 bytes (n_features,)
+#   idf        float32 (n_features,), only with use_idf
+#   coef       float32 (n_features, n_outputs), columns in `terms` order
+#   intercept  float32 (n_outputs,)
+#
+# Scoring needs only NumPy: vocabulary lookups are one searchsorted over
+# the sorted terms for a whole batch.
+
+MAGIC = b"STRESSRT"
+FORMAT_VERSION = 1
+
+_ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sQ")
+
+
+# =====================================================
+# Export
+# =====================================================
+
+def export_runtime_model(model, path: str, check_texts: Optional[List[str]] = None) -> str:
+    """
+    Write a fitted Pipeline (TfidfVectorizer or CountVectorizer followed
+    by LogisticRegression or a log-loss SGDClassifier) as a runtime
+    artifact. With `check_texts`, the written file is loaded back and
+    must reproduce the Pipeline's probabilities; ValueError otherwise.
+    """
+    vectorizer, classifier = model[0], model[-1]
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "analyzer": _analyzer_settings(vectorizer),
+        "classes": np.asarray(classifier.classes_).tolist(),
+        "probability": _probability_mode(classifier)
+    }
+
+    terms, columns = zip(*sorted(
+        (term.encode("utf-8"), index) for term, index in vectorizer.vocabulary_.items()
+    ))
+    columns = np.array(columns)
+
+    arrays = {
+        "terms": np.array(terms, dtype=f"S{max(len(term) for term in terms)}"),
+        "coef": np.ascontiguousarray(
+            np.asarray(classifier.coef_, dtype=np.float32)[:, columns].T
+        ),
+        "intercept": np.asarray(classifier.intercept_, dtype=np.float32).reshape(-1)
+    }
+
+    tfidf = getattr(vectorizer, "_tfidf", None)
+
+    if tfidf is not None and tfidf.use_idf:
+        arrays["idf"] = np.asarray(tfidf.idf_, dtype=np.float32)[columns]
+
+    _write(path, header, arrays)
+
+    if check_texts is not None:
+        expected = model.predict_proba(check_texts)
+        actual = RuntimeModel.load(path).predict_proba(check_texts)
+
+        error = float(np.max(np.abs(expected - actual))) if len(check_texts) else 0.0
+
+        if error > 1e-4:
+            raise ValueError(
+                f"Runtime model differs from the pipeline by {error:.2e} on the check texts"
+            )
+
+    return path
+
+
+def _analyzer_settings(vectorizer) -> Dict:
+    if getattr(vectorizer, "vocabulary_", None) is None:
+        raise ValueError(f"{type(vectorizer).__name__} has no vocabulary to export")
+
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer or vectorizer.preprocessor:
+        raise ValueError("Only the built-in word analyzer can be exported")
+
+    if vectorizer.strip_accents not in (None, "ascii", "unicode"):
+        raise ValueError(f"Unsupported strip_accents: {vectorizer.strip_accents!r}")
+
+    tfidf = getattr(vectorizer, "_tfidf", None)
+    stop_words = vectorizer.get_stop_words()
+
+    return {
+        "lowercase": bool(vectorizer.lowercase),
+        "strip_accents": vectorizer.strip_accents,
+        "token_pattern": vectorizer.token_pattern,
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "ngram_range": list(vectorizer.ngram_range),
+        "binary": bool(vectorizer.binary),
+        "sublinear_tf": bool(tfidf.sublinear_tf) if tfidf is not None else False,
+        "norm": tfidf.norm if tfidf is not None else None
+    }
+
+
+def _probability_mode(classifier) -> str:
+    """
+    "multinomial" (softmax) or "ovr" (per-class sigmoid, normalized), as
+    the classifier's own predict_proba computes it.
+    """
+    name = type(classifier).__name__
+
+    if name == "SGDClassifier" and classifier.loss == "log_loss":
+        return "ovr"
+
+    if name == "LogisticRegression":
+        multi_class = classifier.multi_class
+
+        if multi_class in ("ovr", "warn") or (
+            multi_class == "auto"
+            and (len(classifier.classes_) <= 2 or classifier.solver == "liblinear")
+        ):
+            return "ovr"
+
+        return "multinomial"
+
+    raise ValueError(f"Cannot export probabilities of {name}")
+
+
+def _write(path: str, header: Dict, arrays: Dict[str, np.ndarray]) -> None:
+    header["arrays"] = {}
+
+    # Offsets depend on the header length, which depends on the offsets;
+    # reserve room for them first, then lay the arrays out after it
+    placeholder = json.dumps({**header, "arrays": {
+        name: {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 10 ** 15}
+        for name, array in arrays.items()
+    }}).encode("utf-8")
+
+    offset = _align(_PREFIX.size + len(placeholder))
+
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset
+        }
+        offset = _align(offset + array.nbytes)
+
+    encoded = json.dumps(header).encode("utf-8").ljust(len(placeholder))
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+
+        for name, array in arrays.items():
+            f.write(b"\0" * (header["arrays"][name]["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    # Same write-then-rename rule as the pickled artifacts
+    os.replace(tmp_path, path)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+# =====================================================
+# Scoring
+# =====================================================
+
+class Features(NamedTuple):
+    """
+    Sparse TF-IDF rows as coordinate arrays.
+    """
+    n_rows: int
+    rows: np.ndarray
+    columns: np.ndarray
+    values: np.ndarray
+
+
+class RuntimeModel:
+    """
+    Pure-NumPy scorer for a runtime artifact. The arrays are read-only
+    views of a memory map of the file, so processes serving the same
+    artifact share its pages.
+    """
+
+    def __init__(self, header: Dict, arrays: Dict[str, np.ndarray], path: str = None):
+        self.path = path
+        self.classes_ = np.array(header["classes"])
+        self.probability = header["probability"]
+
+        analyzer = header["analyzer"]
+
+        self.lowercase = analyzer["lowercase"]
+        self.strip_accents = analyzer["strip_accents"]
+        self.stop_words = frozenset(analyzer["stop_words"])
+        self.ngram_range = tuple(analyzer["ngram_range"])
+        self.binary = analyzer["binary"]
+        self.sublinear_tf = analyzer["sublinear_tf"]
+        self.norm = analyzer["norm"]
+
+        token_pattern = re.compile(analyzer["token_pattern"])
+
+        if token_pattern.groups > 1:
+            raise ValueError("token_pattern may capture at most one group")
+
+        self._tokenize = token_pattern.findall
+
+        self.terms = arrays["terms"]
+        self.idf = arrays.get("idf")
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+
+    @classmethod
+    def load(cls, path: str) -> "RuntimeModel":
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+        magic, header_length = _PREFIX.unpack(bytes(buffer[:_PREFIX.size]))
+
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a runtime model artifact")
+
+        header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + header_length]))
+
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported runtime model format {header.get('format_version')}"
+            )
+
+        arrays = {}
+
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            start = spec["offset"]
+
+            arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+        return cls(header, arrays, path)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.terms)
+
+    # ---------------------------------------------
+    # Analyzer (CountVectorizer's word analyzer)
+    # ---------------------------------------------
+    def analyze(self, text: str) -> List[str]:
+        if self.lowercase:
+            text = text.lower()
+
+        if self.strip_accents == "unicode":
+            if not text.isascii():
+                text = "".join(
+                    c for c in unicodedata.normalize("NFKD", text)
+                    if not unicodedata.combining(c)
+                )
+        elif self.strip_accents == "ascii":
+            text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+        tokens = self._tokenize(text)
+
+        if self.stop_words:
+            tokens = [token for token in tokens if token not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+
+        if max_n == 1:
+            return tokens
+
+        grams = list(tokens) if min_n == 1 else []
+
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+        return grams
+
+    # ---------------------------------------------
+    # Vectorize & Classify
+    # ---------------------------------------------
+    def vectorize(self, texts: List[str]) -> Features:
+        grams: List[bytes] = []
+        rows: List[int] = []
+
+        for row, text in enumerate(texts):
+            analyzed = self.analyze(text)
+            grams.extend(gram.encode("utf-8") for gram in analyzed)
+            rows.extend([row] * len(analyzed))
+
+        rows = np.array(rows, dtype=np.int64)
+
+        # Longer n-grams cannot be terms; blank them before the
+        # fixed-width conversion would truncate them into a false match
+        width = self.terms.dtype.itemsize
+        keys = np.array(
+            [gram if len(gram) <= width else b"" for gram in grams],
+            dtype=self.terms.dtype
+        )
+
+        positions = np.searchsorted(self.terms, keys)
+        np.minimum(positions, self.n_features - 1, out=positions)
+
+        found = self.terms[positions] == keys
+
+        # Count each (row, term) pair once
+        pairs, counts = np.unique(
+            rows[found] * self.n_features + positions[found], return_counts=True
+        )
+
+        rows, columns = np.divmod(pairs, self.n_features)
+        values = counts.astype(np.float64)
+
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = np.log(values) + 1.0
+
+        if self.idf is not None:
+            values *= self.idf[columns]
+
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+        elif self.norm == "l1":
+            norms = np.bincount(rows, weights=np.abs(values), minlength=len(texts))
+        else:
+            norms = None
+
+        if norms is not None:
+            norms[norms == 0.0] = 1.0
+            values /= norms[rows]
+
+        return Features(len(texts), rows, columns, values)
+
+    def decision_function(self, features: Features) -> np.ndarray:
+        n_outputs = self.coef.shape[1]
+        scores = np.empty((features.n_rows, n_outputs))
+
+        weights = self.coef[features.columns] * features.values[:, None]
+
+        for output in range(n_outputs):
+            scores[:, output] = np.bincount(
+                features.rows, weights=weights[:, output], minlength=features.n_rows
+            )
+
+        scores += self.intercept
+
+        return scores
+
+    def classify(self, features: Features) -> np.ndarray:
+        scores = self.decision_function(features)
+
+        if self.probability == "multinomial":
+            if scores.shape[1] == 1:
+                scores = np.hstack([-scores, scores])
+
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+        else:
+            scores = 1.0 / (1.0 + np.exp(-scores))
+
+            if scores.shape[1] == 1:
+                return np.hstack([1.0 - scores, scores])
+
+        scores /= scores.sum(axis=1, keepdims=True)
+
+        return scores
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        return self.classify(self.vectorize(texts))
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        return self.classes_[self.predict_proba(texts).argmax(axis=1)]
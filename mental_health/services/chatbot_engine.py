@@ -1,5 +1,9 @@
 import logging
-from typing import List, Dict, Optional
+from collections import deque
+from typing import List, Dict, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher
+from .log_pipeline import SAMPLED
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +26,60 @@ MODERATE_INTENSITY_WORDS = [
 
 
 # =====================================================
-# Emotion Detection
+# Topic Keywords (checked in priority order)
 # =====================================================
 
-def detect_emotion_intensity(message: str) -> str:
-    if not isinstance(message, str):
-        return "Low"
+TOPIC_KEYWORDS = {
+    "sleep": ["sleep", "insomnia", "not sleeping"],
+    "work": ["work", "office", "deadline", "boss", "workload"],
+    "academics": ["exam", "college", "study", "marks"],
+    "relationships": ["relationship", "partner", "breakup", "family"],
+    "fatigue": ["tired", "exhausted", "burnout"]
+}
 
-    message = message.lower()
 
+# =====================================================
+# Keyword Matching
+# =====================================================
+
+# Below this many keywords, substring checks in priority order (C string
+# search, stopping at the first hit) are faster than one pass of the
+# pure-Python automaton; see benchmarks/bench_keyword_matcher.py
+AUTOMATON_MIN_KEYWORDS = 300
+
+
+def lexicon_size() -> int:
+    return (
+        len(HIGH_INTENSITY_WORDS)
+        + len(MODERATE_INTENSITY_WORDS)
+        + sum(len(words) for words in TOPIC_KEYWORDS.values())
+    )
+
+
+def build_keyword_matcher() -> Optional[KeywordMatcher]:
+    """
+    Compile every intensity and topic lexicon into one automaton once
+    they hold AUTOMATON_MIN_KEYWORDS keywords or more, so a message is
+    scanned once however large they grow. Smaller lexicons return None
+    and are scanned keyword by keyword. Call again after changing the
+    keyword lists.
+    """
+    if lexicon_size() < AUTOMATON_MIN_KEYWORDS:
+        return None
+
+    keywords = [(word, ("intensity", "High")) for word in HIGH_INTENSITY_WORDS]
+    keywords += [(word, ("intensity", "Moderate")) for word in MODERATE_INTENSITY_WORDS]
+
+    for topic, words in TOPIC_KEYWORDS.items():
+        keywords += [(word, ("topic", topic)) for word in words]
+
+    return KeywordMatcher(keywords)
+
+
+_matcher = build_keyword_matcher()
+
+
+def _scan_intensity(message: str) -> str:
     for word in HIGH_INTENSITY_WORDS:
         if word in message:
             return "High"
@@ -42,27 +91,208 @@ def detect_emotion_intensity(message: str) -> str:
     return "Low"
 
 
+def _scan_topic(message: str) -> str:
+    for topic, words in TOPIC_KEYWORDS.items():
+        if any(word in message for word in words):
+            return topic
+
+    return "general"
+
+
+def analyze_message(message: str) -> Tuple[str, str]:
+    """
+    Return (emotion intensity, topic) for a message: the first lexicon
+    (in priority order) with a keyword occurring as a substring of the
+    lowercased message.
+    """
+    if not isinstance(message, str):
+        return "Low", "general"
+
+    message = message.lower()
+    matcher = _matcher
+
+    if matcher is None:
+        return _scan_intensity(message), _scan_topic(message)
+
+    found = matcher.match(message)
+
+    if ("intensity", "High") in found:
+        intensity = "High"
+    elif ("intensity", "Moderate") in found:
+        intensity = "Moderate"
+    else:
+        intensity = "Low"
+
+    topic = next(
+        (name for name in TOPIC_KEYWORDS if ("topic", name) in found),
+        "general"
+    )
+
+    return intensity, topic
+
+
+# =====================================================
+# Emotion Detection
+# =====================================================
+
+def detect_emotion_intensity(message: str) -> str:
+    if _matcher is None and isinstance(message, str):
+        return _scan_intensity(message.lower())
+
+    return analyze_message(message)[0]
+
+
 # =====================================================
 # Escalation Logic
 # =====================================================
 
+RECENT_MESSAGE_WINDOW = 6
+
+NEGATIVE_INTENSITIES = ("High", "Moderate")
+
+
 def count_recent_negative_messages(chat_history: List[Dict]) -> int:
 
     user_messages = [
         msg["message"]
         for msg in chat_history
         if msg.get("role") == "user"
-    ][-6:]
+    ][-RECENT_MESSAGE_WINDOW:]
 
     count = 0
 
     for msg in user_messages:
-        if detect_emotion_intensity(msg) in ["High", "Moderate"]:
+        if detect_emotion_intensity(msg) in NEGATIVE_INTENSITIES:
             count += 1
 
     return count
 
 
+# =====================================================
+# Stress Trajectory (per-turn model scores)
+# =====================================================
+
+# Model stress levels on a 0..1 scale for the rolling average
+STRESS_SCORES = {"Low": 0.0, "Moderate": 0.5, "High": 1.0}
+
+# Weight of the newest turn in the exponentially weighted average
+STRESS_EWMA_ALPHA = 0.4
+
+# Scored turns before the trajectory alone can trigger escalation
+SUSTAINED_STRESS_TURNS = 2
+
+
+# =====================================================
+# Conversation State
+# =====================================================
+
+class ConversationState:
+    """
+    Rolling summary of a conversation, kept next to the chat history so
+    each turn only has to look at the new message instead of rescanning
+    the whole history.
+
+    stress_trajectory is an exponentially weighted average of the model's
+    per-turn stress levels (see STRESS_SCORES), updated in O(1) per turn.
+    """
+
+    def __init__(
+        self,
+        user_turns: int = 0,
+        recent_intensities: Optional[List[str]] = None,
+        last_reply: Optional[str] = None,
+        stress_trajectory: Optional[float] = None,
+        scored_turns: int = 0
+    ):
+        self.user_turns = user_turns
+        self.recent_intensities = deque(
+            recent_intensities or [], maxlen=RECENT_MESSAGE_WINDOW
+        )
+        self.last_reply = last_reply
+        self.stress_trajectory = stress_trajectory
+        self.scored_turns = scored_turns
+
+    def record_user_message(self, intensity: str, stress_level: Optional[str] = None) -> None:
+        self.user_turns += 1
+        self.recent_intensities.append(intensity)
+
+        if stress_level in STRESS_SCORES:
+            self.record_stress(stress_level)
+
+    def record_stress(self, stress_level: str) -> None:
+        score = STRESS_SCORES[stress_level]
+
+        if self.stress_trajectory is None:
+            self.stress_trajectory = score
+        else:
+            self.stress_trajectory += STRESS_EWMA_ALPHA * (score - self.stress_trajectory)
+
+        self.scored_turns += 1
+
+    def trajectory_level(self) -> Optional[str]:
+        """
+        The stress level nearest to the rolling average, or None before
+        any turn was scored.
+        """
+        if self.stress_trajectory is None:
+            return None
+
+        levels = list(STRESS_SCORES)
+        return levels[round(self.stress_trajectory * (len(levels) - 1))]
+
+    def sustained_high_stress(self) -> bool:
+        return (
+            self.scored_turns >= SUSTAINED_STRESS_TURNS
+            and self.trajectory_level() == "High"
+        )
+
+    def negative_count(self) -> int:
+        return sum(
+            1 for intensity in self.recent_intensities
+            if intensity in NEGATIVE_INTENSITIES
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "user_turns": self.user_turns,
+            "recent_intensities": list(self.recent_intensities),
+            "last_reply": self.last_reply,
+            "stress_trajectory": self.stress_trajectory,
+            "scored_turns": self.scored_turns
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "ConversationState":
+        data = data or {}
+
+        return cls(
+            user_turns=data.get("user_turns", 0),
+            recent_intensities=data.get("recent_intensities"),
+            last_reply=data.get("last_reply"),
+            stress_trajectory=data.get("stress_trajectory"),
+            scored_turns=data.get("scored_turns", 0)
+        )
+
+    @classmethod
+    def from_history(cls, chat_history: List[Dict]) -> "ConversationState":
+        """
+        Rebuild the state from a full chat history (one-off, for sessions
+        created before the state was tracked). Turns are never re-scored:
+        only the stress levels stored on the messages feed the trajectory.
+        """
+        state = cls()
+
+        for msg in chat_history:
+            if msg.get("role") == "user":
+                state.record_user_message(
+                    detect_emotion_intensity(msg["message"]), msg.get("stress_level")
+                )
+            elif msg.get("role") == "assistant":
+                state.last_reply = msg["message"]
+
+        return state
+
+
 def professional_support_message(age_group: Optional[str]):
 
     if age_group == "Teen":
@@ -88,25 +318,10 @@ def professional_support_message(age_group: Optional[str]):
 # =====================================================
 
 def detect_topic(message: str) -> str:
+    if _matcher is None and isinstance(message, str):
+        return _scan_topic(message.lower())
 
-    message = message.lower()
-
-    if any(word in message for word in ["sleep", "insomnia", "not sleeping"]):
-        return "sleep"
-
-    if any(word in message for word in ["work", "office", "deadline", "boss", "workload"]):
-        return "work"
-
-    if any(word in message for word in ["exam", "college", "study", "marks"]):
-        return "academics"
-
-    if any(word in message for word in ["relationship", "partner", "breakup", "family"]):
-        return "relationships"
-
-    if any(word in message for word in ["tired", "exhausted", "burnout"]):
-        return "fatigue"
-
-    return "general"
+    return analyze_message(message)[1]
 
 
 # =====================================================
@@ -117,32 +332,56 @@ def generate_response(
     user_message: str,
     stress_level: str,
     chat_history: List[Dict],
-    age_group: str = None
+    age_group: str = None,
+    state: Optional[ConversationState] = None
 ):
+    """
+    Produce the assistant reply for the newest user message, whose model
+    stress level is `stress_level`.
+
+    When a ConversationState is passed, it is updated in place with the
+    new message, its stress level and the reply, and chat_history is not
+    scanned. Without one, the state is derived from chat_history, which
+    must already contain the new user message (with its stress level).
+    """
 
-    logger.info("Generating advanced contextual response")
+    logger.info("Generating advanced contextual response", extra=SAMPLED)
+
+    emotion, topic = analyze_message(user_message)
+
+    if state is None:
+        state = ConversationState.from_history(chat_history)
+    else:
+        state.record_user_message(emotion, stress_level)
 
     if not isinstance(user_message, str):
-        return "Can you tell me more about that?"
+        reply = "Can you tell me more about that?"
+    else:
+        reply = _compose_reply(emotion, topic, state, age_group)
+
+    state.last_reply = reply
+
+    return reply
+
 
-    topic = detect_topic(user_message)
-    emotion = detect_emotion_intensity(user_message)
-    negative_count = count_recent_negative_messages(chat_history)
+def _compose_reply(
+    emotion: str,
+    topic: str,
+    state: ConversationState,
+    age_group: Optional[str]
+) -> str:
 
-    user_turns = len([m for m in chat_history if m["role"] == "user"])
+    negative_count = state.negative_count()
+    user_turns = state.user_turns
 
     # Last assistant message (for repetition prevention)
-    last_assistant_message = None
-    for msg in reversed(chat_history):
-        if msg["role"] == "assistant":
-            last_assistant_message = msg["message"]
-            break
+    last_assistant_message = state.last_reply
 
     # =====================================================
-    # 🚨 Escalation (if emotional intensity stays high)
+    # 🚨 Escalation (if emotional intensity or model stress stays high)
     # =====================================================
 
-    if negative_count >= 3 or emotion == "High":
+    if negative_count >= 3 or emotion == "High" or state.sustained_high_stress():
 
         support = professional_support_message(age_group)
 
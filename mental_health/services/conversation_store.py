@@ -0,0 +1,319 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================================
+# Store Interface
+# =====================================================
+
+class ConversationStore(ABC):
+    """
+    Server-side storage for conversations. The session cookie only keeps
+    the conversation ID; history, state and stress results live here.
+
+    A conversation is a JSON-serializable dict with a "chat_history"
+    list. Stores keep at most `max_messages` history entries per
+    conversation and forget conversations idle for `ttl_seconds`.
+    """
+
+    # Seconds between sweeps that drop expired conversations
+    PURGE_INTERVAL = 60.0
+
+    def __init__(self, max_messages: int = 50, ttl_seconds: float = 86400):
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self._last_purge = 0.0
+
+    @abstractmethod
+    def load(self, conversation_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def save(self, conversation_id: str, conversation: Dict) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, conversation_id: str) -> None:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def _trim(self, conversation: Dict) -> Dict:
+        # A trimmed shallow copy; the caller's conversation is left as is
+        history = conversation.get("chat_history", [])
+
+        if len(history) > self.max_messages:
+            return dict(conversation, chat_history=history[-self.max_messages:])
+
+        return conversation
+
+    def _is_expired(self, updated_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - updated_at > self.ttl_seconds
+
+    def _purge_due(self, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - self._last_purge >= self.PURGE_INTERVAL
+
+
+# =====================================================
+# In-Memory Store (single process, tests/dev)
+# =====================================================
+
+class InMemoryConversationStore(ConversationStore):
+
+    def __init__(self, max_messages: int = 50, ttl_seconds: float = 86400):
+        super().__init__(max_messages, ttl_seconds)
+        self._lock = threading.Lock()
+        self._conversations: Dict[str, tuple] = {}
+
+    def load(self, conversation_id):
+        now = time.time()
+
+        with self._lock:
+            entry = self._conversations.get(conversation_id)
+
+            if entry is None:
+                return None
+
+            if self._is_expired(entry[1], now):
+                del self._conversations[conversation_id]
+                return None
+
+            return json.loads(entry[0])
+
+    def save(self, conversation_id, conversation):
+        data = json.dumps(self._trim(conversation))
+        now = time.time()
+
+        with self._lock:
+            self._conversations[conversation_id] = (data, now)
+
+            if self._purge_due(now):
+                expired = [
+                    key for key, (_, updated_at) in self._conversations.items()
+                    if self._is_expired(updated_at, now)
+                ]
+
+                for key in expired:
+                    del self._conversations[key]
+
+                self._last_purge = now
+
+    def delete(self, conversation_id):
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
+
+
+# =====================================================
+# SQLite Store (write-behind batching)
+# =====================================================
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Conversations persisted in a local SQLite file.
+
+    Writes are buffered and committed in one transaction once
+    `write_batch_size` conversations are pending or `flush_interval`
+    seconds have passed, whichever comes first. Reads from this process
+    see pending writes immediately; other processes only see them after
+    the next flush, so worker processes sharing the file must write
+    through (`write_batch_size=1`).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_messages: int = 50,
+        ttl_seconds: float = 86400,
+        write_batch_size: int = 32,
+        flush_interval: float = 1.0
+    ):
+        super().__init__(max_messages, ttl_seconds)
+
+        self.path = path
+        self.write_batch_size = max(1, write_batch_size)
+        self.flush_interval = flush_interval
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[str, tuple] = {}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversations ("
+            " id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_conversations_updated_at"
+            " ON conversations (updated_at)"
+        )
+        self._conn.commit()
+
+        self._closed = threading.Event()
+        self._flusher = None
+
+        if flush_interval and flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                name="conversation-store-flush",
+                daemon=True
+            )
+            self._flusher.start()
+
+    # ---------------------------------------------
+    # Reads
+    # ---------------------------------------------
+    def load(self, conversation_id):
+        now = time.time()
+
+        with self._pending_lock:
+            entry = self._pending.get(conversation_id)
+
+        if entry is None:
+            with self._db_lock:
+                entry = self._conn.execute(
+                    "SELECT data, updated_at FROM conversations WHERE id = ?",
+                    (conversation_id,)
+                ).fetchone()
+
+        if entry is None or entry[0] is None:
+            return None
+
+        if self._is_expired(entry[1], now):
+            self.delete(conversation_id)
+            return None
+
+        return json.loads(entry[0])
+
+    # ---------------------------------------------
+    # Writes
+    # ---------------------------------------------
+    def save(self, conversation_id, conversation):
+        data = json.dumps(self._trim(conversation))
+
+        with self._pending_lock:
+            self._pending[conversation_id] = (data, time.time())
+            batch_full = len(self._pending) >= self.write_batch_size
+
+        if batch_full:
+            self.flush()
+
+    def delete(self, conversation_id):
+        # A None payload marks a pending delete
+        with self._pending_lock:
+            self._pending[conversation_id] = (None, time.time())
+
+        self.flush()
+
+    def flush(self):
+        # The DB lock is held from snapshot to commit, so flushes commit in
+        # order; pending entries stay readable until their commit succeeds
+        # and are kept (for the next flush) if it fails
+        with self._db_lock:
+            with self._pending_lock:
+                pending = dict(self._pending)
+
+            now = time.time()
+            purge = self._purge_due(now)
+
+            if not pending and not purge:
+                return
+
+            upserts = [
+                (conversation_id, data, updated_at)
+                for conversation_id, (data, updated_at) in pending.items()
+                if data is not None
+            ]
+            deletes = [
+                (conversation_id,)
+                for conversation_id, (data, _) in pending.items()
+                if data is None
+            ]
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO conversations (id, data, updated_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(id) DO UPDATE SET"
+                    " data = excluded.data, updated_at = excluded.updated_at"
+                    " WHERE excluded.updated_at >= conversations.updated_at",
+                    upserts
+                )
+                self._conn.executemany(
+                    "DELETE FROM conversations WHERE id = ?", deletes
+                )
+
+                if purge:
+                    self._conn.execute(
+                        "DELETE FROM conversations WHERE updated_at < ?",
+                        (now - self.ttl_seconds,)
+                    )
+
+            if purge:
+                self._last_purge = now
+
+            # Entries saved again while committing stay pending
+            with self._pending_lock:
+                for conversation_id, entry in pending.items():
+                    if self._pending.get(conversation_id) is entry:
+                        del self._pending[conversation_id]
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                logger.exception("Conversation store flush failed")
+
+    def close(self):
+        if self._closed.is_set():
+            return
+
+        self._closed.set()
+        self.flush()
+
+        with self._db_lock:
+            self._conn.close()
+
+
+# =====================================================
+# Factory
+# =====================================================
+
+def create_conversation_store(config) -> ConversationStore:
+    backend = config.get("CONVERSATION_STORE", "sqlite")
+
+    max_messages = config.get("CONVERSATION_MAX_MESSAGES", 50)
+    ttl_seconds = config.get("CONVERSATION_TTL_SECONDS", 86400)
+
+    if backend == "memory":
+        return InMemoryConversationStore(max_messages, ttl_seconds)
+
+    if backend == "sqlite":
+        return SQLiteConversationStore(
+            config.get("CONVERSATION_DB_PATH", "conversations.db"),
+            max_messages=max_messages,
+            ttl_seconds=ttl_seconds,
+            write_batch_size=config.get("CONVERSATION_WRITE_BATCH_SIZE", 32),
+            flush_interval=config.get("CONVERSATION_FLUSH_INTERVAL", 1.0)
+        )
+
+    raise ValueError(f"Unknown conversation store backend: {backend}")
@@ -0,0 +1,103 @@
+from collections import deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+
+# =====================================================
+# Multi-Pattern Keyword Matcher (Aho-Corasick)
+# =====================================================
+
+class KeywordMatcher:
+    """
+    Finds every keyword occurring as a substring of a text in a single
+    left-to-right pass. Each keyword carries one or more tags, and
+    match() returns the set of tags whose keywords were seen.
+
+    Matching cost grows with the length of the text, not with the
+    number of keywords, but each character is a Python-level step: for
+    a few hundred keywords or fewer, `keyword in text` per keyword is
+    faster.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[Set[Hashable]] = [set()]
+        self._fail: List[int] = [0]
+        self._built = False
+
+        for keyword, tag in keywords:
+            self.add(keyword, tag)
+
+        self.build()
+
+    def add(self, keyword: str, tag: Hashable) -> None:
+        if not keyword:
+            raise ValueError("Keywords must be non-empty strings")
+
+        state = 0
+
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._outputs.append(set())
+                self._fail.append(0)
+                self._goto[state][char] = next_state
+
+            state = next_state
+
+        self._outputs[state].add(tag)
+        self._built = False
+
+    def build(self) -> None:
+        """
+        Compute failure links breadth-first and fold the outputs of each
+        failure target into its source state, so match() never has to
+        walk failure chains to collect tags.
+        """
+        queue = deque()
+
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] |= self._outputs[self._fail[next_state]]
+
+        self._frozen_outputs: List[FrozenSet[Hashable]] = [
+            frozenset(tags) for tags in self._outputs
+        ]
+        self._built = True
+
+    def match(self, text: str) -> Set[Hashable]:
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._frozen_outputs
+
+        found = set()
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+
+            state = goto[state].get(char, 0)
+
+            if outputs[state]:
+                found |= outputs[state]
+
+        return found
@@ -0,0 +1,250 @@
+import os
+import json
+import queue
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
+
+# Pass as `extra=SAMPLED` on high-volume info logs to subject them to LOG_SAMPLE_RATE
+SAMPLED = {"sampled": True}
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime", "taskName"}
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+_CONSOLE_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+
+# =====================================================
+# Formatting
+# =====================================================
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time (UTC, ISO 8601), level, logger,
+    message, every field passed through `extra` (the SAMPLED flag shows
+    up as `sample_rate`), and the traceback if there is one.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and key != "sampled" and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+
+        return json.dumps(entry, default=str)
+
+
+# =====================================================
+# Request-thread Side
+# =====================================================
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueue records as they are. The stock QueueHandler formats the
+    message in the logging thread; here %-style arguments are merged and
+    JSON is built by the listener thread, so a log call on the request
+    path costs one record allocation and a queue put.
+
+    Arguments are therefore read after the call returns: pass values, not
+    objects that the caller goes on to mutate.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks keep whole frames alive; render them right away
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a `rate` fraction of INFO-and-below records logged with
+    extra=SAMPLED; all other records pass. Kept records carry the rate
+    (`sample_rate`) so counts can be scaled back up.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = min(1.0, max(0.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or record.levelno > logging.INFO:
+            return True
+
+        if self.rate < 1.0 and random.random() >= self.rate:
+            return False
+
+        record.sample_rate = self.rate
+        return True
+
+
+# =====================================================
+# Pipeline
+# =====================================================
+
+_listener: Optional[QueueListener] = None
+_listener_running = False
+_queue_handler: Optional[DeferredQueueHandler] = None
+
+
+def init_app(app) -> None:
+    """
+    Route the app logger and the mental_health package loggers through
+    an unbounded queue to a background listener thread that writes JSON
+    lines to LOG_DIR/app.log (rotated at LOG_MAX_BYTES, LOG_BACKUP_COUNT
+    files kept) and, in debug mode, readable lines to stderr.
+    """
+    global _listener, _queue_handler
+
+    shutdown()
+
+    log_dir = app.config.get("LOG_DIR", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    handlers = [_file_handler(app, os.path.join(log_dir, "app.log"))]
+
+    if app.debug:
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(_CONSOLE_FORMAT))
+        handlers.append(console)
+
+    log_queue = queue.SimpleQueue()
+
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(SamplingFilter(app.config.get("LOG_SAMPLE_RATE", 1.0)))
+
+    from flask.logging import default_handler
+
+    for logger in _loggers(app):
+        for handler in list(logger.handlers):
+            # Flask's synchronous stderr handler, or ours from an earlier app
+            if handler is default_handler or isinstance(handler, DeferredQueueHandler):
+                logger.removeHandler(handler)
+
+        logger.addHandler(_queue_handler)
+        logger.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+        logger.propagate = False
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _start_listener()
+
+
+def use_log_file(app, file_name: str) -> None:
+    """
+    Write this process's logs to LOG_DIR/`file_name` instead. Forked
+    workers each need their own file: rotation is not safe across
+    processes sharing one.
+    """
+    if _listener is None:
+        return
+
+    log_dir = app.config.get("LOG_DIR", "logs")
+    replacement = _file_handler(app, os.path.join(log_dir, file_name))
+
+    # Swapped while the listener is stopped, so its thread never writes
+    # through (or reopens) a handler being closed; queued records wait
+    running = _listener_running
+    _stop_listener()
+
+    handlers = list(_listener.handlers)
+
+    for index, handler in enumerate(handlers):
+        if isinstance(handler, RotatingFileHandler):
+            handlers[index] = replacement
+
+            # Only this process's copy closes; the parent keeps its file
+            handler.close()
+
+    _listener.handlers = tuple(handlers)
+
+    if running:
+        _start_listener()
+
+
+def _file_handler(app, path: str) -> RotatingFileHandler:
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=app.config.get("LOG_MAX_BYTES", 10 * 1024 * 1024),
+        backupCount=app.config.get("LOG_BACKUP_COUNT", 5),
+        encoding="utf-8",
+        delay=True
+    )
+    handler.setFormatter(JsonFormatter())
+
+    return handler
+
+
+def _loggers(app) -> List[logging.Logger]:
+    return [app.logger, logging.getLogger("mental_health")]
+
+
+def shutdown() -> None:
+    """
+    Write out everything still queued and stop the listener thread.
+    Registered with atexit; processes leaving through os._exit call it
+    themselves.
+    """
+    _stop_listener()
+
+
+def _start_listener() -> None:
+    global _listener_running
+
+    _listener.start()
+    _listener_running = True
+
+
+def _stop_listener() -> None:
+    global _listener_running
+
+    if _listener is not None and _listener_running:
+        _listener.stop()
+        _listener_running = False
+
+
+def _restart_after_fork() -> None:
+    # The listener thread does not survive a fork; the child gets a fresh
+    # queue (records already queued belong to the parent) and a new
+    # listener over the same handlers
+    global _listener
+
+    if _listener is None or not _listener_running:
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _start_listener()
+
+
+atexit.register(shutdown)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,270 @@
+import time
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# =====================================================
+# In-Process Metrics (Prometheus text exposition)
+# =====================================================
+#
+# Each worker process keeps its own registry; scrape every worker (or
+# aggregate in Prometheus) when running more than one. Recording is a
+# bisect plus a few integer updates under a lock, cheap enough to leave
+# on in production.
+
+# Latency buckets in seconds: 50us .. 5s
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+
+        with self._lock:
+            values = list(self._values.items())
+
+        for labels, value in values:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+
+        return lines
+
+
+class Histogram:
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple = ()) -> None:
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(labels)
+
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, *labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            snapshot = [
+                (labels, list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            ]
+
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                label_text = _format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+
+        return lines
+
+
+class _Timer:
+    """
+    Context manager observing the elapsed wall time into a histogram.
+    """
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[str]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(
+            name, lambda: Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def set_collector(self, name: str, collect: Callable[[], Iterable[str]]) -> None:
+        """
+        Register (or replace) a callback producing exposition lines at
+        scrape time, for values owned by other components.
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        lines = []
+
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        for collect in collectors:
+            lines.extend(collect())
+
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+
+            if metric is None:
+                metric = self._metrics[name] = factory()
+
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "mental_health_stage_latency_seconds",
+    "Latency of each request processing stage.",
+    ["stage"]
+)
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "mental_health_request_latency_seconds",
+    "End-to-end request latency by endpoint.",
+    ["endpoint"]
+)
+
+REQUESTS = REGISTRY.counter(
+    "mental_health_requests_total",
+    "Requests handled, by endpoint and HTTP status.",
+    ["endpoint", "status"]
+)
+
+PREDICTIONS = REGISTRY.counter(
+    "mental_health_predictions_total",
+    "Texts scored by the stress model, by predicted level.",
+    ["level"]
+)
+
+
+def stage_timer(stage: str) -> _Timer:
+    """
+    with stage_timer("vectorization"): ...
+    """
+    return STAGE_LATENCY.time(stage)
+
+
+# =====================================================
+# Flask Integration
+# =====================================================
+
+def init_app(app) -> None:
+    """
+    Time every request and expose the registry at /metrics
+    (path configurable with METRICS_PATH).
+    """
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("_metrics_start", None)
+
+        if start is not None:
+            endpoint = request.endpoint or "unmatched"
+            REQUEST_LATENCY.observe(time.perf_counter() - start, (endpoint,))
+            REQUESTS.inc((endpoint, str(response.status_code)))
+
+        return response
+
+    def metrics_view():
+        return Response(
+            REGISTRY.render(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    app.add_url_rule(app.config.get("METRICS_PATH", "/metrics"), "metrics", metrics_view)
@@ -0,0 +1,184 @@
+import os
+import time
+import queue
+import logging
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = REGISTRY.histogram(
+    "mental_health_inference_batch_size",
+    "Number of requests scored together by the micro-batcher.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+_STOP = object()
+
+# Batchers of this process; forked children must not wait on the parent's threads
+_instances: "weakref.WeakSet" = weakref.WeakSet()
+
+
+# =====================================================
+# Micro-batching Scheduler
+# =====================================================
+
+class MicroBatcher:
+    """
+    Collects items submitted by concurrent callers and scores them with one
+    call to `score_batch`, which takes a list of items and returns one
+    result per item in the same order.
+
+    Batching is adaptive: an item that finds nothing else queued is
+    scored at once, so an uncontended caller never waits. Otherwise the
+    batch takes what is queued and is closed when it holds
+    `max_batch_size` items or `max_wait_seconds` after its first item was
+    taken, whichever comes first. Items that arrive while a batch is
+    being scored are queued for the next one.
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.002
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+
+        self._stopped = False
+
+        self._reset()
+        _instances.add(self)
+
+    def _reset(self) -> None:
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+    def submit(self, item: Any) -> Any:
+        """
+        Queue one item and block until its batch has been scored. Errors
+        raised by `score_batch` are re-raised in every caller of the batch.
+        """
+        return self.submit_async(item).result()
+
+    def submit_async(self, item: Any) -> Future:
+        future: Future = Future()
+
+        # Queued under the lock so stop() cannot slip its stop marker in
+        # between starting the worker and queueing the item
+        with self._lock:
+            if not self._stopped:
+                self._ensure_worker()
+                self._queue.put((item, future))
+                return future
+
+        # Callers still holding a stopped batcher are scored inline
+        self._score([(item, future)])
+
+        return future
+
+    def stop(self) -> None:
+        """
+        Score whatever is already queued, then stop the worker thread.
+        Items submitted afterwards are scored inline by their caller.
+        """
+        with self._lock:
+            self._stopped = True
+            worker, self._worker = self._worker, None
+
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join()
+
+    # ---------------------------------------------
+    # Worker
+    # ---------------------------------------------
+    def _ensure_worker(self) -> None:
+        # Called with self._lock held and only while not stopped
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="inference-micro-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+
+            if first is _STOP:
+                return
+
+            batch = [first]
+            stopping = self._collect(batch)
+
+            self._score(batch)
+
+            if stopping:
+                return
+
+    def _collect(self, batch: List) -> bool:
+        """
+        Add queued items to `batch` until it is full or the wait budget of
+        its first item is spent; a lone item is returned without waiting.
+        Returns True if a stop request was seen.
+        """
+        deadline = time.perf_counter() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+
+            try:
+                # Only wait for more items when other callers are queued
+                if remaining > 0 and len(batch) > 1:
+                    entry = self._queue.get(timeout=remaining)
+                else:
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if entry is _STOP:
+                return True
+
+            batch.append(entry)
+
+        return False
+
+    def _score(self, batch: List) -> None:
+        items = [item for item, _ in batch]
+
+        BATCH_SIZE.observe(len(items))
+
+        try:
+            results = self.score_batch(items)
+        except BaseException as error:
+            logger.exception("Micro-batch of %d items failed", len(items))
+
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+def _reset_after_fork() -> None:
+    # Only the forking thread survives in the child; start workers afresh
+    for batcher in list(_instances):
+        batcher._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,340 @@
+import os
+import glob
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================================
+# Model Registry (hot swap, pin, rollback)
+# =====================================================
+
+class ModelRegistry:
+    """
+    Tracks the versioned model artifacts in a directory and serves the
+    active one.
+
+    The active model is held as a single (version, model) tuple, so
+    readers always see a consistent pair and swapping is one atomic
+    assignment: requests already holding the old model finish with it,
+    new requests get the new one. Loading and validation happen before
+    the swap, off the request path when watching in the background.
+
+    Versions are artifact file names, e.g. "stress_model_20260218_173156.pkl".
+
+    A pinned version is written to PIN_FILE in the model directory, so it
+    survives restarts and every process serving that directory (e.g. the
+    serve_prefork.py workers) follows it on its next refresh.
+    """
+
+    PIN_FILE = "PINNED"
+
+    def __init__(
+        self,
+        model_dir: str,
+        pattern: str = "stress_model_*.pkl",
+        validation_texts: Optional[List[str]] = None,
+        keep_loaded: int = 2,
+        loader: Optional[Callable[[str], Any]] = None
+    ):
+        self.model_dir = model_dir
+        self.pattern = pattern
+        self.validation_texts = validation_texts or ["validation text"]
+        self.keep_loaded = max(1, keep_loaded)
+        self._loader = loader or _unpickle
+
+        self._active: Optional[Tuple[str, Any]] = None
+        self._pinned: Optional[str] = None
+        self._history: List[str] = []
+        self._loaded: "OrderedDict[str, Any]" = OrderedDict()
+
+        # version -> mtime of the artifact that failed to load or validate
+        self._failed: Dict[str, float] = {}
+
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    # ---------------------------------------------
+    # Serving
+    # ---------------------------------------------
+    def get(self) -> Tuple[str, Any]:
+        """
+        Return the active (version, model), loading the newest artifact
+        on first use.
+        """
+        active = self._active
+
+        if active is None:
+            with self._lock:
+                if self._active is None:
+                    self._activate(self._target_version())
+                active = self._active
+
+        return active
+
+    @property
+    def active_version(self) -> Optional[str]:
+        active = self._active
+        return active[0] if active else None
+
+    # ---------------------------------------------
+    # Discovery
+    # ---------------------------------------------
+    def available_versions(self) -> List[str]:
+        """
+        Artifact names, oldest first.
+        """
+        paths = glob.glob(os.path.join(self.model_dir, self.pattern))
+        paths.sort(key=os.path.getctime)
+
+        return [os.path.basename(path) for path in paths]
+
+    def _latest_version(self) -> str:
+        versions = self.available_versions()
+
+        if not versions:
+            raise FileNotFoundError(
+                f"No trained stress model found in {self.model_dir}"
+            )
+
+        return versions[-1]
+
+    def _target_version(self) -> str:
+        # The pinned version if PIN_FILE names one, else the newest
+        self._pinned = self._read_pin()
+
+        if self._pinned is not None:
+            if self._pinned in self.available_versions():
+                return self._pinned
+
+            logger.warning(
+                "Pinned model %s is missing; serving the newest artifact", self._pinned
+            )
+
+        return self._latest_version()
+
+    # ---------------------------------------------
+    # Pin File
+    # ---------------------------------------------
+    def _pin_path(self) -> str:
+        return os.path.join(self.model_dir, self.PIN_FILE)
+
+    def _read_pin(self) -> Optional[str]:
+        try:
+            with open(self._pin_path()) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_pin(self, version: Optional[str]) -> None:
+        path = self._pin_path()
+
+        if version is None:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return
+
+        # Write then rename so other processes never read a partial name
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "w") as f:
+            f.write(version + "\n")
+
+        os.replace(tmp_path, path)
+
+    # ---------------------------------------------
+    # Swapping
+    # ---------------------------------------------
+    def refresh(self) -> bool:
+        """
+        Swap in the pinned version (PIN_FILE), or the newest artifact when
+        nothing is pinned. Returns True when the active model changed.
+
+        An artifact that failed to load or validate is not retried until
+        the file changes (new mtime).
+        """
+        with self._lock:
+            target = self._target_version()
+
+            if target == self.active_version:
+                return False
+
+            if self._failed.get(target) == self._mtime(target):
+                logger.debug("Skipping model %s; it failed to load before", target)
+                return False
+
+            self._activate(target)
+            return True
+
+    def install(self, version: str, model: Any) -> None:
+        """
+        Validate and activate an already-loaded model object.
+        """
+        self._validate(version, model)
+
+        with self._lock:
+            self._remember(version, model)
+            self._swap(version, model)
+
+    def pin(self, version: str) -> None:
+        """
+        Activate a specific version and stop following new artifacts.
+        """
+        with self._lock:
+            self._activate(version)
+            self._write_pin(version)
+            self._pinned = version
+
+    def unpin(self) -> None:
+        with self._lock:
+            self._write_pin(None)
+            self._pinned = None
+            self.refresh()
+
+    def rollback(self) -> str:
+        """
+        Re-activate (and pin) the version that was active before the
+        current one. The versions rolled back from leave the history, so
+        repeated rollbacks keep going further back.
+        """
+        with self._lock:
+            previous = [v for v in self._history[:-1] if v != self.active_version]
+
+            if not previous:
+                raise LookupError("No earlier model version to roll back to")
+
+            target = previous[-1]
+            self.pin(target)
+
+            # pin() appended target; drop it and the versions after its
+            # earlier entry
+            self._history.pop()
+
+            while self._history[-1] != target:
+                self._history.pop()
+
+            return target
+
+    def status(self) -> Dict:
+        return {
+            "active_version": self.active_version,
+            "pinned_version": self._pinned,
+            "available_versions": self.available_versions(),
+            "history": list(self._history)
+        }
+
+    def _activate(self, version: str) -> None:
+        model = self._loaded.get(version)
+
+        if model is None:
+            # Only artifacts matching the pattern inside model_dir can load
+            if version not in self.available_versions():
+                raise FileNotFoundError(f"Unknown model version: {version}")
+
+            path = os.path.join(self.model_dir, version)
+            mtime = self._mtime(version)
+
+            logger.info("Loading model: %s", version)
+
+            try:
+                model = self._loader(path)
+                self._validate(version, model)
+            except Exception:
+                self._failed[version] = mtime
+                raise
+
+            self._failed.pop(version, None)
+
+        self._remember(version, model)
+        self._swap(version, model)
+
+    def _mtime(self, version: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(os.path.join(self.model_dir, version))
+        except OSError:
+            return None
+
+    def _validate(self, version: str, model: Any) -> None:
+        """
+        Run the validation texts through the model; this also warms it up
+        before it receives traffic.
+        """
+        try:
+            probabilities = model.predict_proba(self.validation_texts)
+            classes = model.classes_
+        except Exception as error:
+            raise ValueError(f"Model {version} failed validation: {error}") from error
+
+        expected_shape = (len(self.validation_texts), len(classes))
+
+        if probabilities.shape != expected_shape:
+            raise ValueError(
+                f"Model {version} returned probabilities of shape "
+                f"{probabilities.shape}, expected {expected_shape}"
+            )
+
+        if not all(abs(float(row.sum()) - 1.0) < 1e-3 for row in probabilities):
+            raise ValueError(f"Model {version} returned invalid probabilities")
+
+    def _remember(self, version: str, model: Any) -> None:
+        self._loaded[version] = model
+        self._loaded.move_to_end(version)
+
+        while len(self._loaded) > self.keep_loaded:
+            self._loaded.popitem(last=False)
+
+    def _swap(self, version: str, model: Any) -> None:
+        self._active = (version, model)
+
+        if not self._history or self._history[-1] != version:
+            self._history.append(version)
+
+        logger.info("Active model: %s", version)
+
+    # ---------------------------------------------
+    # Background Watching
+    # ---------------------------------------------
+    def start_watching(self, interval: float = 30.0) -> None:
+        """
+        Poll the model directory every `interval` seconds and hot swap new
+        artifacts. Failed loads are logged and the current model is kept.
+        """
+        if self._watcher is not None:
+            return
+
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch,
+            args=(interval,),
+            name="model-registry-watch",
+            daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except FileNotFoundError:
+                logger.debug("No model artifacts in %s yet", self.model_dir)
+            except Exception:
+                logger.exception("Model refresh failed; keeping the active model")
+
+
+def _unpickle(path: str):
+    with open(path, "rb") as f:
+        return pickle.load(f)
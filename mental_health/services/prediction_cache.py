@@ -0,0 +1,114 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+# =====================================================
+# Prediction Cache (LRU + optional TTL)
+# =====================================================
+
+class PredictionCache:
+    """
+    Bounded in-process cache for per-text predictions.
+
+    Entries are keyed on the model version and a hash of the cleaned
+    text. When the serving model version changes, every entry is dropped,
+    so a hot-swapped model never answers with its predecessor's results.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(model_version: str, cleaned_text: str) -> Hashable:
+        digest = hashlib.blake2b(
+            cleaned_text.encode("utf-8"), digest_size=16
+        ).digest()
+
+        return model_version, digest
+
+    def sync_model_version(self, model_version: str) -> None:
+        """
+        Drop every entry if the model version differs from the one the
+        cached entries were computed with.
+        """
+        if model_version == self._model_version:
+            return
+
+        with self._lock:
+            if model_version != self._model_version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._model_version = model_version
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        )
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "model_version": self._model_version
+            }
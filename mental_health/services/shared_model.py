@@ -0,0 +1,239 @@
+import os
+import json
+import mmap
+import shutil
+import pickle
+import zlib
+import logging
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Written last, so a directory without it is an interrupted export
+META_FILE = "meta.json"
+
+_EMPTY_SLOT = -1
+
+
+# =====================================================
+# Memory-mapped Vocabulary
+# =====================================================
+
+class SharedVocabulary(Mapping):
+    """
+    Read-only term -> feature index mapping backed by memory-mapped
+    arrays, used in place of a fitted vectorizer's `vocabulary_` dict.
+
+    A dict of Python strings is private to every process: each lookup
+    updates reference counts, so forked workers gradually copy the pages
+    holding it. Here the terms are one UTF-8 blob sorted by term, with an
+    open-addressing hash table (CRC32, linear probing) over it, all
+    mapped read-only from files, so every worker shares the same pages.
+
+    Lookups hash and compare bytes in Python, so vectorizing is roughly
+    twice as slow as with the dict; it only pays off for vocabularies
+    large enough that the copied pages matter.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        with open(os.path.join(directory, "vocab_terms.bin"), "rb") as f:
+            # mmap refuses empty files; an empty vocabulary never loads
+            self._terms = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._offsets = _load_array(directory, "vocab_offsets")
+        self._features = _load_array(directory, "vocab_features")
+        self._table = _load_array(directory, "vocab_table")
+
+        # memoryviews index to plain ints much faster than numpy scalars
+        self._offsets_view = memoryview(self._offsets)
+        self._features_view = memoryview(self._features)
+        self._table_view = memoryview(self._table)
+        self._mask = len(self._table) - 1
+
+    def __getitem__(self, term: str) -> int:
+        key = term.encode("utf-8")
+        terms, offsets, table = self._terms, self._offsets_view, self._table_view
+
+        slot = zlib.crc32(key) & self._mask
+
+        while True:
+            position = table[slot]
+
+            if position == _EMPTY_SLOT:
+                raise KeyError(term)
+
+            if terms[offsets[position]:offsets[position + 1]] == key:
+                return self._features_view[position]
+
+            slot = (slot + 1) & self._mask
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self._offsets_view
+
+        for position in range(len(self)):
+            yield self._terms[offsets[position]:offsets[position + 1]].decode("utf-8")
+
+    def __reduce__(self):
+        # Pickle as a reference to the files, not a copy of the terms
+        return (SharedVocabulary, (self.directory,))
+
+
+# =====================================================
+# Export & Load
+# =====================================================
+
+def export_shared_arrays(model, directory: str) -> None:
+    """
+    Write the vocabulary, IDF weights and linear coefficients of a fitted
+    Pipeline to `directory`. The export goes to a temporary directory
+    that is renamed into place, so concurrent workers exporting the same
+    version never see a partial one.
+    """
+    if os.path.exists(os.path.join(directory, META_FILE)):
+        return
+
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    vectorizer, classifier = model[0], model[-1]
+    meta = {"format_version": FORMAT_VERSION, "vocabulary": False, "idf": False}
+
+    vocabulary = getattr(vectorizer, "vocabulary_", None)
+
+    if vocabulary:
+        _write_vocabulary(vocabulary, tmp_dir)
+        meta["vocabulary"] = True
+
+    idf_diag = getattr(vectorizer, "_tfidf", vectorizer)
+    idf_diag = getattr(idf_diag, "_idf_diag", None)
+
+    if idf_diag is not None:
+        idf_diag = sp.csr_matrix(idf_diag)
+        np.save(os.path.join(tmp_dir, "idf_data.npy"), idf_diag.data)
+        np.save(os.path.join(tmp_dir, "idf_indices.npy"), idf_diag.indices)
+        np.save(os.path.join(tmp_dir, "idf_indptr.npy"), idf_diag.indptr)
+        meta["idf"] = True
+
+    np.save(os.path.join(tmp_dir, "coef.npy"), np.ascontiguousarray(classifier.coef_))
+    np.save(os.path.join(tmp_dir, "intercept.npy"), np.asarray(classifier.intercept_))
+
+    with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        # Another process finished the same export first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def attach_shared_arrays(model, directory: str):
+    """
+    Replace the large fitted attributes of `model` in place with
+    read-only memory maps of an export, and return the model.
+    """
+    with open(os.path.join(directory, META_FILE)) as f:
+        meta = json.load(f)
+
+    vectorizer, classifier = model[0], model[-1]
+
+    if meta["vocabulary"]:
+        vectorizer.vocabulary_ = SharedVocabulary(directory)
+
+        # Only kept for introspection, and potentially larger than the vocabulary
+        if hasattr(vectorizer, "stop_words_"):
+            vectorizer.stop_words_ = None
+
+    if meta["idf"]:
+        tfidf = getattr(vectorizer, "_tfidf", vectorizer)
+        n_features = len(tfidf._idf_diag.indptr) - 1
+
+        tfidf._idf_diag = sp.csr_matrix(
+            (
+                _load_array(directory, "idf_data"),
+                _load_array(directory, "idf_indices"),
+                _load_array(directory, "idf_indptr")
+            ),
+            shape=(n_features, n_features),
+            copy=False
+        )
+
+    classifier.coef_ = _load_array(directory, "coef")
+    classifier.intercept_ = _load_array(directory, "intercept")
+
+    return model
+
+
+def shared_loader(shared_dir: str) -> Callable[[str], Any]:
+    """
+    ModelRegistry loader that unpickles an artifact, exports its arrays
+    once under `shared_dir/<version>` and serves them memory-mapped.
+    Every process loading the same version maps the same files.
+    """
+    def load(path: str):
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+
+        directory = os.path.join(shared_dir, os.path.basename(path))
+
+        try:
+            export_shared_arrays(model, directory)
+            return attach_shared_arrays(model, directory)
+        except (AttributeError, TypeError, IndexError) as error:
+            # Not a vectorizer + linear model pipeline; serve it as is
+            logger.warning("Serving %s unshared: %s", path, error)
+            return model
+
+    return load
+
+
+# =====================================================
+# Helpers
+# =====================================================
+
+def _write_vocabulary(vocabulary, directory: str) -> None:
+    encoded = sorted((term.encode("utf-8"), index) for term, index in vocabulary.items())
+
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term, _ in encoded], out=offsets[1:])
+
+    features = np.array([index for _, index in encoded], dtype=np.int64)
+
+    # Power-of-two table at most half full keeps probe chains short
+    size = 1 << max(1, (2 * len(encoded) - 1).bit_length())
+    table = np.full(size, _EMPTY_SLOT, dtype=np.int64)
+    mask = size - 1
+
+    for position, (term, _) in enumerate(encoded):
+        slot = zlib.crc32(term) & mask
+
+        while table[slot] != _EMPTY_SLOT:
+            slot = (slot + 1) & mask
+
+        table[slot] = position
+
+    with open(os.path.join(directory, "vocab_terms.bin"), "wb") as f:
+        f.write(b"".join(term for term, _ in encoded))
+
+    np.save(os.path.join(directory, "vocab_offsets.npy"), offsets)
+    np.save(os.path.join(directory, "vocab_features.npy"), features)
+    np.save(os.path.join(directory, "vocab_table.npy"), table)
+
+
+def _load_array(directory: str, name: str) -> np.ndarray:
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
@@ -1,8 +1,20 @@
 import os
-import pickle
-import glob
+import time
 import logging
-from typing import Tuple
+import threading
+from typing import Any, Dict, List, Tuple
+
+from ..nlp_pipeline import clean_text, clean_texts
+from . import metrics
+from .log_pipeline import SAMPLED
+from .metrics import stage_timer
+from .micro_batcher import MicroBatcher
+from .model_registry import ModelRegistry
+from .prediction_cache import PredictionCache
+
+# NumPy, SciPy and scikit-learn are imported on first use (model load,
+# first prediction), not when the app is imported, so a new process can
+# start serving before they are loaded; see MODEL_PRELOAD.
 
 logger = logging.getLogger(__name__)
 
@@ -16,73 +28,428 @@ BASE_DIR = os.path.dirname(
 MODEL_DIR = os.path.join(BASE_DIR, "models", "mental_health")
 
 # -------------------------------------------------
-# Global Model Cache (Lazy Load)
+# Model Registry (preloaded by init_app, lazy fallback)
 # -------------------------------------------------
-_model = None
 
+# Representative inputs used to validate and warm up models
+WARMUP_TEXTS = [
+    "I feel calm and rested after a relaxing weekend with friends.",
+    "Work deadlines keep piling up and I am constantly worried.",
+    "I feel hopeless and overwhelmed, I can't go on like this.",
+    "Exams are next week and I have not been sleeping well.",
+]
 
-# -------------------------------------------------
-# Text Preprocessing
-# -------------------------------------------------
-def clean_text(text: str) -> str:
-    import re
+# MODEL_PRELOAD when the app config does not set it
+DEFAULT_PRELOAD_MODE = "background"
+
+_registry = ModelRegistry(MODEL_DIR, validation_texts=WARMUP_TEXTS)
+
+# Per-text probability rows keyed on (model version, cleaned text hash)
+_cache = PredictionCache()
+
+
+# Coalesces concurrent single-text predictions (configured by init_app)
+_batcher: MicroBatcher = None
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def configure_cache(max_size: int = 10000, ttl_seconds: float = None) -> None:
+    """
+    Replace the prediction cache; max_size=0 disables caching.
+    """
+    global _cache
+
+    _cache = PredictionCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+
+def get_cache_stats() -> Dict:
+    return _cache.stats()
 
-    text = text.lower()
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
 
-    return text
+def _collect_cache_metrics() -> List[str]:
+    stats = _cache.stats()
+    lines = []
+
+    for name in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        metric = f"mental_health_prediction_cache_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {stats[name]}"]
+
+    lines += [
+        "# TYPE mental_health_prediction_cache_entries gauge",
+        f"mental_health_prediction_cache_entries {stats['size']}",
+    ]
+
+    return lines
+
+
+def configure_batcher(max_batch_size: int = 32, max_wait_ms: float = 2.0) -> None:
+    """
+    Route predict_stress through a micro-batcher that scores concurrent
+    requests together; max_batch_size <= 1 scores every request alone.
+    """
+    global _batcher
+
+    previous = _batcher
+
+    if max_batch_size and max_batch_size > 1:
+        _batcher = MicroBatcher(
+            _score_batch_rows,
+            max_batch_size=max_batch_size,
+            max_wait_seconds=max_wait_ms / 1000.0
+        )
+    else:
+        _batcher = None
+
+    if previous is not None:
+        previous.stop()
 
 
 # -------------------------------------------------
 # Load Latest Model (Only Once)
 # -------------------------------------------------
 def load_latest_model():
-    global _model
+    return _registry.get()[1]
+
+
+def get_model_version() -> str:
+    return _registry.get()[0]
+
+
+# -------------------------------------------------
+# Startup Preload & Warm-up
+# -------------------------------------------------
+def warm_up(batch_size: int = 32, texts: List[str] = None) -> float:
+    """
+    Run a single-text call and one batch through the full pipeline so the
+    first real request does not pay for lazy initialisation. Returns the
+    elapsed seconds.
+    """
+    texts = texts or WARMUP_TEXTS
+    batch = [texts[i % len(texts)] for i in range(max(1, batch_size))]
 
-    if _model is not None:
-        return _model
+    start = time.perf_counter()
 
-    model_files = glob.glob(os.path.join(MODEL_DIR, "stress_model_*.pkl"))
+    score_texts(batch[:1])
+    score_texts(batch)
 
-    if not model_files:
-        raise FileNotFoundError(
-            f"No trained stress model found in {MODEL_DIR}"
+    return time.perf_counter() - start
+
+
+def init_app(app) -> None:
+    """
+    Point the model registry at MODEL_DIR, then load the model and warm
+    it up according to MODEL_PRELOAD: "sync" does it before create_app
+    returns, "background" in a thread while the app starts serving
+    (early requests wait for that load instead of starting their own),
+    "off" leaves it to the first request (unset: DEFAULT_PRELOAD_MODE). Without a trained model the
+    app still starts and the model is loaded lazily on first use. New
+    artifacts are picked up in the background every MODEL_WATCH_INTERVAL
+    seconds (0 disables watching).
+
+    With MODEL_SHARED_MEMORY the vocabulary and weight arrays are served
+    memory-mapped from MODEL_SHARED_DIR instead of from the unpickled
+    objects. MODEL_FORMAT = "runtime" serves the compact .runtime
+    artifacts with the NumPy scorer instead, without scikit-learn.
+    """
+    global _registry
+
+    configure_cache(
+        max_size=app.config.get("PREDICTION_CACHE_SIZE", 10000),
+        ttl_seconds=app.config.get("PREDICTION_CACHE_TTL")
+    )
+
+    model_dir = app.config.get("MODEL_DIR", MODEL_DIR)
+    pattern = "stress_model_*.pkl"
+    loader = None
+
+    if app.config.get("MODEL_FORMAT", "pickle") == "runtime":
+        from ..runtime_model import RuntimeModel
+
+        # Already memory-mapped, so shared between processes as is
+        pattern = "stress_model_*.runtime"
+        loader = RuntimeModel.load
+    elif app.config.get("MODEL_SHARED_MEMORY"):
+        from .shared_model import shared_loader
+
+        loader = shared_loader(
+            app.config.get("MODEL_SHARED_DIR") or os.path.join(model_dir, ".shared")
         )
 
-    latest_model = max(model_files, key=os.path.getctime)
+    _registry = ModelRegistry(
+        model_dir,
+        pattern=pattern,
+        validation_texts=app.config.get("MODEL_WARMUP_TEXTS") or WARMUP_TEXTS,
+        loader=loader
+    )
+
+    configure_batcher(
+        max_batch_size=app.config.get("INFERENCE_BATCH_MAX_SIZE", 32),
+        max_wait_ms=app.config.get("INFERENCE_BATCH_MAX_WAIT_MS", 2.0)
+    )
+
+    metrics.REGISTRY.set_collector("prediction_cache", _collect_cache_metrics)
+
+    watch_interval = app.config.get("MODEL_WATCH_INTERVAL", 30)
+
+    if watch_interval:
+        _registry.start_watching(watch_interval)
+
+    preload = app.config.get("MODEL_PRELOAD")
+
+    if preload is None:
+        preload = DEFAULT_PRELOAD_MODE
+
+    preload = _preload_mode(preload)
 
-    logger.info(f"Loading model: {os.path.basename(latest_model)}")
+    if preload == "sync":
+        preload_model(app)
+    elif preload == "background":
+        threading.Thread(
+            target=preload_model, args=(app,), name="model-preload", daemon=True
+        ).start()
 
-    with open(latest_model, "rb") as f:
-        _model = pickle.load(f)
 
-    return _model
+def _preload_mode(value) -> str:
+    # Booleans and "1"/"0" from older configurations
+    if value in (True, "1", "true", "sync"):
+        return "sync"
+
+    if value in (False, "0", "false", "off"):
+        return "off"
+
+    if value != "background":
+        raise ValueError(f"Unknown MODEL_PRELOAD mode: {value!r}")
+
+    return value
+
+
+def preload_model(app) -> None:
+    """
+    Load the active model and warm it up, recording how long both steps
+    took in app.extensions["stress_model_startup"].
+    """
+    start = time.perf_counter()
+
+    try:
+        load_latest_model()
+    except FileNotFoundError as error:
+        app.logger.warning("Model preload skipped: %s", error)
+        return
+    except Exception:
+        # Requests retry the load; keep the reason in the log
+        app.logger.exception("Model preload failed")
+        return
+
+    load_seconds = time.perf_counter() - start
+
+    warmup_seconds = warm_up(
+        batch_size=app.config.get("MODEL_WARMUP_BATCH_SIZE", 32),
+        texts=app.config.get("MODEL_WARMUP_TEXTS")
+    )
+
+    app.extensions["stress_model_startup"] = {
+        "load_seconds": load_seconds,
+        "warmup_seconds": warmup_seconds
+    }
+
+    app.logger.info(
+        "Model preloaded in %.1f ms, warm-up took %.1f ms",
+        load_seconds * 1000, warmup_seconds * 1000
+    )
+
+
+# -------------------------------------------------
+# Label Mapping
+# -------------------------------------------------
+LABEL_MAP = {
+    0: "Low",
+    1: "Moderate",
+    2: "High"
+}
+
+
+# -------------------------------------------------
+# Fused Inference
+# -------------------------------------------------
+def _is_runtime_model(model) -> bool:
+    from ..runtime_model import RuntimeModel
+
+    return isinstance(model, RuntimeModel)
+
+
+def _vectorize(model, texts: List[str]):
+    if _is_runtime_model(model):
+        return model.vectorize(texts)
+
+    # Every step except the final estimator (the TF-IDF vectorizer)
+    return model[:-1].transform(texts)
+
+
+def _classify(model, features):
+    if _is_runtime_model(model):
+        return model.classify(features)
+
+    return model[-1].predict_proba(features)
+
+
+def _class_levels(model) -> List[str]:
+    return [LABEL_MAP.get(label, "Unknown") for label in model.classes_]
+
+
+def _run_model(model, processed_texts: List[str]):
+    with stage_timer("vectorization"):
+        features = _vectorize(model, processed_texts)
+
+    with stage_timer("classification"):
+        return _classify(model, features)
+
+
+def score_texts(texts: List[str]) -> Tuple[List[str], Any]:
+    """
+    Clean and vectorize the texts once, then run the classifier once on
+    the resulting sparse matrix. Returns the level of each probability
+    column and the (n_texts, n_classes) probability matrix.
+
+    Texts whose cleaned form was scored recently by the same model
+    version are served from the prediction cache; only the misses are
+    vectorized and classified, still in a single batch.
+    """
+    with stage_timer("text_cleaning"):
+        processed_texts = clean_texts(texts)
+
+    return _score_processed(processed_texts)
+
+
+def _score_processed(processed_texts: List[str], lookup: bool = True) -> Tuple[List[str], Any]:
+    # score_texts on cleaned texts; lookup=False skips the cache reads
+    # (the caller already missed) but still caches the new rows
+    import numpy as np
+
+    version, model = _registry.get()
+    levels = _class_levels(model)
+
+    if not _cache.enabled:
+        return levels, _run_model(model, processed_texts)
+
+    _cache.sync_model_version(version)
+
+    keys = [_cache.make_key(version, text) for text in processed_texts]
+    probabilities = np.empty((len(processed_texts), len(levels)))
+
+    missing = []
+
+    for index, key in enumerate(keys):
+        row = _cache.get(key) if lookup else None
+
+        if row is None:
+            missing.append(index)
+        else:
+            probabilities[index] = row
+
+    if missing:
+        scored = _run_model(model, [processed_texts[i] for i in missing])
+
+        probabilities[missing] = scored
+
+        for index, row in zip(missing, scored):
+            _cache.put(keys[index], tuple(row))
+
+    return levels, probabilities
+
+
+def _score_batch_rows(processed_texts: List[str]) -> List[Tuple[List[str], Any]]:
+    # Micro-batcher callback: one (levels, probability row) per cleaned
+    # text; predict_stress has already looked each one up in the cache
+    levels, probabilities = _score_processed(processed_texts, lookup=False)
+
+    return [(levels, row) for row in probabilities]
+
+
+def _cached_row(processed_text: str) -> Tuple[List[str], Any]:
+    # (levels, cached probability row or None)
+    import numpy as np
+
+    version, model = _registry.get()
+    levels = _class_levels(model)
+
+    if not _cache.enabled:
+        return levels, None
+
+    _cache.sync_model_version(version)
+
+    row = _cache.get(_cache.make_key(version, processed_text))
+
+    return levels, None if row is None else np.asarray(row)
 
 
 # -------------------------------------------------
 # Stress Prediction
 # -------------------------------------------------
 def predict_stress(text: str) -> Tuple[str, float]:
-    model = load_latest_model()
+    with stage_timer("text_cleaning"):
+        processed_text = clean_text(text)
 
-    # Clean input text
-    processed_text = clean_text(text)
+    # Cache hits are answered here, without waiting for a batch
+    levels, row = _cached_row(processed_text)
 
-    prediction = model.predict([processed_text])[0]
-    probabilities = model.predict_proba([processed_text])[0]
+    if row is None:
+        batcher = _batcher
 
-    confidence = round(max(probabilities) * 100, 2)
+        if batcher is not None:
+            levels, row = batcher.submit(processed_text)
+        else:
+            levels, probabilities = _score_processed([processed_text], lookup=False)
+            row = probabilities[0]
 
-    label_map = {
-        0: "Low",
-        1: "Moderate",
-        2: "High"
-    }
+    best_index = row.argmax()
+
+    level = levels[best_index]
+    confidence = round(float(row[best_index]) * 100, 2)
 
-    level = label_map.get(prediction, "Unknown")
+    metrics.PREDICTIONS.inc((level,))
 
-    logger.info(f"Prediction: {level} ({confidence}%)")
+    logger.info(
+        "Prediction: %s (%s%%)", level, confidence,
+        extra=dict(SAMPLED, stress_level=level, confidence=confidence)
+    )
 
     return level, confidence
+
+
+# -------------------------------------------------
+# Batched Stress Prediction
+# -------------------------------------------------
+def predict_stress_batch(texts: List[str]) -> List[Dict]:
+    """
+    Score many texts with a single vectorizer transform and a single
+    classifier call. Each result carries the level, the confidence and
+    the probability of every stress level.
+    """
+    if not texts:
+        return []
+
+    levels, probabilities = score_texts(texts)
+    best = probabilities.argmax(axis=1)
+
+    results = []
+
+    for row, best_index in zip(probabilities, best):
+        class_probabilities = dict.fromkeys(LABEL_MAP.values(), 0.0)
+        class_probabilities.update(
+            (level, round(float(p), 4)) for level, p in zip(levels, row)
+        )
+
+        metrics.PREDICTIONS.inc((levels[best_index],))
+
+        results.append({
+            "level": levels[best_index],
+            "confidence": round(float(row[best_index]) * 100, 2),
+            "probabilities": class_probabilities
+        })
+
+    logger.info("Batch prediction: %d texts", len(results), extra={"batch_size": len(results)})
+
+    return results
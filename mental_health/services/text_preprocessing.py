@@ -1,9 +1,5 @@
-import re
+# Normalization lives in mental_health/nlp_pipeline.py so that training
+# and serving share one implementation.
+from ..nlp_pipeline import clean_text, clean_texts
 
-
-def clean_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+__all__ = ["clean_text", "clean_texts"]
@@ -0,0 +1,168 @@
+"""
+Pre-fork server: build the app and load the stress model once in a parent
+process, then fork worker processes that share it read-only. gc.freeze()
+keeps the garbage collector from touching the inherited objects.
+
+--share (or MODEL_SHARED_MEMORY=1) serves the model arrays memory-mapped,
+so workers map the same pages instead of each gradually copying the
+unpickled vocabulary and weights as reference counts change. It is off
+by default: the mapped vocabulary roughly doubles vectorization time,
+and at the production vocabulary size it saves only about 0.3 MB per
+worker (benchmarks/bench_prefork_memory.py). Enable it for large
+vocabularies with many workers.
+
+    python serve_prefork.py --workers 4 --port 8000
+"""
+import os
+import gc
+import sys
+import signal
+import argparse
+
+from werkzeug.serving import make_server
+
+from config import Config
+from app import create_app
+from mental_health.services import log_pipeline, stress_engine
+from mental_health.services.conversation_store import create_conversation_store
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+def run_worker(app, server, slot, watch_interval, batching) -> int:
+    signal.signal(signal.SIGTERM, _raise_system_exit)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # One log file per worker slot; a restarted worker appends to its slot's
+    log_pipeline.use_log_file(app, f"app.worker{slot}.log")
+
+    # SQLite connections and background threads must not cross a fork
+    store = create_conversation_store(app.config)
+    app.extensions["conversation_store"] = store
+
+    if watch_interval:
+        stress_engine.get_registry().start_watching(watch_interval)
+
+    if not batching:
+        # One request at a time per worker: nothing to batch with
+        stress_engine.configure_batcher(max_batch_size=1)
+
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        store.close()
+        log_pipeline.shutdown()
+
+    return 0
+
+
+def _raise_system_exit(signum, frame):
+    raise SystemExit(0)
+
+
+def spawn_worker(app, server, slot, watch_interval, batching) -> int:
+    pid = os.fork()
+
+    if pid == 0:
+        code = 1
+
+        try:
+            code = run_worker(app, server, slot, watch_interval, batching)
+        finally:
+            # Skip the parent's atexit handlers and buffered output
+            os._exit(code)
+
+    return pid
+
+
+# -----------------------------
+# Main
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="Serve each worker's requests on threads (enables micro-batching)"
+    )
+    parser.add_argument(
+        "--share",
+        action="store_true",
+        help="Serve the model arrays memory-mapped (MODEL_SHARED_MEMORY)"
+    )
+    args = parser.parse_args()
+
+    if args.share:
+        Config.MODEL_SHARED_MEMORY = True
+
+    # The model must be loaded before forking; threads do not survive it
+    Config.MODEL_PRELOAD = "sync"
+
+    # Consecutive requests of one conversation can land on different
+    # workers: each save must reach the database before the response
+    Config.CONVERSATION_WRITE_BATCH_SIZE = 1
+    Config.CONVERSATION_FLUSH_INTERVAL = 0
+
+    app = create_app()
+
+    # Workers watch MODEL_DIR themselves; the parent only supervises
+    watch_interval = app.config.get("MODEL_WATCH_INTERVAL", 30)
+    stress_engine.get_registry().stop_watching()
+    app.extensions["conversation_store"].close()
+
+    server = make_server(args.host, args.port, app, threaded=args.threaded)
+
+    # Workers race for each connection; losers must not block in accept()
+    server.socket.setblocking(False)
+
+    # Move everything loaded so far out of the collector's reach, so
+    # collections in the workers do not write to the inherited pages
+    gc.collect()
+    gc.freeze()
+
+    workers = {}  # pid -> slot
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for slot in range(max(1, args.workers)):
+        workers[spawn_worker(app, server, slot, watch_interval, args.threaded)] = slot
+
+    print(
+        f"Serving on http://{args.host}:{args.port} with {len(workers)} workers "
+        f"({'shared' if Config.MODEL_SHARED_MEMORY else 'private'} model memory)",
+        flush=True
+    )
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+
+        slot = workers.pop(pid, None)
+
+        if not stopping and slot is not None:
+            print(f"Worker {pid} exited with status {status}; restarting", flush=True)
+            workers[spawn_worker(app, server, slot, watch_interval, args.threaded)] = slot
+
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
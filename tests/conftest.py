@@ -0,0 +1,49 @@
+import os
+import sys
+import random
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# The training scripts import each other as top-level modules
+TRAIN_DIR = os.path.join(PROJECT_ROOT, "train")
+
+if TRAIN_DIR not in sys.path:
+    sys.path.append(TRAIN_DIR)
+
+
+@pytest.fixture(scope="session")
+def stress_pipeline():
+    """
+    A small TF-IDF + logistic regression pipeline shaped like the trained
+    stress model (labels 0, 1, 2).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    rng = random.Random(42)
+    words = [
+        ["calm", "relaxed", "happy", "weekend", "friends", "rested"],
+        ["deadline", "exam", "pressure", "busy", "tired", "worried"],
+        ["hopeless", "panic", "overwhelmed", "crying", "worthless", "exhausted"],
+    ]
+    filler = ["i", "feel", "today", "really", "my", "work", "life", "sleep"]
+
+    texts, labels = [], []
+
+    for _ in range(300):
+        label = rng.randrange(3)
+        texts.append(" ".join(rng.choices(words[label], k=3) + rng.choices(filler, k=5)))
+        labels.append(label)
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2))),
+        ("clf", LogisticRegression(max_iter=1000))
+    ])
+
+    return pipeline.fit(texts, labels)
@@ -0,0 +1,65 @@
+import pytest
+from flask import Flask
+
+from mental_health import routes
+from mental_health.services import stress_engine
+
+
+@pytest.fixture
+def client(stress_pipeline):
+    stress_engine.get_registry().install("test", stress_pipeline)
+
+    app = Flask(__name__)
+    app.config["API_MAX_BATCH_SIZE"] = 3
+    app.register_blueprint(routes.mental_health, url_prefix="/mental_health")
+
+    return app.test_client()
+
+
+def post(client, **kwargs):
+    return client.post("/mental_health/api/analyze", **kwargs)
+
+
+def test_scores_every_text_in_order(client):
+    texts = ["calm weekend with friends", "hopeless panic crying", "exam deadline pressure"]
+
+    response = post(client, json={"texts": texts})
+    results = response.get_json()["results"]
+
+    assert response.status_code == 200
+    assert [result["level"] for result in results] == [
+        stress_engine.predict_stress(text)[0] for text in texts
+    ]
+    assert set(results[0]["probabilities"]) == {"Low", "Moderate", "High"}
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"data": "not json", "content_type": "application/json"}, "JSON object"),
+    ({"data": "texts=hello"}, "JSON object"),
+    ({"json": ["calm", "stressed"]}, "JSON object"),
+    ({"json": "calm"}, "JSON object"),
+    ({"json": None}, "JSON object"),
+    ({"json": {}}, "non-empty list"),
+    ({"json": {"texts": []}}, "non-empty list"),
+    ({"json": {"texts": "calm weekend"}}, "non-empty list"),
+    ({"json": {"texts": ["calm", 3]}}, "must be a string"),
+    ({"json": {"texts": ["calm", None]}}, "must be a string"),
+])
+def test_malformed_requests_are_rejected(client, kwargs, error):
+    response = post(client, **kwargs)
+
+    assert response.status_code == 400
+    assert error in response.get_json()["error"]
+
+
+def test_oversized_batches_are_rejected_before_scoring(client, monkeypatch):
+    def fail(texts):
+        raise AssertionError("oversized batch was scored")
+
+    assert post(client, json={"texts": ["calm"] * 3}).status_code == 200
+
+    monkeypatch.setattr(routes, "predict_stress_batch", fail)
+    response = post(client, json={"texts": ["calm"] * 4})
+
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "at most 3 texts per request"}
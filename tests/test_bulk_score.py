@@ -0,0 +1,139 @@
+import argparse
+import csv
+import json
+import pickle
+
+import pytest
+
+import bulk_score
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def model_path(tmp_path, stress_pipeline):
+    path = tmp_path / "models" / "stress_model_20260101_000000.pkl"
+    path.parent.mkdir()
+    path.write_bytes(pickle.dumps(stress_pipeline))
+    return str(path)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "archive.csv"
+    words = ["calm weekend", "exam pressure", "hopeless panic", "", "Deadline!! http://x.y"]
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "text"])
+        writer.writerows([f"entry-{n}", f"{words[n % len(words)]} {n}"] for n in range(23))
+
+    return str(path)
+
+
+def make_args(input_path, output_path, model_path, **overrides):
+    args = dict(
+        input=input_path, output=output_path, text_column="text", id_column="id",
+        input_format=None, output_format=None, chunk_size=5, workers=1,
+        model=model_path, model_dir=None, model_format="pickle",
+        restart=False, progress=0
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def read_csv_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_scores_every_row_in_input_order(tmp_path, archive, model_path, stress_pipeline):
+    output = str(tmp_path / "scores.csv")
+
+    checkpoint = bulk_score.run(make_args(archive, output, model_path))
+    rows = read_csv_rows(output)
+
+    assert checkpoint["complete"] and checkpoint["rows_done"] == 23
+    assert [row["id"] for row in rows] == [f"entry-{n}" for n in range(23)]
+    assert {row["model_version"] for row in rows} == {"stress_model_20260101_000000.pkl"}
+
+    texts = [row["text"] for row in read_csv_rows(archive)]
+    expected = stress_pipeline.predict_proba(bulk_score.clean_texts(texts)).max(axis=1)
+
+    for row, confidence in zip(rows, expected):
+        assert float(row["confidence"]) == pytest.approx(confidence * 100, abs=0.01)
+
+
+def test_resume_after_interruption_matches_an_uninterrupted_run(
+    tmp_path, archive, model_path, monkeypatch
+):
+    reference = str(tmp_path / "reference.csv")
+    bulk_score.run(make_args(archive, reference, model_path))
+
+    output = str(tmp_path / "scores.csv")
+    write_checkpoint = bulk_score.write_checkpoint
+
+    def interrupt_after_two_chunks(path, checkpoint):
+        write_checkpoint(path, checkpoint)
+
+        if checkpoint["chunks_done"] == 2:
+            raise Interrupted()
+
+    monkeypatch.setattr(bulk_score, "write_checkpoint", interrupt_after_two_chunks)
+
+    with pytest.raises(Interrupted):
+        bulk_score.run(make_args(archive, output, model_path))
+
+    monkeypatch.setattr(bulk_score, "write_checkpoint", write_checkpoint)
+
+    # A row written after the last checkpoint must be dropped on resume
+    with open(output, "a") as f:
+        f.write("entry-10,High,99.0")
+
+    checkpoint = bulk_score.run(make_args(archive, output, model_path, chunk_size=100))
+
+    assert checkpoint["chunk_size"] == 5
+    assert checkpoint["rows_done"] == 23
+
+    with open(output) as resumed, open(reference) as uninterrupted:
+        assert resumed.read() == uninterrupted.read()
+
+
+def test_changed_input_is_not_resumed(tmp_path, archive, model_path):
+    output = str(tmp_path / "scores.csv")
+    bulk_score.run(make_args(archive, output, model_path))
+
+    with open(archive, "a") as f:
+        f.write("entry-99,one more row\n")
+
+    with pytest.raises(SystemExit, match="input does not match"):
+        bulk_score.run(make_args(archive, output, model_path))
+
+    checkpoint = bulk_score.run(make_args(archive, output, model_path, restart=True))
+    assert checkpoint["rows_done"] == 24
+
+
+def test_existing_output_without_checkpoint_is_not_overwritten(tmp_path, archive, model_path):
+    output = tmp_path / "scores.csv"
+    output.write_text("keep me\n")
+
+    with pytest.raises(SystemExit, match="--restart"):
+        bulk_score.run(make_args(archive, str(output), model_path))
+
+    assert output.read_text() == "keep me\n"
+
+
+def test_jsonl_without_id_column_uses_row_positions(tmp_path, model_path):
+    archive = tmp_path / "archive.jsonl"
+    archive.write_text("".join(json.dumps({"text": f"exam stress {n}"}) + "\n" for n in range(7)))
+    output = str(tmp_path / "scores.jsonl")
+
+    bulk_score.run(make_args(str(archive), output, model_path, id_column=None, chunk_size=3))
+
+    with open(output) as f:
+        rows = [json.loads(line) for line in f]
+
+    assert [row["row"] for row in rows] == list(range(7))
+    assert set(rows[0]) == set(bulk_score.output_columns("row"))
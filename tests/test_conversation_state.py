@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from mental_health.services import chatbot_engine
+from mental_health.services.chatbot_engine import ConversationState, generate_response
+
+
+def test_trajectory_is_an_exponentially_weighted_average():
+    state = ConversationState()
+    alpha = chatbot_engine.STRESS_EWMA_ALPHA
+
+    state.record_stress("Low")
+    assert state.stress_trajectory == 0.0
+
+    state.record_stress("High")
+    assert state.stress_trajectory == pytest.approx(alpha)
+
+    state.record_stress("Moderate")
+    assert state.stress_trajectory == pytest.approx(alpha + alpha * (0.5 - alpha))
+    assert state.scored_turns == 3
+
+
+@pytest.mark.parametrize("levels, expected", [
+    ([], None),
+    (["Low"], "Low"),
+    (["Moderate"], "Moderate"),
+    (["Low", "High"], "Moderate"),
+    (["High", "High", "Low"], "Moderate"),
+    (["High", "Low", "Low", "Low"], "Low"),
+])
+def test_trajectory_level_is_the_nearest_stress_level(levels, expected):
+    state = ConversationState()
+
+    for level in levels:
+        state.record_stress(level)
+
+    assert state.trajectory_level() == expected
+
+
+def test_unscored_turns_do_not_move_the_trajectory():
+    state = ConversationState()
+
+    state.record_user_message("Low", None)
+    state.record_user_message("Low", "Unknown")
+
+    assert state.user_turns == 2
+    assert state.scored_turns == 0
+    assert state.stress_trajectory is None
+
+
+def test_sustained_high_stress_needs_enough_scored_turns():
+    state = ConversationState()
+
+    state.record_stress("High")
+    assert not state.sustained_high_stress()
+
+    state.record_stress("High")
+    assert state.sustained_high_stress()
+
+    state.record_stress("Low")
+    state.record_stress("Low")
+    assert not state.sustained_high_stress()
+
+
+def test_recent_intensities_keep_the_last_window():
+    state = ConversationState()
+
+    for intensity in ["High"] * 3 + ["Low"] * chatbot_engine.RECENT_MESSAGE_WINDOW:
+        state.record_user_message(intensity)
+
+    assert state.negative_count() == 0
+    assert len(state.recent_intensities) == chatbot_engine.RECENT_MESSAGE_WINDOW
+
+
+def test_state_round_trips_through_json():
+    state = ConversationState()
+    state.record_user_message("Moderate", "High")
+    state.record_user_message("High", "Moderate")
+    state.last_reply = "How are you sleeping?"
+
+    restored = ConversationState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+    assert restored.to_dict() == state.to_dict()
+    assert ConversationState.from_dict(None).to_dict() == ConversationState().to_dict()
+
+
+def test_history_rebuild_matches_incremental_state():
+    turns = [
+        ("I feel a bit anxious about work", "Moderate"),
+        ("I have not been sleeping", "High"),
+        ("Exams are close and I am overwhelmed", "High"),
+        ("Thanks, that helps", "Low"),
+    ]
+    state = ConversationState()
+    history = []
+
+    for message, level in turns:
+        history.append({"role": "user", "message": message, "stress_level": level})
+        reply = generate_response(message, level, history, state=state)
+        history.append({"role": "assistant", "message": reply})
+
+    assert ConversationState.from_history(history).to_dict() == state.to_dict()
+
+
+def test_history_without_stress_levels_is_not_rescored():
+    history = [
+        {"role": "user", "message": "I feel hopeless"},
+        {"role": "assistant", "message": "I hear you."},
+    ]
+
+    state = ConversationState.from_history(history)
+
+    assert state.user_turns == 1
+    assert state.stress_trajectory is None
+    assert state.last_reply == "I hear you."
+
+
+def test_sustained_model_stress_escalates_a_calm_message():
+    state = ConversationState()
+    message = "Nothing much to say"
+
+    first = generate_response(message, "High", [], state=state)
+    second = generate_response(message, "High", [], state=state)
+
+    assert not first.startswith("I’m really concerned")
+    assert second.startswith("I’m really concerned")
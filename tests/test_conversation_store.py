@@ -0,0 +1,163 @@
+import sqlite3
+import threading
+
+import pytest
+
+from mental_health.services.conversation_store import (
+    InMemoryConversationStore, SQLiteConversationStore
+)
+
+
+class ConnectionProxy:
+    """
+    Wraps the store's connection; `on_write` runs before each executemany.
+    """
+
+    def __init__(self, conn, on_write):
+        self._conn = conn
+        self._on_write = on_write
+
+    def executemany(self, sql, rows):
+        self._on_write()
+        return self._conn.executemany(sql, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteConversationStore(
+        str(tmp_path / "conversations.db"), write_batch_size=100, flush_interval=0
+    )
+    yield store
+    store.close()
+
+
+def test_failed_flush_keeps_pending_writes(store):
+    store.save("c1", {"chat_history": ["hello"]})
+
+    conn = store._conn
+    calls = []
+
+    def fail_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("disk I/O error")
+
+    store._conn = ConnectionProxy(conn, fail_once)
+
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+
+    assert store.load("c1") == {"chat_history": ["hello"]}
+
+    store.flush()
+    store._conn = conn
+
+    row = conn.execute("SELECT data FROM conversations WHERE id = 'c1'").fetchone()
+    assert row is not None
+
+
+def test_load_during_flush_sees_the_conversation(store):
+    store.save("c1", {"chat_history": ["hello"]})
+
+    writing = threading.Event()
+    release = threading.Event()
+
+    def block():
+        writing.set()
+        release.wait(5)
+
+    conn = store._conn
+    store._conn = ConnectionProxy(conn, block)
+
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+
+    try:
+        assert writing.wait(5)
+
+        # The load must not wait for the blocked commit
+        loaded = []
+        reader = threading.Thread(target=lambda: loaded.append(store.load("c1")))
+        reader.start()
+        reader.join(1)
+
+        assert loaded == [{"chat_history": ["hello"]}]
+    finally:
+        release.set()
+        flusher.join(5)
+        store._conn = conn
+
+    assert store.load("c1") == {"chat_history": ["hello"]}
+
+
+def test_older_snapshot_does_not_overwrite_newer(store):
+    store.save("c1", {"chat_history": ["new"]})
+    store.flush()
+
+    updated_at = store._conn.execute(
+        "SELECT updated_at FROM conversations WHERE id = 'c1'"
+    ).fetchone()[0]
+
+    with store._pending_lock:
+        store._pending["c1"] = ('{"chat_history": ["old"]}', updated_at - 10)
+
+    store.flush()
+
+    assert store.load("c1") == {"chat_history": ["new"]}
+
+
+def test_store_without_required_methods_cannot_be_created():
+    from mental_health.services.conversation_store import ConversationStore
+
+    class LoadOnly(ConversationStore):
+        def load(self, conversation_id):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
+
+
+def test_write_through_stores_share_the_latest_turn(tmp_path):
+    # Two prefork workers on one database
+    path = str(tmp_path / "conversations.db")
+    worker_a = SQLiteConversationStore(path, write_batch_size=1, flush_interval=0)
+    worker_b = SQLiteConversationStore(path, write_batch_size=1, flush_interval=0)
+
+    try:
+        worker_a.save("c1", {"chat_history": ["hello"]})
+        assert worker_b.load("c1") == {"chat_history": ["hello"]}
+
+        worker_b.save("c1", {"chat_history": ["hello", "again"]})
+        assert worker_a.load("c1") == {"chat_history": ["hello", "again"]}
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_save_trims_a_copy_of_the_history(backend, tmp_path):
+    if backend == "memory":
+        store = InMemoryConversationStore(max_messages=2)
+    else:
+        store = SQLiteConversationStore(
+            str(tmp_path / "conversations.db"), max_messages=2, flush_interval=0
+        )
+
+    conversation = {"chat_history": ["one", "two", "three"], "age_group": "Teen"}
+
+    try:
+        store.save("c1", conversation)
+
+        assert conversation["chat_history"] == ["one", "two", "three"]
+        assert store.load("c1") == {"chat_history": ["two", "three"], "age_group": "Teen"}
+    finally:
+        store.close()
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_utils import imap_bounded, normalize_label
+
+
+def test_imap_bounded_yields_in_input_order():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(imap_bounded(executor, lambda n: n * n, range(50), 3)) == [
+            n * n for n in range(50)
+        ]
+
+
+def test_imap_bounded_limits_tasks_in_flight():
+    consumed = []
+
+    def lazy_items():
+        for n in range(40):
+            # Never more than max_pending submitted ahead of consumption
+            assert n - len(consumed) <= 4
+            yield n
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for result in imap_bounded(executor, lambda n: n, lazy_items(), 4):
+            consumed.append(result)
+
+    assert consumed == list(range(40))
+
+
+def test_imap_bounded_reraises_task_errors():
+    def fail_on_three(n):
+        if n == 3:
+            raise RuntimeError("bad chunk")
+        return n
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = imap_bounded(executor, fail_on_three, range(10), 2)
+
+        assert [next(results) for _ in range(3)] == [0, 1, 2]
+
+        with pytest.raises(RuntimeError, match="bad chunk"):
+            next(results)
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Normal", 0), ("low", 0), ("0", 0), (0, 0), ("no stress", 0),
+    ("Moderate", 1), ("medium", 1), (1, 1),
+    ("Depression", 2), ("Suicidal", 2), ("high", 2), (2, 2),
+])
+def test_normalize_label(label, expected):
+    assert normalize_label(label) == expected
@@ -0,0 +1,99 @@
+import random
+
+import numpy as np
+import pytest
+
+import dedup_utils
+from dedup_utils import duplicate_masks, exact_hashes, minhash_band_keys
+
+
+def random_text(rng, words=100):
+    return " ".join(f"word{rng.randrange(5000)}" for _ in range(words))
+
+
+def one_word_changed(text, position):
+    words = text.split()
+    words[position] = "changed"
+    return " ".join(words)
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(0)
+    return [random_text(rng) for _ in range(200)]
+
+
+def test_exact_hashes_only_match_identical_texts():
+    hashes = exact_hashes(["exam stress", "exam stress", "exam  stress", "Exam stress"])
+
+    assert hashes.dtype == np.uint64
+    assert hashes[0] == hashes[1]
+    assert len(set(hashes[1:].tolist())) == 3
+
+
+def test_band_keys_are_deterministic_per_text(corpus):
+    keys = minhash_band_keys(corpus)
+
+    assert keys.shape == (len(corpus), dedup_utils.BANDS)
+    assert keys.dtype == np.uint64
+    np.testing.assert_array_equal(keys, minhash_band_keys(corpus))
+    np.testing.assert_array_equal(keys[5:6], minhash_band_keys(corpus[5:6]))
+
+
+def test_band_keys_do_not_depend_on_block_size(corpus, monkeypatch):
+    keys = minhash_band_keys(corpus)
+
+    monkeypatch.setattr(dedup_utils, "_BLOCK_SHINGLES", 250)
+
+    np.testing.assert_array_equal(keys, minhash_band_keys(corpus))
+
+
+def test_short_and_empty_texts_get_band_keys():
+    keys = minhash_band_keys(["", "calm", "two words", "two words"])
+
+    assert keys.shape == (4, dedup_utils.BANDS)
+    np.testing.assert_array_equal(keys[2], keys[3])
+    assert minhash_band_keys([]).shape == (0, dedup_utils.BANDS)
+
+
+def test_exact_and_near_duplicates_of_earlier_rows_are_flagged(corpus):
+    texts = corpus[:50] + [
+        corpus[3],
+        one_word_changed(corpus[7], 50),
+        one_word_changed(corpus[11], 0),
+    ]
+
+    exact, near = duplicate_masks(exact_hashes(texts), minhash_band_keys(texts))
+
+    assert np.flatnonzero(exact).tolist() == [50]
+    assert np.flatnonzero(near).tolist() == [51, 52]
+
+
+def test_distinct_texts_are_all_kept(corpus):
+    exact, near = duplicate_masks(exact_hashes(corpus), minhash_band_keys(corpus))
+
+    assert not exact.any()
+    assert not near.any()
+
+
+def test_band_key_columns_can_be_streamed(corpus):
+    texts = corpus[:30] + [one_word_changed(text, 20) for text in corpus[:30:3]]
+    exact = exact_hashes(texts)
+    keys = minhash_band_keys(texts)
+
+    from_array = duplicate_masks(exact, keys)
+    from_columns = duplicate_masks(exact, (keys[:, band] for band in range(keys.shape[1])))
+
+    for array_mask, column_mask in zip(from_array, from_columns):
+        np.testing.assert_array_equal(array_mask, column_mask)
+
+    assert from_array[1][30:].all()
+
+
+def test_exact_only_masks_skip_near_duplicates(corpus):
+    texts = [corpus[0], one_word_changed(corpus[0], 1), corpus[0]]
+
+    exact, near = duplicate_masks(exact_hashes(texts))
+
+    assert exact.tolist() == [False, False, True]
+    assert not near.any()
@@ -0,0 +1,178 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, f1_score
+
+import evaluation_utils
+from evaluation_utils import (
+    bootstrap_intervals, build_report, confusion_counts, evaluate_model,
+    expected_calibration_error, save_metrics, within_latency_budget
+)
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(0)
+    true_index = rng.integers(0, 3, size=400)
+    pred_index = np.where(rng.random(400) < 0.7, true_index, rng.integers(0, 3, size=400))
+    confidence = rng.uniform(0.34, 1.0, size=400)
+
+    return true_index, pred_index, confidence
+
+
+def legacy_ece(confidence, correct, n_bins):
+    # Per-bin loop over equal-width bins, the last one closed at 1.0
+    total = 0.0
+
+    for index in range(n_bins):
+        low, high = index / n_bins, (index + 1) / n_bins
+        in_bin = (confidence >= low) & ((confidence < high) | (index == n_bins - 1))
+
+        if in_bin.any():
+            gap = abs(correct[in_bin].mean() - confidence[in_bin].mean())
+            total += gap * in_bin.mean()
+
+    return total
+
+
+def test_report_matches_scikit_learn(predictions):
+    true_index, pred_index, _ = predictions
+    labels = np.array([0, 1, 2])
+
+    confusion = confusion_counts(true_index, pred_index, 3)
+    expected = classification_report(true_index, pred_index, output_dict=True, zero_division=0)
+
+    np.testing.assert_array_equal(confusion, confusion_matrix(true_index, pred_index))
+
+    report = build_report(confusion, labels)
+
+    assert report.keys() == expected.keys()
+    assert report["accuracy"] == pytest.approx(expected["accuracy"])
+
+    for name in ["0", "1", "2", "macro avg", "weighted avg"]:
+        for metric, value in expected[name].items():
+            assert report[name][metric] == pytest.approx(value), (name, metric)
+
+
+def test_never_predicted_class_gets_zero_precision():
+    confusion = confusion_counts(np.array([0, 1, 2, 2]), np.array([0, 1, 1, 1]), 3)
+    report = build_report(confusion, [0, 1, 2])
+
+    assert report["2"] == {"precision": 0.0, "recall": 0.0, "f1-score": 0.0, "support": 2.0}
+
+
+def test_calibration_error_matches_per_bin_loop(predictions):
+    true_index, pred_index, confidence = predictions
+    correct = (true_index == pred_index).astype(float)
+
+    for n_bins in (1, 10, 15):
+        assert expected_calibration_error(confidence, correct, n_bins) == pytest.approx(
+            legacy_ece(confidence, correct, n_bins)
+        )
+
+    assert expected_calibration_error(np.array([1.0, 1.0]), np.array([1.0, 1.0])) == 0.0
+
+
+def test_bootstrap_chunk_matches_per_resample_scoring(predictions, monkeypatch):
+    true_index, pred_index, confidence = predictions
+    correct = (true_index == pred_index).astype(float)
+    bins = evaluation_utils._calibration_bins(confidence, 15)
+
+    # Small blocks, so several draws of resamples are stitched together
+    monkeypatch.setattr(evaluation_utils, "_BOOTSTRAP_BLOCK_CELLS", 3 * len(true_index))
+
+    confusions, errors = evaluation_utils._bootstrap_chunk(
+        true_index, pred_index, bins, confidence, correct, 3, 15, 10, seed=7
+    )
+
+    rng = np.random.default_rng(7)
+
+    for start in range(0, 10, 3):
+        picks = rng.integers(0, len(true_index), size=(min(3, 10 - start), len(true_index)))
+
+        for offset, pick in enumerate(picks):
+            np.testing.assert_array_equal(
+                confusions[start + offset],
+                confusion_matrix(true_index[pick], pred_index[pick], labels=[0, 1, 2])
+            )
+            assert errors[start + offset] == pytest.approx(
+                legacy_ece(confidence[pick], correct[pick], 15)
+            )
+
+
+def test_bootstrap_intervals_bracket_the_point_estimates(predictions):
+    true_index, pred_index, confidence = predictions
+
+    intervals = bootstrap_intervals(
+        true_index, pred_index, confidence, [0, 1, 2], resamples=200, n_jobs=2
+    )
+
+    low, high = intervals["accuracy"]
+    assert low < accuracy_score(true_index, pred_index) < high
+
+    low, high = intervals["f1_macro"]
+    assert low < f1_score(true_index, pred_index, average="macro") < high
+
+    assert set(intervals["f1_per_class"]) == {"0", "1", "2"}
+    assert intervals == bootstrap_intervals(
+        true_index, pred_index, confidence, [0, 1, 2], resamples=200, n_jobs=2
+    )
+
+
+def test_bootstrap_intervals_can_be_skipped(predictions):
+    true_index, pred_index, confidence = predictions
+
+    assert bootstrap_intervals(true_index, pred_index, confidence, [0, 1, 2], resamples=0) == {}
+
+
+def test_evaluate_model_scores_the_test_set(stress_pipeline, capsys):
+    texts = [
+        "calm weekend with friends", "exam deadline pressure", "hopeless panic crying",
+        "relaxed but worried", "tired and overwhelmed", "happy rested life", "busy exam sleep",
+    ]
+    labels = np.array([0, 1, 2, 1, 2, 0, 3])
+
+    metrics = evaluate_model(
+        stress_pipeline, texts, labels,
+        batch_size=3, bootstrap_samples=50, latency_samples=4, n_jobs=1
+    )
+
+    predicted = stress_pipeline.predict(texts)
+
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(labels, predicted))
+    assert metrics["f1_macro"] == pytest.approx(
+        f1_score(labels, predicted, average="macro", labels=[0, 1, 2, 3], zero_division=0)
+    )
+    assert metrics["confusion_matrix"]["labels"] == ["0", "1", "2", "3"]
+    assert metrics["confusion_matrix"]["matrix"] == confusion_matrix(
+        labels, predicted, labels=[0, 1, 2, 3]
+    ).tolist()
+    assert metrics["confidence_intervals"]["resamples"] == 50
+    assert metrics["inference"]["test_samples"] == 7
+    assert metrics["inference"]["latency_ms"]["samples"] == 4
+
+    json.dumps(metrics)
+    assert "MODEL PERFORMANCE" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("p99, budget, expected", [
+    (12.0, None, True),
+    (12.0, 20, True),
+    (12.0, 10, False),
+    (None, 10, True),
+])
+def test_within_latency_budget(p99, budget, expected):
+    latency = {} if p99 is None else {"p99": p99}
+    metrics = {"inference": {"latency_ms": latency}}
+
+    assert within_latency_budget(metrics, budget) is expected
+
+
+def test_save_metrics_records_the_model_version(tmp_path):
+    path = save_metrics({"accuracy": 0.9}, str(tmp_path), "stress_model_20260101_000000.pkl")
+
+    with open(path) as f:
+        assert json.load(f) == {
+            "accuracy": 0.9, "model_version": "stress_model_20260101_000000.pkl"
+        }
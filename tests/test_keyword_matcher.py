@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from mental_health.services import chatbot_engine
+from mental_health.services.keyword_matcher import KeywordMatcher
+
+# The substring rules the keyword matching replaced
+
+
+def legacy_detect_emotion_intensity(message):
+    if not isinstance(message, str):
+        return "Low"
+
+    message = message.lower()
+
+    for word in chatbot_engine.HIGH_INTENSITY_WORDS:
+        if word in message:
+            return "High"
+
+    for word in chatbot_engine.MODERATE_INTENSITY_WORDS:
+        if word in message:
+            return "Moderate"
+
+    return "Low"
+
+
+def legacy_detect_topic(message):
+    message = message.lower()
+
+    for topic, words in chatbot_engine.TOPIC_KEYWORDS.items():
+        if any(word in message for word in words):
+            return topic
+
+    return "general"
+
+
+def random_messages(count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = (
+        chatbot_engine.HIGH_INTENSITY_WORDS
+        + chatbot_engine.MODERATE_INTENSITY_WORDS
+        + [word for words in chatbot_engine.TOPIC_KEYWORDS.values() for word in words]
+        + ["I", "feel", "today", "Really", "my", "life", "and", "the", "SLEEPING", "Workout"]
+    )
+
+    return [
+        " ".join(rng.choices(vocabulary, k=rng.randint(0, 12)))
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture(params=["scan", "automaton"])
+def matching(request, monkeypatch):
+    # Both matching strategies of chatbot_engine
+    if request.param == "automaton":
+        monkeypatch.setattr(chatbot_engine, "AUTOMATON_MIN_KEYWORDS", 0)
+        monkeypatch.setattr(chatbot_engine, "_matcher", chatbot_engine.build_keyword_matcher())
+
+        assert chatbot_engine._matcher is not None
+    else:
+        assert chatbot_engine._matcher is None
+
+    return request.param
+
+
+def test_matcher_finds_overlapping_keywords():
+    matcher = KeywordMatcher([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+
+    assert matcher.match("ushers") == {1, 2, 4}
+    assert matcher.match("this") == {3}
+    assert matcher.match("") == set()
+
+
+def test_matcher_agrees_with_substring_checks():
+    rng = random.Random(1)
+    keywords = [("".join(rng.choices("abc", k=rng.randint(1, 4))), n % 5) for n in range(40)]
+    matcher = KeywordMatcher(keywords)
+
+    for _ in range(200):
+        text = "".join(rng.choices("abcd", k=rng.randint(0, 30)))
+        assert matcher.match(text) == {tag for keyword, tag in keywords if keyword in text}
+
+
+def test_matcher_rejects_empty_keywords():
+    with pytest.raises(ValueError):
+        KeywordMatcher([("", "tag")])
+
+
+def test_detectors_match_substring_rules(matching):
+    for message in random_messages(500):
+        assert chatbot_engine.detect_emotion_intensity(message) == legacy_detect_emotion_intensity(message)
+        assert chatbot_engine.detect_topic(message) == legacy_detect_topic(message)
+        assert chatbot_engine.analyze_message(message) == (
+            legacy_detect_emotion_intensity(message), legacy_detect_topic(message)
+        )
+
+
+def test_non_string_message_is_low_and_general(matching):
+    assert chatbot_engine.detect_emotion_intensity(None) == "Low"
+    assert chatbot_engine.analyze_message(None) == ("Low", "general")
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("I have not been sleeping at all", "Sleep issues"),
+    ("My boss keeps adding to my workload", "Work pressure"),
+    ("Exams in college are close", "Academic stress"),
+    ("I had a breakup with my partner", "Relationships"),
+    ("I feel hopeless about my exams", "I’m really concerned"),
+    ("Nothing much to say", "Thank you for sharing"),
+])
+def test_generate_response_follows_intensity_and_topic(matching, message, expected):
+    history = [{"role": "user", "message": message}]
+
+    assert chatbot_engine.generate_response(message, "Low", history).startswith(expected)
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+from mental_health.services import log_pipeline
+from mental_health.services.log_pipeline import (
+    SAMPLED, DeferredQueueHandler, JsonFormatter, SamplingFilter
+)
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("mental_health.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(LOG_DIR=str(tmp_path), LOG_LEVEL="INFO", LOG_SAMPLE_RATE=1.0)
+
+    log_pipeline.init_app(app)
+
+    yield app
+
+    log_pipeline.shutdown()
+
+    for logger in log_pipeline._loggers(app):
+        for handler in list(logger.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                logger.removeHandler(handler)
+        logger.propagate = True
+
+
+def test_json_lines_carry_extra_fields_and_tracebacks():
+    formatter = JsonFormatter()
+
+    entry = json.loads(formatter.format(make_record(stress_level="High", sampled=True)))
+
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "mental_health.test"
+    assert entry["stress_level"] == "High"
+    assert "sampled" not in entry
+    assert entry["time"].endswith("+00:00")
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = make_record(level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+
+    assert "RuntimeError: boom" in json.loads(formatter.format(record))["exception"]
+
+
+def test_sampling_only_drops_sampled_info_records():
+    drop_all = SamplingFilter(rate=0.0)
+
+    assert not drop_all.filter(make_record(**SAMPLED))
+    assert drop_all.filter(make_record())
+    assert drop_all.filter(make_record(level=logging.WARNING, **SAMPLED))
+
+    keep_all = SamplingFilter(rate=1.0)
+    record = make_record(**SAMPLED)
+
+    assert keep_all.filter(record)
+    assert record.sample_rate == 1.0
+
+
+def test_queued_records_render_tracebacks_right_away():
+    handler = DeferredQueueHandler(None)
+
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        record = make_record(level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+
+    prepared = handler.prepare(record)
+
+    assert prepared.exc_info is None
+    assert "ValueError: bad input" in prepared.exc_text
+    assert prepared.args == ("world",)
+
+
+def test_logs_reach_the_file_after_shutdown(app, tmp_path):
+    logging.getLogger("mental_health.test").info(
+        "scored %d texts", 3, extra={"batch_size": 3}
+    )
+    log_pipeline.shutdown()
+
+    [entry] = read_lines(tmp_path / "app.log")
+
+    assert entry["message"] == "scored 3 texts"
+    assert entry["batch_size"] == 3
+
+
+def test_use_log_file_switches_files_without_losing_records(app, tmp_path):
+    logger = logging.getLogger("mental_health.test")
+
+    logger.info("before")
+    log_pipeline.use_log_file(app, "app.worker0.log")
+    logger.info("after")
+    log_pipeline.shutdown()
+
+    assert [e["message"] for e in read_lines(tmp_path / "app.log")] == ["before"]
+    assert [e["message"] for e in read_lines(tmp_path / "app.worker0.log")] == ["after"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_logs_through_its_own_listener(app, tmp_path):
+    pid = os.fork()
+
+    if pid == 0:
+        code = 1
+
+        try:
+            log_pipeline.use_log_file(app, "app.worker1.log")
+            logging.getLogger("mental_health.test").info("from child")
+            log_pipeline.shutdown()
+            code = 0
+        finally:
+            os._exit(code)
+
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert [e["message"] for e in read_lines(tmp_path / "app.worker1.log")] == ["from child"]
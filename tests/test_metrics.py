@@ -0,0 +1,85 @@
+import pytest
+from flask import Flask
+
+from mental_health.services import metrics
+from mental_health.services.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_renders_one_line_per_label_set(registry):
+    counter = registry.counter("jobs_total", "Jobs run.", ["kind"])
+    counter.inc(("fast",))
+    counter.inc(("fast",), 2)
+    counter.inc(('say "hi"\n',))
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs run.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="fast"} 3',
+        'jobs_total{kind="say \\"hi\\"\\n"} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 2.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_timer_observes_into_its_labels(registry):
+    histogram = registry.histogram("stage_seconds", "Stages.", ["stage"])
+
+    with histogram.time("vectorization"):
+        pass
+
+    assert 'stage_seconds_count{stage="vectorization"} 1' in registry.render()
+
+
+def test_metrics_are_created_once_by_name(registry):
+    first = registry.counter("hits_total", "Hits.")
+
+    assert registry.counter("hits_total", "Hits.") is first
+
+
+def test_collectors_are_rendered_and_replaced_by_name(registry):
+    registry.set_collector("cache", lambda: ["cache_entries 1"])
+    registry.set_collector("cache", lambda: ["cache_entries 2"])
+
+    assert registry.render() == "cache_entries 2\n"
+
+
+def test_flask_requests_are_counted_and_exposed():
+    app = Flask(__name__)
+    app.config["METRICS_PATH"] = "/metrics"
+
+    @app.route("/ping")
+    def ping():
+        return "pong"
+
+    metrics.init_app(app)
+    client = app.test_client()
+
+    client.get("/ping")
+    client.get("/missing")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+
+    text = response.get_data(as_text=True)
+    assert 'mental_health_requests_total{endpoint="ping",status="200"}' in text
+    assert 'mental_health_requests_total{endpoint="unmatched",status="404"}' in text
+    assert 'mental_health_request_latency_seconds_count{endpoint="ping"}' in text
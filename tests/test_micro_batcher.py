@@ -0,0 +1,81 @@
+import time
+import threading
+
+from mental_health.services.micro_batcher import MicroBatcher
+
+
+def double(items):
+    return [item * 2 for item in items]
+
+
+def test_submit_after_stop_is_scored_inline():
+    batcher = MicroBatcher(double, max_batch_size=4, max_wait_seconds=0.001)
+
+    assert batcher.submit(1) == 2
+
+    batcher.stop()
+
+    assert batcher.submit(3) == 6
+    assert batcher._worker is None
+
+
+def test_submits_racing_stop_all_complete():
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait_seconds=0.001)
+    futures = []
+    start = threading.Barrier(9)
+
+    def submit_many():
+        start.wait()
+        futures.extend(batcher.submit_async(n) for n in range(200))
+
+    threads = [threading.Thread(target=submit_many) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    start.wait()
+    batcher.stop()
+
+    for thread in threads:
+        thread.join()
+
+    assert all(future.result(timeout=5) % 2 == 0 for future in futures)
+    assert batcher._worker is None
+
+
+def test_lone_item_is_scored_without_waiting():
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait_seconds=5)
+
+    try:
+        start = time.perf_counter()
+        assert batcher.submit(1) == 2
+        assert time.perf_counter() - start < 1
+    finally:
+        batcher.stop()
+
+
+def test_items_queued_during_a_batch_are_scored_together():
+    scoring = threading.Event()
+    release = threading.Event()
+    sizes = []
+
+    def score(items):
+        sizes.append(len(items))
+        scoring.set()
+        release.wait(5)
+        return double(items)
+
+    batcher = MicroBatcher(score, max_batch_size=8, max_wait_seconds=0.05)
+
+    try:
+        first = batcher.submit_async(0)
+        assert scoring.wait(5)
+
+        queued = [batcher.submit_async(n) for n in range(1, 5)]
+        release.set()
+
+        assert first.result(5) == 0
+        assert [future.result(5) for future in queued] == [2, 4, 6, 8]
+        assert sizes == [1, 4]
+    finally:
+        batcher.stop()
@@ -0,0 +1,201 @@
+import os
+import time
+import threading
+
+import numpy as np
+import pytest
+
+from mental_health.services.model_registry import ModelRegistry
+
+
+class FakeModel:
+    classes_ = np.array([0, 1, 2])
+
+    def predict_proba(self, texts):
+        return np.full((len(texts), 3), 1 / 3)
+
+
+def write_artifact(directory, version, content=b""):
+    # Registries order artifacts by ctime; keep consecutive ones apart
+    time.sleep(0.05)
+    (directory / f"stress_model_{version}.pkl").write_bytes(content)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    for version in ("A", "B", "C"):
+        write_artifact(tmp_path, version)
+
+    return ModelRegistry(str(tmp_path), loader=lambda path: FakeModel())
+
+
+def test_repeated_rollbacks_keep_going_back(registry):
+    for version in ("A", "B", "C"):
+        registry.pin(f"stress_model_{version}.pkl")
+
+    assert registry.rollback() == "stress_model_B.pkl"
+    assert registry.rollback() == "stress_model_A.pkl"
+    assert registry.active_version == "stress_model_A.pkl"
+
+    with pytest.raises(LookupError):
+        registry.rollback()
+
+
+def test_pin_survives_a_restart(registry):
+    registry.pin("stress_model_B.pkl")
+
+    restarted = ModelRegistry(registry.model_dir, loader=lambda path: FakeModel())
+
+    assert restarted.get()[0] == "stress_model_B.pkl"
+    assert restarted.status()["pinned_version"] == "stress_model_B.pkl"
+
+
+def test_other_processes_follow_pin_and_unpin(registry):
+    # A second registry on the same directory stands in for another worker
+    worker = ModelRegistry(registry.model_dir, loader=lambda path: FakeModel())
+    assert worker.get()[0] == "stress_model_C.pkl"
+
+    registry.pin("stress_model_A.pkl")
+
+    assert worker.refresh()
+    assert worker.active_version == "stress_model_A.pkl"
+
+    registry.unpin()
+
+    assert worker.refresh()
+    assert worker.active_version == "stress_model_C.pkl"
+    assert worker.status()["pinned_version"] is None
+
+
+def test_rollback_is_pinned_for_other_processes(registry):
+    worker = ModelRegistry(registry.model_dir, loader=lambda path: FakeModel())
+
+    registry.pin("stress_model_B.pkl")
+    registry.pin("stress_model_C.pkl")
+    registry.rollback()
+
+    worker.refresh()
+    assert worker.active_version == "stress_model_B.pkl"
+
+
+class BrokenModel(FakeModel):
+    def predict_proba(self, texts):
+        return np.zeros((len(texts), 2))
+
+
+def load_by_content(path):
+    with open(path, "rb") as f:
+        return BrokenModel() if f.read() == b"broken" else FakeModel()
+
+
+def test_failed_artifact_is_not_retried_until_it_changes(tmp_path):
+    write_artifact(tmp_path, "A")
+
+    loads = []
+
+    def loader(path):
+        loads.append(os.path.basename(path))
+        return load_by_content(path)
+
+    registry = ModelRegistry(str(tmp_path), loader=loader)
+    registry.get()
+
+    write_artifact(tmp_path, "B", b"broken")
+
+    with pytest.raises(ValueError):
+        registry.refresh()
+
+    assert registry.refresh() is False
+    assert registry.refresh() is False
+    assert loads == ["stress_model_A.pkl", "stress_model_B.pkl"]
+    assert registry.active_version == "stress_model_A.pkl"
+
+    # Rewritten (fixed) artifact: new mtime, loaded again
+    path = tmp_path / "stress_model_B.pkl"
+    path.write_bytes(b"")
+    os.utime(path, (time.time() + 10, time.time() + 10))
+
+    assert registry.refresh() is True
+    assert registry.active_version == "stress_model_B.pkl"
+
+
+class VersionedModel(FakeModel):
+    def __init__(self, version):
+        self.version = version
+
+
+def test_refresh_swaps_in_a_newer_artifact(tmp_path):
+    write_artifact(tmp_path, "A")
+    registry = ModelRegistry(str(tmp_path), loader=load_by_content)
+
+    assert registry.get()[0] == "stress_model_A.pkl"
+    assert registry.refresh() is False
+
+    write_artifact(tmp_path, "B")
+
+    assert registry.refresh() is True
+    assert registry.get()[0] == "stress_model_B.pkl"
+    assert registry.status()["history"] == ["stress_model_A.pkl", "stress_model_B.pkl"]
+
+
+def test_artifact_failing_validation_keeps_the_active_model(tmp_path):
+    write_artifact(tmp_path, "A")
+    registry = ModelRegistry(str(tmp_path), loader=load_by_content)
+    version, model = registry.get()
+
+    write_artifact(tmp_path, "B", b"broken")
+
+    with pytest.raises(ValueError, match="stress_model_B.pkl"):
+        registry.refresh()
+
+    assert registry.get() == (version, model)
+
+    with pytest.raises(ValueError):
+        registry.install("in_memory", BrokenModel())
+
+    assert registry.get() == (version, model)
+
+
+def test_hot_swap_does_not_disturb_running_requests(tmp_path):
+    for version in ("A", "B"):
+        write_artifact(tmp_path, version)
+
+    registry = ModelRegistry(
+        str(tmp_path), loader=lambda path: VersionedModel(os.path.basename(path))
+    )
+    registry.pin("stress_model_A.pkl")
+
+    # A request that took the model before the swap finishes with it
+    version, model = registry.get()
+    registry.pin("stress_model_B.pkl")
+
+    assert (version, model.version) == ("stress_model_A.pkl", "stress_model_A.pkl")
+    assert model.predict_proba(["still serving"]).shape == (1, 3)
+
+    # Concurrent readers always see a matching (version, model) pair
+    stop = threading.Event()
+    mismatches = []
+
+    def serve():
+        while not stop.is_set():
+            version, model = registry.get()
+            if version != model.version:
+                mismatches.append(version)
+            time.sleep(0)
+
+    readers = [threading.Thread(target=serve) for _ in range(4)]
+
+    for reader in readers:
+        reader.start()
+
+    try:
+        for _ in range(50):
+            registry.pin("stress_model_A.pkl")
+            registry.pin("stress_model_B.pkl")
+    finally:
+        stop.set()
+
+        for reader in readers:
+            reader.join()
+
+    assert mismatches == []
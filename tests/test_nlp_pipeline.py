@@ -0,0 +1,73 @@
+import random
+import re
+
+import pandas as pd
+
+from mental_health.nlp_pipeline import clean_text, clean_texts
+
+
+def legacy_clean_text(text):
+    # The three-pass implementation clean_text replaced
+    if pd.isna(text):
+        return ""
+
+    text = str(text).lower()
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[^a-zA-Z\s]", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+SAMPLES = [
+    "I can't SLEEP before exams!!!",
+    "see https://t.co/x9Yz1 and http://example.com/post?id=42 now",
+    "httpnotaurl and HTTP://UPPER.case/path",
+    "  tabs\tand\nnewlines\r\n  everywhere  ",
+    "file\x1cseparators\x1dare\x1ewhitespace\x1f",
+    "café naïve résumé — “quotes” ünïcödé",
+    "emoji 😀 and 中文 mixed in",
+    "İstanbul ǅ ligatures ﬁne",
+    "nul\x00inside",
+    "2am #exams @boss :(",
+    "",
+    "   ",
+]
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    alphabet = "abcXYZ  \t\n.,!?'0129é😀\x1c  http:/"
+
+    return ["".join(rng.choices(alphabet, k=rng.randint(0, 60))) for _ in range(count)]
+
+
+def test_clean_text_matches_the_legacy_implementation():
+    for text in SAMPLES + random_texts(2000):
+        assert clean_text(text) == legacy_clean_text(text), repr(text)
+
+
+def test_missing_and_non_string_values():
+    assert clean_text(None) == ""
+    assert clean_text(float("nan")) == ""
+    assert clean_text(42) == ""
+    assert clean_text(b"bytes") == legacy_clean_text(b"bytes")
+
+
+def test_clean_texts_matches_clean_text_across_chunks():
+    # More texts than one batch chunk, with a NUL forcing the fallback
+    texts = random_texts(5000, seed=1) + SAMPLES + [None, float("nan"), 7]
+
+    assert clean_texts(texts) == [clean_text(text) for text in texts]
+    assert clean_texts(iter(texts[:10])) == [clean_text(text) for text in texts[:10]]
+    assert clean_texts([]) == []
+
+
+def test_clean_texts_keeps_series_index_and_name():
+    series = pd.Series(["Hello, World!", None, "http://x.y z"], index=[10, 20, 30], name="text")
+
+    cleaned = clean_texts(series)
+
+    assert isinstance(cleaned, pd.Series)
+    assert cleaned.name == "text"
+    assert cleaned.index.tolist() == [10, 20, 30]
+    assert cleaned.tolist() == ["hello world", "", "z"]
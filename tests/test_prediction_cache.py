@@ -0,0 +1,91 @@
+import pytest
+
+from mental_health.services import prediction_cache
+from mental_health.services.prediction_cache import PredictionCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_hit_and_miss_are_counted():
+    cache = PredictionCache(max_size=4)
+    key = cache.make_key("v1", "i feel calm")
+
+    assert cache.get(key) is None
+
+    cache.put(key, (0.7, 0.2, 0.1))
+
+    assert cache.get(key) == (0.7, 0.2, 0.1)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_keys_depend_on_version_and_text():
+    key = PredictionCache.make_key("v1", "exam stress")
+
+    assert key == PredictionCache.make_key("v1", "exam stress")
+    assert key != PredictionCache.make_key("v2", "exam stress")
+    assert key != PredictionCache.make_key("v1", "exam stress!")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = PredictionCache(max_size=4, ttl_seconds=60)
+    cache.put("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_new_model_version_drops_every_entry():
+    cache = PredictionCache(max_size=4)
+    cache.sync_model_version("v1")
+    cache.put(cache.make_key("v1", "text"), 1)
+
+    cache.sync_model_version("v1")
+    assert cache.stats()["size"] == 1
+
+    cache.sync_model_version("v2")
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["model_version"] == "v2"
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = PredictionCache(max_size=0)
+    cache.put("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,118 @@
+import random
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from mental_health.runtime_model import RuntimeModel, export_runtime_model
+from mental_health.services import stress_engine
+
+
+def corpus(count=400, seed=0):
+    rng = random.Random(seed)
+    words = [
+        ["calm", "relaxed", "happy", "weekend", "friends", "café"],
+        ["deadline", "exam", "pressure", "busy", "worried", "naïve"],
+        ["hopeless", "panic", "overwhelmed", "crying", "worthless", "Über"],
+    ]
+    filler = ["i", "feel", "today", "the", "and", "my", "really", "it's", "x"]
+
+    labels = [rng.randrange(3) for _ in range(count)]
+    texts = [
+        " ".join(rng.choices(words[label], k=3) + rng.choices(filler, k=6))
+        for label in labels
+    ]
+
+    return texts, labels
+
+
+CHECK_TEXTS = [
+    "I feel hopeless and overwhelmed",
+    "calm weekend with friends at the café",
+    "CAFE cafe café Über uber",
+    "unseen words only here",
+    "",
+    "exam exam exam pressure deadline, really!",
+]
+
+PIPELINES = {
+    "tfidf_bigrams_multinomial": lambda: Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), stop_words="english")),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced"))
+    ]),
+    "tfidf_sublinear_accents_l1": lambda: Pipeline([
+        ("tfidf", TfidfVectorizer(sublinear_tf=True, strip_accents="unicode", norm="l1")),
+        ("clf", LogisticRegression(max_iter=1000, C=4.0))
+    ]),
+    "tfidf_ovr_liblinear": lambda: Pipeline([
+        ("tfidf", TfidfVectorizer(strip_accents="ascii", use_idf=False)),
+        ("clf", LogisticRegression(solver="liblinear"))
+    ]),
+    "counts_binary_sgd": lambda: Pipeline([
+        ("counts", CountVectorizer(binary=True, lowercase=False)),
+        ("clf", SGDClassifier(loss="log_loss", random_state=0))
+    ]),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PIPELINES))
+def test_runtime_probabilities_match_the_pipeline(name, tmp_path):
+    texts, labels = corpus()
+    pipeline = PIPELINES[name]().fit(texts, labels)
+    path = str(tmp_path / "model.runtime")
+
+    export_runtime_model(pipeline, path, check_texts=CHECK_TEXTS)
+    runtime = RuntimeModel.load(path)
+
+    check = CHECK_TEXTS + texts[:50]
+
+    np.testing.assert_allclose(
+        runtime.predict_proba(check), pipeline.predict_proba(check), atol=1e-5
+    )
+    assert list(runtime.classes_) == list(pipeline.classes_)
+    assert list(runtime.predict(check)) == list(pipeline.predict(check))
+    assert runtime.n_features == len(pipeline[0].vocabulary_)
+
+
+def test_hashing_pipeline_cannot_be_exported(tmp_path):
+    texts, labels = corpus(100)
+    pipeline = Pipeline([
+        ("hash", HashingVectorizer(n_features=2 ** 10)),
+        ("clf", SGDClassifier(loss="log_loss", random_state=0))
+    ]).fit(texts, labels)
+
+    with pytest.raises(ValueError):
+        export_runtime_model(pipeline, str(tmp_path / "model.runtime"))
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "model.runtime"
+    path.write_bytes(b"NOTAMODL" + bytes(64))
+
+    with pytest.raises(ValueError, match="not a runtime model"):
+        RuntimeModel.load(str(path))
+
+
+def test_serving_a_runtime_model_gives_the_pipeline_results(tmp_path):
+    texts, labels = corpus()
+    pipeline = PIPELINES["tfidf_bigrams_multinomial"]().fit(texts, labels)
+    path = str(tmp_path / "model.runtime")
+    export_runtime_model(pipeline, path)
+
+    stress_engine.configure_cache(max_size=0)
+
+    try:
+        stress_engine.get_registry().install("pipeline", pipeline)
+        expected = stress_engine.predict_stress_batch(CHECK_TEXTS)
+
+        stress_engine.get_registry().install("runtime", RuntimeModel.load(path))
+        actual = stress_engine.predict_stress_batch(CHECK_TEXTS)
+    finally:
+        stress_engine.configure_cache()
+
+    assert [r["level"] for r in actual] == [r["level"] for r in expected]
+
+    for runtime_result, pipeline_result in zip(actual, expected):
+        assert runtime_result["confidence"] == pytest.approx(pipeline_result["confidence"], abs=0.01)
@@ -0,0 +1,76 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+import train_stress_model as training
+
+
+def labeled_texts(count=240, seed=0):
+    rng = random.Random(seed)
+    words = [
+        ["calm", "relaxed", "happy", "weekend", "friends"],
+        ["deadline", "exam", "pressure", "busy", "worried"],
+        ["hopeless", "panic", "overwhelmed", "crying", "worthless"],
+    ]
+    filler = ["i", "feel", "today", "really", "my", "life"]
+
+    labels = [rng.randrange(3) for _ in range(count)]
+    texts = [
+        " ".join(rng.choices(words[label], k=3) + rng.choices(filler, k=4))
+        for label in labels
+    ]
+
+    return np.array(texts, dtype=object), np.array(labels)
+
+
+def test_expand_grid_is_the_cartesian_product():
+    grid = {"b": [1, 2], "a": ["x", "y", "z"]}
+    candidates = training.expand_grid(grid)
+
+    assert len(candidates) == 6
+    assert candidates[0] == {"a": "x", "b": 1}
+    assert {json.dumps(c, sort_keys=True) for c in candidates} == {
+        json.dumps({"a": a, "b": b}, sort_keys=True) for a in "xyz" for b in (1, 2)
+    }
+
+
+def test_empty_grid_has_one_default_candidate():
+    assert training.expand_grid({}) == [{}]
+
+
+def test_search_grid_file_restores_ngram_tuples(tmp_path):
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps({
+        "vectorizer": {"ngram_range": [[1, 1], [1, 3]]},
+        "classifier": {"C": [1.0]}
+    }))
+
+    grid = training.load_search_grid(str(path))
+
+    assert grid["vectorizer"]["ngram_range"] == [(1, 1), (1, 3)]
+    assert training.load_search_grid(None) is training.SEARCH_GRID
+
+
+def test_fold_scores_match_fitting_each_candidate_separately():
+    texts, labels = labeled_texts()
+    train_index, val_index = np.arange(180), np.arange(180, 240)
+
+    vectorizer_params = {"max_features": 50, "ngram_range": (1, 1)}
+    classifier_grid = [{"C": 0.5}, {"C": 2.0}]
+
+    results = training.evaluate_fold(
+        vectorizer_params, classifier_grid, texts, labels, train_index, val_index
+    )
+
+    assert [result["classifier"] for result in results] == classifier_grid
+
+    for result, classifier_params in zip(results, classifier_grid):
+        pipeline = training.build_pipeline(vectorizer_params, classifier_params)
+        pipeline.fit(texts[train_index], labels[train_index])
+
+        accuracy = (pipeline.predict(texts[val_index]) == labels[val_index]).mean()
+
+        assert result["accuracy"] == pytest.approx(accuracy)
+        assert result["fit_seconds"] > 0
@@ -0,0 +1,57 @@
+import pytest
+
+from mental_health.services import stress_engine
+
+
+@pytest.fixture
+def engine(stress_pipeline):
+    stress_engine.get_registry().install("test", stress_pipeline)
+    stress_engine.configure_cache(max_size=100)
+    stress_engine.configure_batcher(max_batch_size=8, max_wait_ms=2.0)
+
+    yield stress_engine
+
+    stress_engine.configure_batcher(max_batch_size=1)
+    stress_engine.configure_cache()
+
+
+class RejectingBatcher:
+    def submit(self, item):
+        raise AssertionError("cache hit went through the batcher")
+
+    def stop(self):
+        pass
+
+
+def test_cache_hit_skips_the_batcher(engine, monkeypatch):
+    text = "I feel hopeless and overwhelmed before the exam"
+    first = engine.predict_stress(text)
+
+    monkeypatch.setattr(engine, "_batcher", RejectingBatcher())
+
+    assert engine.predict_stress(text) == first
+    assert engine.get_cache_stats()["hits"] == 1
+    assert engine.get_cache_stats()["misses"] == 1
+
+
+def test_batched_and_unbatched_predictions_match(engine):
+    texts = ["calm weekend with friends", "deadline pressure at work", "panic and crying"]
+    batched = [engine.predict_stress(text) for text in texts]
+
+    engine.configure_batcher(max_batch_size=1)
+    engine.configure_cache(max_size=0)
+
+    assert [engine.predict_stress(text) for text in texts] == batched
+
+
+def test_hot_swapped_model_is_not_answered_from_the_cache(engine, stress_pipeline):
+    text = "calm weekend with friends"
+    engine.predict_stress_batch([text])
+
+    engine.get_registry().install("test-2", stress_pipeline)
+    engine.predict_stress_batch([text])
+
+    stats = engine.get_cache_stats()
+    assert stats["model_version"] == "test-2"
+    assert stats["invalidations"] == 1
+    assert stats["hits"] == 0
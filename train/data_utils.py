@@ -1,19 +1,53 @@
-import re
+import os
+import sys
+from collections import deque
+
 import pandas as pd
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# -----------------------------
+# Clean Text (shared with serving)
+# -----------------------------
+from mental_health.nlp_pipeline import clean_text, clean_texts  # noqa: E402
+
 
 # -----------------------------
-# Clean Text
+# Compact Dataset Dtypes
 # -----------------------------
-def clean_text(text: str) -> str:
-    if pd.isna(text):
-        return ""
+# Texts live in one Arrow buffer instead of a Python object per row, and
+# the 0-2 labels fit in a byte
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+LABEL_DTYPE = "int8"
+
+
+def iter_dataset_chunks(path, chunk_size, columns=("text", "label")):
+    """
+    Stream a prepared dataset (Parquet, or CSV from older runs) in
+    DataFrames of at most chunk_size rows, with Arrow-backed texts and
+    int8 labels.
+    """
+    columns = list(columns)
+
+    if not path.endswith(".parquet"):
+        dtypes = {"text": TEXT_DTYPE, "label": LABEL_DTYPE}
+
+        yield from pd.read_csv(
+            path, usecols=columns, chunksize=chunk_size,
+            dtype={column: dtypes[column] for column in columns}
+        )
+        return
 
-    text = str(text).lower()
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {pa.string(): TEXT_DTYPE, pa.large_string(): TEXT_DTYPE}
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas(types_mapper=types.get)
 
 
 # -----------------------------
@@ -37,3 +71,24 @@ def normalize_label(label):
 
     else:
         return 2
+
+
+# -----------------------------
+# Bounded Parallel Map
+# -----------------------------
+def imap_bounded(executor, func, iterable, max_pending):
+    """
+    Like executor.map, but only keeps `max_pending` tasks in flight so a
+    large or lazy iterable is never materialized up front. Results are
+    yielded in input order.
+    """
+    pending = deque()
+
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
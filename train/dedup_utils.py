@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Exact + Near-Duplicate Detection
+# -----------------------------
+#
+# Every cleaned text gets a 64-bit content hash (exact matches) and a
+# MinHash signature over its word 3-gram shingles, cut into LSH bands of
+# ROWS_PER_BAND values; each band is reduced to one 64-bit key. Two texts
+# whose Jaccard similarity is s share at least one band key with
+# probability 1 - (1 - s^ROWS_PER_BAND)^BANDS, about 0.5 at s = 0.77 and
+# above 0.99 at s = 0.9 with the defaults.
+#
+# Fingerprints are computed per chunk (in the cleaning workers); finding
+# duplicates is one sort per key column over the whole corpus, one column
+# at a time, so memory stays at 8 bytes per row per column in use and time
+# is O(n log n).
+
+NUM_PERM = 64
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+# Shingles hashed per MinHash block: bounds the (NUM_PERM, shingles)
+# permutation matrices, about 25 MB each, in the cleaning workers
+_BLOCK_SHINGLES = 50_000
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def _permutations(num_perm, seed):
+    # (a * x + b) mod p with a, b below the 61-bit prime; the product
+    # wraps at 64 bits first, as in datasketch's MinHash
+    rng = np.random.RandomState(seed)
+
+    a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    return a[:, None], b[:, None]
+
+
+def _mixers(count, seed):
+    # Odd 64-bit multipliers for combining hashes
+    rng = np.random.RandomState(seed)
+    return rng.randint(0, 1 << 62, size=count, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def exact_hashes(texts):
+    """
+    Stable 64-bit hash of each text (the same in every process).
+    """
+    return pd.util.hash_array(np.asarray(texts, dtype=object))
+
+
+def _shingle_hashes(texts):
+    """
+    Hashes of each text's word 3-grams (one shingle of all its words when
+    it has fewer) and the offset of each text's first shingle.
+    """
+    words = [text.split() for text in texts]
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+
+    flat = [word for text_words in words for word in text_words]
+    word_hashes = np.append(
+        pd.util.hash_array(np.asarray(flat, dtype=object)),
+        np.zeros(SHINGLE_WORDS, dtype=np.uint64)
+    )
+
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    ends = starts + lengths
+
+    counts = np.maximum(1, lengths - (SHINGLE_WORDS - 1))
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    owner = np.repeat(np.arange(len(texts)), counts)
+    positions = starts[owner] + np.arange(counts.sum()) - offsets[owner]
+
+    mixers = _mixers(SHINGLE_WORDS, seed=7)
+    shingles = np.zeros(len(positions), dtype=np.uint64)
+
+    for k in range(SHINGLE_WORDS):
+        inside = positions + k < ends[owner]
+        shingles += np.where(inside, word_hashes[positions + k], np.uint64(0)) * mixers[k]
+
+    return shingles, offsets
+
+
+def minhash_band_keys(texts, num_perm=NUM_PERM, bands=BANDS, seed=42):
+    """
+    (n_texts, bands) uint64 LSH band keys of each text's MinHash signature.
+    """
+    texts = list(texts)
+    rows_per_band = num_perm // bands
+
+    a, b = _permutations(num_perm, seed)
+    band_mixers = _mixers(rows_per_band, seed=seed + 1)
+
+    keys = np.empty((len(texts), bands), dtype=np.uint64)
+
+    # Blocks of about _BLOCK_SHINGLES shingles (estimated from text length)
+    estimated = np.cumsum([len(text) // 6 + 1 for text in texts])
+    bounds = np.searchsorted(
+        estimated, np.arange(_BLOCK_SHINGLES, estimated[-1] if len(texts) else 0, _BLOCK_SHINGLES)
+    )
+    bounds = np.unique(np.concatenate(([0], bounds + 1, [len(texts)])).clip(0, len(texts)))
+
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        block = texts[start:stop]
+        shingles, offsets = _shingle_hashes(block)
+
+        folded = (shingles ^ (shingles >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+        permuted = (a * folded[None, :] + b) % _MERSENNE_PRIME
+
+        signatures = np.minimum.reduceat(permuted, offsets, axis=1).T
+
+        banded = signatures.reshape(len(block), bands, rows_per_band)
+        keys[start:stop] = (banded * band_mixers).sum(axis=2, dtype=np.uint64)
+
+    return keys
+
+
+# -----------------------------
+# Duplicate Masks
+# -----------------------------
+def _repeats(values):
+    """
+    True for every value that already occurred earlier in the array.
+    """
+    _, first = np.unique(values, return_index=True)
+
+    repeated = np.ones(len(values), dtype=bool)
+    repeated[first] = False
+
+    return repeated
+
+
+def duplicate_masks(exact, band_keys=None):
+    """
+    (exact duplicate, near duplicate) masks over the corpus, in row order:
+    the first occurrence is kept. A row is a near duplicate when it shares
+    an LSH band key with any earlier row that is not an exact duplicate.
+
+    band_keys is an (n, bands) array or an iterable of per-band key
+    columns (read one at a time).
+    """
+    exact_duplicate = _repeats(exact)
+    near_duplicate = np.zeros(len(exact), dtype=bool)
+
+    if band_keys is None or not len(exact):
+        return exact_duplicate, near_duplicate
+
+    survivors = np.flatnonzero(~exact_duplicate)
+    repeated = np.zeros(len(survivors), dtype=bool)
+
+    columns = band_keys.T if isinstance(band_keys, np.ndarray) else band_keys
+
+    for keys in columns:
+        repeated |= _repeats(keys[survivors])
+
+    near_duplicate[survivors[repeated]] = True
+
+    return exact_duplicate, near_duplicate
@@ -1,30 +1,398 @@
 import json
 import os
-from sklearn.metrics import accuracy_score, classification_report
+import time
 
+import numpy as np
+from joblib import Parallel, delayed
 
-def evaluate_model(model, X_test, y_test, model_dir):
+EVAL_BATCH_SIZE = 4096
+CALIBRATION_BINS = 15
+BOOTSTRAP_SAMPLES = 1000
+CONFIDENCE_LEVEL = 0.95
+LATENCY_SAMPLES = 500
 
-    predictions = model.predict(X_test)
-    accuracy = accuracy_score(y_test, predictions)
-    report = classification_report(y_test, predictions, output_dict=True)
+# Cap on resampled indices held at once per bootstrap worker
+_BOOTSTRAP_BLOCK_CELLS = 4_000_000
+
+
+# -----------------------------
+# Batched Scoring
+# -----------------------------
+def score_in_batches(model, texts, batch_size=EVAL_BATCH_SIZE):
+    """
+    Probabilities for every text, one predict_proba call per batch.
+    Returns (probabilities, seconds spent scoring).
+    """
+    texts = list(texts)
+    batches = []
+
+    start = time.perf_counter()
+
+    for i in range(0, len(texts), batch_size):
+        batches.append(model.predict_proba(texts[i:i + batch_size]))
+
+    seconds = time.perf_counter() - start
+
+    return np.vstack(batches), seconds
+
+
+def measure_latency(model, texts, samples=LATENCY_SAMPLES):
+    """
+    Single-text predict_proba latency, as the server sees it, over up to
+    `samples` evenly spaced test texts (milliseconds).
+    """
+    texts = list(texts)
+
+    if not texts or samples <= 0:
+        return {}
+
+    picked = [texts[i] for i in np.linspace(0, len(texts) - 1, min(samples, len(texts))).astype(int)]
+
+    # Untimed call to settle lazy initialisation
+    model.predict_proba(picked[:1])
+
+    latencies = []
+
+    for text in picked:
+        start = time.perf_counter()
+        model.predict_proba([text])
+        latencies.append(time.perf_counter() - start)
+
+    latencies = np.array(latencies) * 1000
+
+    return {
+        "samples": len(picked),
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+        "max": float(latencies.max())
+    }
+
+
+# -----------------------------
+# Metrics from Confusion Counts
+# -----------------------------
+def confusion_counts(true_index, pred_index, n_classes):
+    codes = true_index * n_classes + pred_index
+    return np.bincount(codes, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def _safe_divide(numerator, denominator):
+    return np.divide(
+        numerator, denominator,
+        out=np.zeros(np.broadcast(numerator, denominator).shape),
+        where=denominator != 0
+    )
+
+
+def per_class_scores(confusion):
+    """
+    Precision, recall, F1 and support per class from one or a stack of
+    (n_classes, n_classes) confusion matrices (rows: true, columns:
+    predicted). Classes never predicted get precision 0, like
+    classification_report.
+    """
+    true_positives = np.diagonal(confusion, axis1=-2, axis2=-1).astype(float)
+    support = confusion.sum(axis=-1)
+    predicted = confusion.sum(axis=-2)
+
+    precision = _safe_divide(true_positives, predicted)
+    recall = _safe_divide(true_positives, support)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+
+    return precision, recall, f1, support
+
+
+def expected_calibration_error(confidence, correct, n_bins=CALIBRATION_BINS):
+    """
+    Mean |accuracy - confidence| over equal-width confidence bins,
+    weighted by the share of samples in each bin.
+    """
+    bins = _calibration_bins(confidence, n_bins)
+
+    confidence_sums = np.bincount(bins, weights=confidence, minlength=n_bins)
+    correct_sums = np.bincount(bins, weights=correct, minlength=n_bins)
+
+    return float(np.abs(correct_sums - confidence_sums).sum() / len(confidence))
+
+
+def _calibration_bins(confidence, n_bins):
+    return np.minimum((confidence * n_bins).astype(int), n_bins - 1)
+
+
+def build_report(confusion, labels):
+    """
+    classification_report(output_dict=True) layout, computed from the
+    confusion matrix instead of from the predictions again.
+    """
+    precision, recall, f1, support = per_class_scores(confusion)
+    total = support.sum()
+
+    report = {}
+
+    for index, label in enumerate(labels):
+        report[str(label)] = {
+            "precision": float(precision[index]),
+            "recall": float(recall[index]),
+            "f1-score": float(f1[index]),
+            "support": float(support[index])
+        }
+
+    report["accuracy"] = float(np.trace(confusion) / total) if total else 0.0
+
+    weights = support / total if total else support
+
+    for name, average in (("macro avg", np.mean), ("weighted avg", None)):
+        report[name] = {
+            metric: float(values.mean() if average else (values * weights).sum())
+            for metric, values in (
+                ("precision", precision), ("recall", recall), ("f1-score", f1)
+            )
+        }
+        report[name]["support"] = float(total)
+
+    return report
+
+
+def format_report(report, labels):
+    lines = [f"{'':>14}{'precision':>10}{'recall':>10}{'f1-score':>10}{'support':>10}", ""]
+
+    def row(name, scores):
+        return (
+            f"{name:>14}{scores['precision']:>10.2f}{scores['recall']:>10.2f}"
+            f"{scores['f1-score']:>10.2f}{int(scores['support']):>10}"
+        )
+
+    lines += [row(str(label), report[str(label)]) for label in labels]
+    lines += [
+        "",
+        f"{'accuracy':>14}{'':>20}{report['accuracy']:>10.2f}"
+        f"{int(report['macro avg']['support']):>10}",
+        row("macro avg", report["macro avg"]),
+        row("weighted avg", report["weighted avg"])
+    ]
+
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Bootstrap Confidence Intervals
+# -----------------------------
+def _bootstrap_chunk(true_index, pred_index, bins, confidence, correct, n_classes, n_bins, resamples, seed):
+    """
+    Confusion matrices and calibration errors of `resamples` bootstrap
+    resamples, drawn and counted a block of resamples at a time with
+    one bincount per quantity.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(true_index)
+
+    codes = true_index * n_classes + pred_index
+    block = max(1, _BOOTSTRAP_BLOCK_CELLS // max(1, n))
+
+    confusions = np.empty((resamples, n_classes, n_classes))
+    calibration_errors = np.empty(resamples)
+
+    for start in range(0, resamples, block):
+        size = min(block, resamples - start)
+        picks = rng.integers(0, n, size=(size, n))
+
+        # Offset each resample's cells so one bincount counts them all
+        rows = np.arange(size)[:, None]
+
+        cells = n_classes * n_classes
+        confusions[start:start + size] = np.bincount(
+            (rows * cells + codes[picks]).ravel(), minlength=size * cells
+        ).reshape(size, n_classes, n_classes)
+
+        bin_codes = (rows * n_bins + bins[picks]).ravel()
+        confidence_sums = np.bincount(
+            bin_codes, weights=confidence[picks].ravel(), minlength=size * n_bins
+        ).reshape(size, n_bins)
+        correct_sums = np.bincount(
+            bin_codes, weights=correct[picks].ravel(), minlength=size * n_bins
+        ).reshape(size, n_bins)
+
+        calibration_errors[start:start + size] = (
+            np.abs(correct_sums - confidence_sums).sum(axis=1) / n
+        )
+
+    return confusions, calibration_errors
+
+
+def bootstrap_intervals(
+    true_index, pred_index, confidence, labels,
+    resamples=BOOTSTRAP_SAMPLES, confidence_level=CONFIDENCE_LEVEL,
+    n_bins=CALIBRATION_BINS, n_jobs=-1, seed=42
+):
+    """
+    Percentile bootstrap intervals for accuracy, macro F1, per-class F1
+    and calibration error. Resamples are split across `n_jobs` processes.
+    """
+    if resamples <= 0 or not len(true_index):
+        return {}
+
+    n_classes = len(labels)
+    correct = (true_index == pred_index).astype(float)
+    bins = _calibration_bins(confidence, n_bins)
+
+    workers = os.cpu_count() if n_jobs in (None, -1) else max(1, n_jobs)
+    workers = max(1, min(workers, resamples))
+
+    counts = [len(part) for part in np.array_split(np.arange(resamples), workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+
+    chunks = Parallel(n_jobs=workers)(
+        delayed(_bootstrap_chunk)(
+            true_index, pred_index, bins, confidence, correct,
+            n_classes, n_bins, count, child_seed
+        )
+        for count, child_seed in zip(counts, seeds)
+    )
+
+    confusions = np.concatenate([chunk[0] for chunk in chunks])
+    calibration_errors = np.concatenate([chunk[1] for chunk in chunks])
+
+    _, _, f1, _ = per_class_scores(confusions)
+    accuracy = np.trace(confusions, axis1=1, axis2=2) / len(true_index)
+
+    tail = (1 - confidence_level) / 2 * 100
+
+    def interval(values):
+        low, high = np.percentile(values, [tail, 100 - tail])
+        return [float(low), float(high)]
+
+    intervals = {
+        "confidence_level": confidence_level,
+        "resamples": resamples,
+        "accuracy": interval(accuracy),
+        "f1_macro": interval(f1.mean(axis=1)),
+        "ece": interval(calibration_errors),
+        "f1_per_class": {
+            str(label): interval(f1[:, index]) for index, label in enumerate(labels)
+        }
+    }
+
+    return intervals
+
+
+# -----------------------------
+# Evaluation Stage
+# -----------------------------
+def evaluate_model(
+    model, X_test, y_test,
+    batch_size=EVAL_BATCH_SIZE,
+    bootstrap_samples=BOOTSTRAP_SAMPLES,
+    latency_samples=LATENCY_SAMPLES,
+    n_jobs=-1
+):
+    """
+    Score the test set once (in batches) and derive everything from those
+    probabilities: confusion matrix, per-class report, calibration error
+    and bootstrap confidence intervals; then time single-text inference.
+    Prints a summary and returns the metrics dict (see save_metrics).
+    """
+    texts = list(X_test)
+    y_true = np.asarray(y_test)
+
+    probabilities, scoring_seconds = score_in_batches(model, texts, batch_size)
+
+    classes = np.asarray(model.classes_)
+    labels = np.union1d(classes, y_true)
+
+    best = probabilities.argmax(axis=1)
+    confidence = probabilities[np.arange(len(best)), best]
+
+    true_index = np.searchsorted(labels, y_true)
+    pred_index = np.searchsorted(labels, classes[best])
+
+    confusion = confusion_counts(true_index, pred_index, len(labels))
+    report = build_report(confusion, labels)
+    ece = expected_calibration_error(confidence, (true_index == pred_index).astype(float))
+
+    intervals = bootstrap_intervals(
+        true_index, pred_index, confidence, labels,
+        resamples=bootstrap_samples, n_jobs=n_jobs
+    )
+
+    latency = measure_latency(model, texts, latency_samples)
+
+    metrics = {
+        "accuracy": report["accuracy"],
+        "f1_macro": report["macro avg"]["f1-score"],
+        "report": report,
+        "confusion_matrix": {
+            "labels": [str(label) for label in labels],
+            "matrix": confusion.tolist()
+        },
+        "calibration": {"ece": ece, "bins": CALIBRATION_BINS},
+        "confidence_intervals": intervals,
+        "inference": {
+            "test_samples": len(texts),
+            "batch_size": batch_size,
+            "throughput_per_second": len(texts) / scoring_seconds if scoring_seconds else None,
+            "latency_ms": latency
+        }
+    }
 
     print("\n======================")
     print("MODEL PERFORMANCE")
     print("======================")
-    print("Accuracy:", round(accuracy, 4))
+    print("Accuracy:", round(report["accuracy"], 4))
+
+    if intervals:
+        low, high = intervals["accuracy"]
+        print(f"  {intervals['confidence_level']:.0%} CI: [{low:.4f}, {high:.4f}]")
+
+    print("Macro F1:", round(metrics["f1_macro"], 4))
+    print("ECE:", round(ece, 4))
     print("\nClassification Report:")
-    print(classification_report(y_test, predictions))
+    print(format_report(report, labels))
+    print("\nConfusion Matrix (rows: true, columns: predicted):")
+    print(f"labels {metrics['confusion_matrix']['labels']}")
+    print(confusion)
+
+    throughput = metrics["inference"]["throughput_per_second"]
+
+    if throughput:
+        print(f"\nThroughput: {throughput:,.0f} texts/s (batches of {batch_size})")
+
+    if latency:
+        print(
+            f"Latency (single text): p50 {latency['p50']:.2f} ms, "
+            f"p95 {latency['p95']:.2f} ms, p99 {latency['p99']:.2f} ms"
+        )
+
+    return metrics
+
+
+def within_latency_budget(metrics, max_p99_ms=None):
+    """
+    False when the candidate's single-text p99 latency exceeds max_p99_ms.
+    """
+    if max_p99_ms is None:
+        return True
+
+    p99 = metrics.get("inference", {}).get("latency_ms", {}).get("p99")
+
+    if p99 is None or p99 <= max_p99_ms:
+        return True
+
+    print(f"\nRejected: p99 latency {p99:.2f} ms exceeds the {max_p99_ms} ms budget")
+
+    return False
+
+
+def save_metrics(metrics, model_dir, model_version=None):
 
-    # Save metrics
     metrics_path = os.path.join(model_dir, "metrics.json")
 
+    if model_version:
+        metrics = {**metrics, "model_version": model_version}
+
     with open(metrics_path, "w") as f:
-        json.dump({
-            "accuracy": accuracy,
-            "report": report
-        }, f, indent=4)
+        json.dump(metrics, f, indent=4)
 
     print("\nMetrics saved at:", metrics_path)
 
-    return accuracy
+    return metrics_path
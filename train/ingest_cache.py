@@ -0,0 +1,169 @@
+import os
+import json
+import hashlib
+
+import pyarrow as pa
+import pyarrow.ipc
+
+# -----------------------------
+# Columnar Ingest Cache
+# -----------------------------
+#
+# Each raw source (CSV / Excel) is converted once into an Arrow IPC
+# (Feather v2) file holding its "text" and "label" columns as strings.
+# Later runs read that file batch by batch instead of re-parsing the source.
+# A JSON manifest next to it records the source's size, mtime and
+# SHA-256; the cache is rebuilt whenever the source content changes.
+
+CACHE_FORMAT_VERSION = 1
+
+SCHEMA = pa.schema([
+    ("text", pa.string()),
+    ("label", pa.string()),
+])
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _cache_paths(source_path, cache_dir):
+    name = os.path.basename(source_path)
+    return (
+        os.path.join(cache_dir, name + ".arrow"),
+        os.path.join(cache_dir, name + ".manifest.json"),
+    )
+
+
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest_path, manifest):
+    tmp_path = manifest_path + ".tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    os.replace(tmp_path, manifest_path)
+
+
+def is_fresh(source_path, cache_dir):
+    """
+    True if the cached copy matches the source. Size and mtime are checked
+    first; if only the mtime moved, the content hash decides (and the
+    manifest is updated so the next check is cheap again).
+    """
+    cache_path, manifest_path = _cache_paths(source_path, cache_dir)
+    manifest = _read_manifest(manifest_path)
+
+    if manifest is None or not os.path.exists(cache_path):
+        return False
+
+    if manifest.get("format_version") != CACHE_FORMAT_VERSION:
+        return False
+
+    stat = os.stat(source_path)
+
+    if stat.st_size != manifest["size"]:
+        return False
+
+    if stat.st_mtime_ns == manifest["mtime_ns"]:
+        return True
+
+    if file_sha256(source_path) != manifest["sha256"]:
+        return False
+
+    manifest["mtime_ns"] = stat.st_mtime_ns
+    _write_manifest(manifest_path, manifest)
+
+    return True
+
+
+def _to_string_array(series):
+    values = [
+        None if value is None or value != value else str(value)
+        for value in series.tolist()
+    ]
+    return pa.array(values, type=pa.string())
+
+
+def build_cache(source_path, cache_dir, read_chunks):
+    """
+    Convert a source into its columnar cache. read_chunks() must yield
+    DataFrames with "text" and "label" columns.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    cache_path, manifest_path = _cache_paths(source_path, cache_dir)
+
+    # Fingerprint before reading so a concurrent edit makes the cache stale
+    stat = os.stat(source_path)
+    sha256 = file_sha256(source_path)
+
+    rows = 0
+    tmp_path = cache_path + ".tmp"
+
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, SCHEMA) as writer:
+            for chunk in read_chunks():
+                batch = pa.record_batch(
+                    [_to_string_array(chunk["text"]), _to_string_array(chunk["label"])],
+                    schema=SCHEMA
+                )
+                writer.write_batch(batch)
+                rows += len(chunk)
+
+    os.replace(tmp_path, cache_path)
+
+    _write_manifest(manifest_path, {
+        "format_version": CACHE_FORMAT_VERSION,
+        "source": os.path.basename(source_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+        "rows": rows,
+    })
+
+    return cache_path
+
+
+def read_cache_chunks(cache_path, chunk_size):
+    """
+    Read the cache one record batch at a time and yield DataFrames of at
+    most chunk_size rows. Plain reads rather than a memory map: mapped
+    pages stay in the process's resident set until the whole file has
+    been touched.
+    """
+    with pa.OSFile(cache_path, "rb") as source:
+        reader = pa.ipc.open_file(source)
+
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+
+            for start in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(start, chunk_size).to_pandas()
+
+
+def cached_chunks(source_path, cache_dir, read_chunks, chunk_size):
+    """
+    Yield the source's rows from the columnar cache, (re)building the
+    cache first when it is missing or stale.
+    """
+    cache_path, _ = _cache_paths(source_path, cache_dir)
+
+    if not is_fresh(source_path, cache_dir):
+        print(f"Building ingest cache for {os.path.basename(source_path)}...")
+        build_cache(source_path, cache_dir, read_chunks)
+
+    yield from read_cache_chunks(cache_path, chunk_size)
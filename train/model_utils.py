@@ -1,7 +1,11 @@
 import os
+import glob
 import pickle
 from datetime import datetime
 
+import data_utils  # noqa: F401  (puts the project root on sys.path)
+from mental_health.runtime_model import export_runtime_model
+
 
 def save_model(model, model_dir, model_name="stress_model"):
     """
@@ -14,9 +18,46 @@ def save_model(model, model_dir, model_name="stress_model"):
 
     path = os.path.join(model_dir, file_name)
 
-    with open(path, "wb") as f:
+    # Write then rename so a server watching model_dir never loads a
+    # half-written artifact
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as f:
         pickle.dump(model, f)
 
+    os.replace(tmp_path, path)
+
     print(f"\nModel saved at: {path}")
 
     return path
+
+
+def latest_model_path(model_dir, model_name="stress_model"):
+    """
+    Path of the newest versioned model (same rule as the server's loader)
+    """
+    model_files = glob.glob(os.path.join(model_dir, f"{model_name}_*.pkl"))
+
+    if not model_files:
+        raise FileNotFoundError(f"No trained model found in {model_dir}")
+
+    return max(model_files, key=os.path.getctime)
+
+
+def save_runtime_model(model, model_path, check_texts=None):
+    """
+    Export the compact runtime artifact next to a saved model
+    (stress_model_<version>.runtime). Pipelines the runtime format cannot
+    express, such as hashing vectorizers, are skipped.
+    """
+    runtime_path = os.path.splitext(model_path)[0] + ".runtime"
+
+    try:
+        export_runtime_model(model, runtime_path, check_texts=check_texts)
+    except ValueError as error:
+        print(f"\nRuntime export skipped: {error}")
+        return None
+
+    print(f"Runtime model saved at: {runtime_path}")
+
+    return runtime_path
@@ -1,88 +1,424 @@
 import os
+import json
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
 import pandas as pd
-from data_utils import clean_text, normalize_label
+import pyarrow as pa
+import pyarrow.parquet as pq
+from data_utils import (
+    clean_texts, normalize_label, imap_bounded, TEXT_DTYPE, LABEL_DTYPE
+)
+from dedup_utils import BANDS, duplicate_masks, exact_hashes, minhash_band_keys
+from ingest_cache import cached_chunks
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(BASE_DIR)
 
 DATA_PATH = os.path.join(PROJECT_ROOT, "data", "mental_health")
 
-print("Loading datasets...")
+CACHE_DIR = os.path.join(DATA_PATH, ".ingest_cache")
 
 # -----------------------------
-# Load Dataset 1
+# Sources (file, column mapping)
 # -----------------------------
-df1 = pd.read_csv(os.path.join(DATA_PATH, "mental_health_text_classification.csv"))
-print("Dataset 1 Columns:", df1.columns)
+SOURCES = [
+    ("mental_health_text_classification.csv", {"statement": "text", "status": "label"}),
+    ("sentiment_analysis_mental_health.csv", {"statement": "text", "status": "label"}),
+    ("student_depression_text.xlsx", {"text": "text", "label": "label"}),
+]
+
+CHUNK_SIZE = 50_000
+RANDOM_STATE = 42
 
-df1 = df1.rename(columns={
-    "statement": "text",
-    "status": "label"
-})
+# Prepared datasets (and the cleaned intermediate) are Parquet files
+DATASET_SCHEMA = pa.schema([
+    ("text", pa.large_string()),
+    ("label", pa.int8()),
+])
 
-df1 = df1[["text", "label"]]
 
 # -----------------------------
-# Load Dataset 2
+# Chunked Readers
 # -----------------------------
-df2 = pd.read_csv(os.path.join(DATA_PATH, "sentiment_analysis_mental_health.csv"))
-print("Dataset 2 Columns:", df2.columns)
+def read_csv_chunks(path, columns, chunk_size):
+    # dtype=str keeps every chunk's types identical regardless of content
+    reader = pd.read_csv(path, usecols=list(columns), dtype=str, chunksize=chunk_size)
 
-df2 = df2.rename(columns={
-    "statement": "text",
-    "status": "label"
-})
+    for chunk in reader:
+        yield chunk.rename(columns=columns)[["text", "label"]]
 
-df2 = df2[["text", "label"]]
 
-# -----------------------------
-# Load Dataset 3 (Excel)
-# -----------------------------
-df3 = pd.read_excel(os.path.join(DATA_PATH, "student_depression_text.xlsx"))
-print("Dataset 3 Columns:", df3.columns)
+def read_excel_chunks(path, columns, chunk_size):
+    """
+    Stream rows from the first worksheet with openpyxl's read-only mode
+    instead of loading the whole workbook into a DataFrame.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows)
+
+        positions = [header.index(name) for name in columns]
+        names = [columns[name] for name in columns]
+
+        buffer = []
+
+        for row in rows:
+            buffer.append([_excel_value(row[i]) if i < len(row) else None for i in positions])
+
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=names)[["text", "label"]]
+                buffer = []
+
+        if buffer:
+            yield pd.DataFrame(buffer, columns=names)[["text", "label"]]
+    finally:
+        workbook.close()
+
+
+def _excel_value(value):
+    # Match pd.read_excel, which turns integral floats into ints
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def read_source_chunks(file_name, columns, chunk_size=CHUNK_SIZE, use_cache=True):
+    path = os.path.join(DATA_PATH, file_name)
+
+    if file_name.endswith((".xlsx", ".xls")):
+        def parse():
+            return read_excel_chunks(path, columns, chunk_size)
+    else:
+        def parse():
+            return read_csv_chunks(path, columns, chunk_size)
+
+    if not use_cache:
+        return parse()
+
+    return cached_chunks(path, CACHE_DIR, parse, chunk_size)
+
+
+def iter_all_chunks(chunk_size=CHUNK_SIZE, use_cache=True):
+    """
+    Yield (source index, chunk) for every source in SOURCES order.
+    """
+    for number, (file_name, columns) in enumerate(SOURCES, start=1):
+        print(f"Dataset {number}: {file_name}")
+
+        for chunk in read_source_chunks(file_name, columns, chunk_size, use_cache):
+            yield number - 1, chunk
 
-df3 = df3[["text", "label"]]
 
 # -----------------------------
-# Merge Datasets
+# Cleaning (runs in worker processes)
 # -----------------------------
-df = pd.concat([df1, df2, df3], ignore_index=True)
+def clean_chunk(item, dedup="near"):
+    """
+    Clean one source chunk and fingerprint its texts for deduplication:
+    (source, rows in, cleaned chunk, exact hashes, LSH band keys).
+    """
+    source, chunk = item
+    rows_in = len(chunk)
+
+    chunk.dropna(subset=["text"], inplace=True)
+    chunk["text"] = clean_texts(chunk["text"])
+
+    keep = (chunk["text"].str.len() > 5).to_numpy()
+    texts = chunk["text"].to_numpy()[keep].tolist()
+    labels = chunk["label"].to_numpy()[keep]
+
+    # Sent back to the parent as Arrow strings and int8 labels
+    chunk = pd.DataFrame({
+        "text": pd.array(texts, dtype=TEXT_DTYPE),
+        "label": np.fromiter(map(normalize_label, labels), dtype=LABEL_DTYPE, count=len(labels))
+    })
+
+    exact = exact_hashes(texts) if dedup != "off" else None
+    band_keys = minhash_band_keys(texts) if dedup == "near" else None
+
+    return source, rows_in, chunk, exact, band_keys
 
-print("\nCombined Shape:", df.shape)
 
 # -----------------------------
-# Clean Data
+# Stage 1: Final Dataset
 # -----------------------------
-df.dropna(subset=["text"], inplace=True)
-df["text"] = df["text"].apply(clean_text)
-df["label"] = df["label"].apply(normalize_label)
+def cleaned_schema(dedup):
+    """
+    The cleaned intermediate: texts and labels plus, per dedup mode, the
+    exact hash and one column per LSH band, so the parent reads the
+    fingerprints back one column at a time instead of holding them all.
+    """
+    fields = list(DATASET_SCHEMA)
+
+    if dedup != "off":
+        fields.append(pa.field("exact", pa.uint64()))
+
+    if dedup == "near":
+        fields.extend(pa.field(f"band_{band}", pa.uint64()) for band in range(BANDS))
+
+    return pa.schema(fields)
+
+
+def cleaned_table(chunk, exact, band_keys, schema):
+    columns = [chunk["text"].array, chunk["label"].to_numpy()]
+
+    if exact is not None:
+        columns.append(exact)
+
+    if band_keys is not None:
+        columns.extend(np.ascontiguousarray(band_keys.T))
+
+    return pa.table(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+def read_column(path, name):
+    return pq.read_table(path, columns=[name], pre_buffer=False).column(name).to_numpy()
+
+
+def write_final_dataset(final_path, workers, chunk_size, use_cache=True, dedup="near"):
+    """
+    Clean every source chunk across a process pool, drop exact and near
+    duplicates of earlier rows (dedup = "near", "exact" or "off") and
+    write the rest to final_path in source order.
+
+    Returns (rows read, label counts, per-source dedup report).
+    """
+    rows_read = 0
+    sources = []
+
+    cleaned_path = final_path + ".cleaned.tmp"
+    schema = cleaned_schema(dedup)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            pq.ParquetWriter(cleaned_path, schema) as writer:
+        cleaned_chunks = imap_bounded(
+            pool, partial(clean_chunk, dedup=dedup), iter_all_chunks(chunk_size, use_cache),
+            max_pending=2 * workers
+        )
+
+        for source, rows_in, chunk, chunk_exact, chunk_band_keys in cleaned_chunks:
+            rows_read += rows_in
+
+            sources.append(np.full(len(chunk), source, dtype=np.uint8))
+            writer.write_table(cleaned_table(chunk, chunk_exact, chunk_band_keys, schema))
 
-df = df[df["text"].str.len() > 5]
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.uint8)
+
+    if dedup == "off":
+        exact_duplicate = near_duplicate = np.zeros(len(sources), dtype=bool)
+    else:
+        exact_duplicate, near_duplicate = duplicate_masks(
+            read_column(cleaned_path, "exact"),
+            (
+                read_column(cleaned_path, f"band_{band}") for band in range(BANDS)
+            ) if dedup == "near" else None
+        )
+
+    report = dedup_report(sources, exact_duplicate, near_duplicate)
+
+    label_counts = write_kept_rows(
+        cleaned_path, final_path, ~(exact_duplicate | near_duplicate), chunk_size
+    )
+
+    os.remove(cleaned_path)
+
+    return rows_read, label_counts, report
+
+
+def write_kept_rows(cleaned_path, final_path, keep, chunk_size):
+    """
+    Copy the text and label of the rows of cleaned_path where `keep` is
+    set to final_path. Returns the label counts of the kept rows.
+    """
+    label_counts = Counter()
+
+    tmp_path = final_path + ".tmp"
+    offset = 0
+
+    batches = pq.ParquetFile(cleaned_path).iter_batches(
+        batch_size=chunk_size, columns=DATASET_SCHEMA.names
+    )
+
+    with pq.ParquetWriter(tmp_path, DATASET_SCHEMA) as writer:
+        for batch in batches:
+            kept = batch.filter(pa.array(keep[offset:offset + batch.num_rows]))
+            offset += batch.num_rows
+
+            labels, counts = np.unique(kept.column("label").to_numpy(), return_counts=True)
+            label_counts.update(dict(zip(labels.tolist(), counts.tolist())))
+
+            writer.write_batch(kept)
+
+    os.replace(tmp_path, final_path)
+
+    return label_counts
+
+
+def dedup_report(sources, exact_duplicate, near_duplicate):
+    """
+    Rows after cleaning, exact and near duplicates dropped, and rows kept,
+    per source file.
+    """
+    report = {}
+
+    for index, (file_name, _) in enumerate(SOURCES):
+        rows = sources == index
+
+        report[file_name] = {
+            "rows": int(rows.sum()),
+            "exact_duplicates": int((exact_duplicate & rows).sum()),
+            "near_duplicates": int((near_duplicate & rows).sum()),
+            "kept": int((rows & ~exact_duplicate & ~near_duplicate).sum())
+        }
+
+    return report
 
-print("\nAfter Cleaning:", df.shape)
 
 # -----------------------------
-# Save Final Dataset
+# Stage 2: Balanced Dataset
 # -----------------------------
-final_path = os.path.join(DATA_PATH, "final_stress_dataset.csv")
-df.to_csv(final_path, index=False)
+def sample_positions(label_counts, sample_size, random_state=RANDOM_STATE):
+    """
+    Positions (within each label's rows, in file order) picked by
+    df.groupby("label").sample(sample_size, random_state=random_state):
+    groups are visited in sorted label order and each draws from one
+    shared RandomState without replacement.
+    """
+    rng = np.random.RandomState(random_state)
+
+    return {
+        label: rng.choice(label_counts[label], size=sample_size, replace=False)
+        for label in sorted(label_counts)
+    }
+
+
+def take_rows(path, column, rows, chunk_size):
+    """
+    Values of `column` at the given row numbers, in the given order,
+    reading the file one batch at a time.
+    """
+    order = np.argsort(rows, kind="stable")
+    sorted_rows = rows[order]
 
-print("\nClass Distribution:")
-print(df["label"].value_counts())
+    pieces = []
+    offset = 0
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=[column]):
+        start, stop = np.searchsorted(sorted_rows, [offset, offset + batch.num_rows])
+        pieces.append(batch.column(0).take(pa.array(sorted_rows[start:stop] - offset)))
+        offset += batch.num_rows
+
+    values = pa.concat_arrays(pieces)
+    del pieces
+
+    return values.take(pa.array(np.argsort(order)))
+
+
+def write_balanced_dataset(final_path, balanced_path, label_counts, chunk_size):
+    """
+    Reproduce groupby("label").sample(min_count, random_state=42) while
+    holding only the label column and one label's sampled texts in memory
+    at a time.
+    """
+    min_count = min(label_counts.values())
+    positions = sample_positions(label_counts, min_count)
+
+    labels = read_column(final_path, "label")
+    tmp_path = balanced_path + ".tmp"
+
+    with pq.ParquetWriter(tmp_path, DATASET_SCHEMA) as writer:
+        for label in sorted(positions):
+            # File rows of the label's sampled positions, in sample order
+            rows = np.flatnonzero(labels == label)[positions[label]]
+
+            writer.write_table(
+                pa.table(
+                    [
+                        take_rows(final_path, "text", rows, chunk_size),
+                        pa.array(np.full(len(rows), label, dtype=LABEL_DTYPE))
+                    ],
+                    schema=DATASET_SCHEMA
+                ),
+                row_group_size=chunk_size
+            )
+
+    os.replace(tmp_path, balanced_path)
+
+    return {label: min_count for label in positions}
 
-print("\nFinal dataset saved at:", final_path)
 
 # -----------------------------
-# Balance Dataset
+# Main
 # -----------------------------
-min_count = df["label"].value_counts().min()
+def main():
+    parser = argparse.ArgumentParser(description="Prepare the stress datasets")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="parse the raw sources directly instead of the columnar ingest cache"
+    )
+    parser.add_argument(
+        "--dedup", choices=["near", "exact", "off"], default="near",
+        help="drop exact (hashed cleaned text) and near (MinHash/LSH) duplicates"
+    )
+    args = parser.parse_args()
+
+    print("Loading datasets...")
+
+    final_path = os.path.join(DATA_PATH, "final_stress_dataset.parquet")
+
+    rows_read, label_counts, report = write_final_dataset(
+        final_path, args.workers, args.chunk_size,
+        use_cache=not args.no_cache, dedup=args.dedup
+    )
+
+    print("\nCombined Rows:", rows_read)
+    print("\nAfter Cleaning:", sum(source["rows"] for source in report.values()))
+    print("\nAfter Deduplication:", sum(label_counts.values()))
+
+    print("\nRows Lost per Source (exact / near duplicates):")
+    for file_name, source in report.items():
+        print(
+            f"{file_name}: {source['rows'] - source['kept']} "
+            f"({source['exact_duplicates']} / {source['near_duplicates']}), "
+            f"{source['kept']} kept"
+        )
+
+    report_path = os.path.join(DATA_PATH, "dedup_report.json")
+
+    with open(report_path, "w") as f:
+        json.dump({"mode": args.dedup, "sources": report}, f, indent=4)
+
+    print("\nClass Distribution:")
+    for label, count in label_counts.most_common():
+        print(label, count)
+
+    print("\nFinal dataset saved at:", final_path)
+
+    balanced_path = os.path.join(DATA_PATH, "balanced_stress_dataset.parquet")
+
+    balanced_counts = write_balanced_dataset(
+        final_path, balanced_path, label_counts, args.chunk_size
+    )
 
-balanced_df = df.groupby("label").sample(min_count, random_state=42)
+    print("\nBalanced Distribution:")
+    for label, count in balanced_counts.items():
+        print(label, count)
 
-balanced_path = os.path.join(DATA_PATH, "balanced_stress_dataset.csv")
-balanced_df.to_csv(balanced_path, index=False)
+    print("\nBalanced dataset saved at:", balanced_path)
 
-print("\nBalanced Distribution:")
-print(balanced_df["label"].value_counts())
 
-print("\nBalanced dataset saved at:", balanced_path)
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
 import os
 import json
+import time
 import pickle
+import argparse
+import itertools
+import numpy as np
 import pandas as pd
 
-from datetime import datetime
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from joblib import Parallel, delayed
+from sklearn.model_selection import train_test_split, StratifiedKFold
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import Pipeline
-from sklearn.metrics import classification_report, accuracy_score
+from sklearn.metrics import accuracy_score, f1_score
+
+from data_utils import iter_dataset_chunks
+from evaluation_utils import evaluate_model, save_metrics, within_latency_budget
+from model_utils import save_model, save_runtime_model, latest_model_path
 
 
 # =====================================
@@ -20,117 +28,506 @@ DATA_PATH = os.path.join(
     BASE_DIR,
     "data",
     "mental_health",
-    "balanced_stress_dataset.csv"
+    "balanced_stress_dataset.parquet"
 )
 
 MODEL_DIR = os.path.join(BASE_DIR, "models", "mental_health")
-os.makedirs(MODEL_DIR, exist_ok=True)
 
+# Stress levels: 0 = Low, 1 = Moderate, 2 = High
+CLASSES = np.array([0, 1, 2])
 
-# =====================================
-# Load Dataset
-# =====================================
-df = pd.read_csv(DATA_PATH)
+# Default configuration (used by batch mode)
+VECTORIZER_PARAMS = {
+    "max_features": 10000,
+    "ngram_range": (1, 2),
+    "stop_words": "english",
+    "lowercase": True
+}
 
-print("Dataset Loaded:", df.shape)
+CLASSIFIER_PARAMS = {
+    "max_iter": 1000,
+    "class_weight": "balanced",
+    "solver": "lbfgs"
+}
 
+# Search space for --mode search (override with --search-grid FILE.json)
+SEARCH_GRID = {
+    "vectorizer": {
+        "max_features": [10000, 20000, 50000],
+        "ngram_range": [(1, 1), (1, 2)],
+        "sublinear_tf": [False, True]
+    },
+    "classifier": {
+        "C": [0.5, 1.0, 2.0, 4.0]
+    }
+}
 
-# =====================================
-# Text Cleaning
-# =====================================
-df = df.dropna(subset=["text"])
-df["text"] = df["text"].astype(str)
-df["text"] = df["text"].str.strip()
-df = df[df["text"] != ""]
 
-print("After Cleaning:", df.shape)
+def build_pipeline(vectorizer_params=None, classifier_params=None):
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(**{**VECTORIZER_PARAMS, **(vectorizer_params or {})})),
+        ("clf", LogisticRegression(**{**CLASSIFIER_PARAMS, **(classifier_params or {})}))
+    ])
 
 
-# =====================================
-# Features & Labels
-# =====================================
-X = df["text"]
-y = df["label"]
+def evaluate_candidate(pipeline, X_test, y_test, args):
+    """
+    Metrics for a trained candidate, or None when it is too slow to
+    deploy (--max-p99-latency-ms); rejected candidates are not saved.
+    """
+    metrics = evaluate_model(
+        pipeline, X_test, y_test,
+        bootstrap_samples=args.bootstrap_samples,
+        latency_samples=args.latency_samples,
+        n_jobs=args.workers
+    )
 
+    if not within_latency_budget(metrics, args.max_p99_latency_ms):
+        return None
 
-# =====================================
-# Train/Test Split
-# =====================================
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
+    return metrics
 
 
-# =====================================
-# NLP Pipeline
-# =====================================
-pipeline = Pipeline([
-    ("tfidf", TfidfVectorizer(
-        max_features=10000,
-        ngram_range=(1, 2),
-        stop_words="english",
-        lowercase=True
-    )),
-    ("clf", LogisticRegression(
-        max_iter=1000,
-        class_weight="balanced",
-        solver="lbfgs"
-    ))
-])
+def load_train_test_split(data_path, test_size=0.2, random_state=42, chunk_size=100_000):
+    """
+    Stratified train/test split of a prepared dataset's non-blank texts
+    without holding the whole text column next to both splits: the split
+    is drawn from the labels alone, then each side's texts are read from
+    the file. Rows keep their file order within each split.
+    """
+    usable, labels = [], []
+
+    for chunk in iter_dataset_chunks(data_path, chunk_size):
+        usable.append((chunk["text"].str.strip() != "").fillna(False).to_numpy(dtype=bool))
+        labels.append(chunk["label"].to_numpy())
+
+    usable, labels = np.concatenate(usable), np.concatenate(labels)
+    rows = np.flatnonzero(usable)
+
+    print("Dataset Loaded:", (len(usable), 2))
+    print("After Cleaning:", (len(rows), 2))
+
+    train_rows, test_rows = (
+        np.sort(side) for side in train_test_split(
+            rows, test_size=test_size, random_state=random_state, stratify=labels[rows]
+        )
+    )
+
+    pieces = ([], [])
+    offset = 0
+
+    for chunk in iter_dataset_chunks(data_path, chunk_size, columns=("text",)):
+        for wanted, side in zip((train_rows, test_rows), pieces):
+            start, stop = np.searchsorted(wanted, [offset, offset + len(chunk)])
+            side.append(chunk["text"].iloc[wanted[start:stop] - offset].str.strip())
+
+        offset += len(chunk)
+
+    # Concatenating Arrow-backed pieces keeps them as chunks (no copy)
+    X_train, X_test = (pd.concat(side, ignore_index=True) for side in pieces)
+
+    return (
+        X_train, X_test,
+        pd.Series(labels[train_rows], name="label"),
+        pd.Series(labels[test_rows], name="label")
+    )
 
 
 # =====================================
-# Train Model
+# Batch Mode (in-memory TF-IDF + LR)
 # =====================================
-print("\nTraining model...")
-pipeline.fit(X_train, y_train)
+def train_batch(args):
+
+    # =====================================
+    # Load + Train/Test Split
+    # =====================================
+    X_train, X_test, y_train, y_test = load_train_test_split(args.data)
+
+    # =====================================
+    # NLP Pipeline
+    # =====================================
+    pipeline = build_pipeline()
+
+    # =====================================
+    # Train Model
+    # =====================================
+    print("\nTraining model...")
+    pipeline.fit(X_train, y_train)
+
+    # =====================================
+    # Evaluation
+    # =====================================
+    metrics = evaluate_candidate(pipeline, X_test, y_test, args)
+
+    if metrics is None:
+        return
+
+    # =====================================
+    # Save Versioned Model
+    # =====================================
+    model_path = save_model(pipeline, MODEL_DIR)
+
+    save_runtime_model(pipeline, model_path, check_texts=list(X_test[:1000]))
+
+    # =====================================
+    # Save Metrics
+    # =====================================
+    save_metrics(metrics, MODEL_DIR, model_version=os.path.basename(model_path))
 
 
 # =====================================
-# Evaluation
+# Streaming Mode (out-of-core)
 # =====================================
-y_pred = pipeline.predict(X_test)
+def build_streaming_pipeline(n_features):
+    """
+    Stateless hashing features + a linear model trained with partial_fit,
+    so no vocabulary or full dataset has to fit in memory.
+    """
+    return Pipeline([
+        ("hash", HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words="english",
+            lowercase=True,
+            alternate_sign=False
+        )),
+        ("clf", SGDClassifier(
+            loss="log_loss",
+            alpha=1e-6,
+            random_state=42
+        ))
+    ])
+
+
+def load_resumable_pipeline(path):
+    with open(path, "rb") as f:
+        pipeline = pickle.load(f)
+
+    steps = getattr(pipeline, "steps", None)
+
+    if (
+        not steps
+        or not isinstance(steps[0][1], HashingVectorizer)
+        or not hasattr(steps[-1][1], "partial_fit")
+    ):
+        raise ValueError(
+            f"{os.path.basename(path)} is not a streaming (hashing + partial_fit) "
+            "model and cannot be trained incrementally"
+        )
+
+    return pipeline
+
+
+def iter_minibatches(data_path, batch_size, shuffle_buffer, seed=42):
+    """
+    Stream (texts, labels) minibatches drawn at random from a buffer of up
+    to shuffle_buffer rows. SGD needs mixed classes in every minibatch,
+    and prepared datasets are grouped by label; inputs much larger than
+    the buffer should be shuffled beforehand.
+    """
+    rng = np.random.RandomState(seed)
+    buffer_texts, buffer_labels = [], []
+
+    def pop_batch(size):
+        picked = np.sort(rng.choice(len(buffer_texts), size=size, replace=False))[::-1]
+        texts, labels = [], []
+
+        # Swap each picked row with the last one and pop it: O(size)
+        for index in picked:
+            buffer_texts[index], buffer_texts[-1] = buffer_texts[-1], buffer_texts[index]
+            buffer_labels[index], buffer_labels[-1] = buffer_labels[-1], buffer_labels[index]
+            texts.append(buffer_texts.pop())
+            labels.append(buffer_labels.pop())
+
+        return texts, np.asarray(labels, dtype=int)
+
+    for chunk in iter_dataset_chunks(data_path, batch_size):
+        chunk = chunk.dropna(subset=["text"])
+        texts = chunk["text"].astype(str).str.strip()
+        keep = (texts != "").to_numpy()
+
+        buffer_texts.extend(texts[keep].tolist())
+        buffer_labels.extend(chunk["label"].to_numpy()[keep].tolist())
+
+        while len(buffer_texts) >= max(shuffle_buffer, batch_size):
+            yield pop_batch(batch_size)
+
+    while buffer_texts:
+        yield pop_batch(min(batch_size, len(buffer_texts)))
+
+
+def train_streaming(args):
+    if args.resume:
+        resume_path = latest_model_path(MODEL_DIR) if args.resume == "latest" else args.resume
+        pipeline = load_resumable_pipeline(resume_path)
+        print("Resuming from:", resume_path)
+    else:
+        pipeline = build_streaming_pipeline(args.n_features)
+
+    vectorizer = pipeline.steps[0][1]
+    classifier = pipeline.steps[-1][1]
+
+    # Deterministic holdout: each row goes to test with probability
+    # test_size until max_holdout rows are taken; every epoch replays
+    # the same draws so test rows are never trained on
+    rng = np.random.RandomState(42)
+    X_test, y_test = [], []
+    seen = 0
+
+    print("\nTraining model (streaming)...")
+
+    for epoch in range(args.epochs):
+        rng.seed(42)
+        taken = 0
+
+        batches = iter_minibatches(args.data, args.batch_size, args.shuffle_buffer)
+
+        for texts, labels in batches:
+            draws = rng.random_sample(len(texts)) < args.test_size
+            test_index = np.flatnonzero(draws)[:max(0, args.max_holdout - taken)]
+            taken += len(test_index)
+
+            if epoch == 0:
+                X_test.extend(texts[i] for i in test_index)
+                y_test.extend(labels[test_index].tolist())
+
+            train_mask = np.ones(len(texts), dtype=bool)
+            train_mask[test_index] = False
 
-accuracy = accuracy_score(y_test, y_pred)
-report = classification_report(y_test, y_pred, output_dict=True)
+            if not train_mask.any():
+                continue
 
-print("\n============================")
-print("MODEL PERFORMANCE")
-print("============================")
-print("Accuracy:", round(accuracy, 4))
-print("\nClassification Report:\n")
-print(classification_report(y_test, y_pred))
+            features = vectorizer.transform(
+                [text for text, keep in zip(texts, train_mask) if keep]
+            )
+            classifier.partial_fit(features, labels[train_mask], classes=CLASSES)
+
+            seen += int(train_mask.sum())
+
+        print(f"Epoch {epoch + 1}/{args.epochs}: {seen} training rows so far")
+
+    metrics = evaluate_candidate(pipeline, X_test, y_test, args) if X_test else None
+
+    if X_test and metrics is None:
+        return
+
+    model_path = save_model(pipeline, MODEL_DIR)
+
+    if metrics:
+        save_metrics(metrics, MODEL_DIR, model_version=os.path.basename(model_path))
 
 
 # =====================================
-# Save Versioned Model
+# Search Mode (parallel grid search)
 # =====================================
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-model_filename = f"stress_model_{timestamp}.pkl"
-MODEL_PATH = os.path.join(MODEL_DIR, model_filename)
+def expand_grid(grid):
+    names = sorted(grid)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def load_search_grid(path):
+    if not path:
+        return SEARCH_GRID
+
+    with open(path) as f:
+        grid = json.load(f)
+
+    # JSON has no tuples; n-gram ranges arrive as lists
+    if "ngram_range" in grid.get("vectorizer", {}):
+        grid["vectorizer"]["ngram_range"] = [
+            tuple(value) for value in grid["vectorizer"]["ngram_range"]
+        ]
+
+    return grid
+
+
+def evaluate_fold(vectorizer_params, classifier_grid, texts, labels, train_index, val_index):
+    """
+    Fit the vectorizer once for this (vectorizer config, fold) and score
+    every classifier candidate on the same feature matrices.
+    """
+    start = time.perf_counter()
+
+    vectorizer = TfidfVectorizer(**{**VECTORIZER_PARAMS, **vectorizer_params})
+    X_train = vectorizer.fit_transform(texts[train_index])
+    X_val = vectorizer.transform(texts[val_index])
+
+    vectorize_seconds = time.perf_counter() - start
+
+    results = []
+
+    for classifier_params in classifier_grid:
+        start = time.perf_counter()
+
+        classifier = LogisticRegression(**{**CLASSIFIER_PARAMS, **classifier_params})
+        classifier.fit(X_train, labels[train_index])
+        predictions = classifier.predict(X_val)
+
+        results.append({
+            "vectorizer": vectorizer_params,
+            "classifier": classifier_params,
+            "accuracy": accuracy_score(labels[val_index], predictions),
+            "f1_macro": f1_score(labels[val_index], predictions, average="macro"),
+            "fit_seconds": time.perf_counter() - start + vectorize_seconds
+        })
+
+    return results
+
+
+def train_search(args):
+    X_train, X_test, y_train, y_test = load_train_test_split(args.data)
+
+    grid = load_search_grid(args.search_grid)
+    vectorizer_grid = expand_grid(grid.get("vectorizer", {}))
+    classifier_grid = expand_grid(grid.get("classifier", {}))
+
+    # Folds index the Arrow-backed array (no object copy of every text)
+    texts = X_train.array
+    labels = y_train.to_numpy()
+
+    folds = list(
+        StratifiedKFold(n_splits=args.cv, shuffle=True, random_state=42).split(texts, labels)
+    )
+
+    print(
+        f"\nSearching {len(vectorizer_grid) * len(classifier_grid)} candidates "
+        f"x {args.cv} folds on {args.workers} workers..."
+    )
 
-with open(MODEL_PATH, "wb") as f:
-    pickle.dump(pipeline, f)
+    fold_results = Parallel(n_jobs=args.workers)(
+        delayed(evaluate_fold)(
+            vectorizer_params, classifier_grid, texts, labels, train_index, val_index
+        )
+        for vectorizer_params in vectorizer_grid
+        for train_index, val_index in folds
+    )
 
-print("\n✅ Model saved at:")
-print(MODEL_PATH)
+    # Aggregate folds per candidate
+    candidates = {}
+
+    for result in itertools.chain.from_iterable(fold_results):
+        key = json.dumps([result["vectorizer"], result["classifier"]], sort_keys=True)
+        candidates.setdefault(key, []).append(result)
+
+    leaderboard = []
+
+    for results in candidates.values():
+        entry = {
+            "vectorizer": {
+                name: list(value) if isinstance(value, tuple) else value
+                for name, value in results[0]["vectorizer"].items()
+            },
+            "classifier": results[0]["classifier"]
+        }
+
+        for metric in ("accuracy", "f1_macro", "fit_seconds"):
+            values = np.array([result[metric] for result in results])
+            entry[f"mean_{metric}"] = float(values.mean())
+            entry[f"std_{metric}"] = float(values.std())
+
+        leaderboard.append(entry)
+
+    leaderboard.sort(key=lambda entry: entry[f"mean_{args.search_metric}"], reverse=True)
+
+    for rank, entry in enumerate(leaderboard, start=1):
+        entry["rank"] = rank
+
+    leaderboard_path = os.path.join(MODEL_DIR, "search_leaderboard.json")
+
+    with open(leaderboard_path, "w") as f:
+        json.dump({
+            "metric": args.search_metric,
+            "cv_folds": args.cv,
+            "leaderboard": leaderboard
+        }, f, indent=4)
+
+    print("\nTop candidates:")
+    for entry in leaderboard[:5]:
+        print(
+            f"#{entry['rank']} {args.search_metric}="
+            f"{entry[f'mean_{args.search_metric}']:.4f} "
+            f"vectorizer={entry['vectorizer']} classifier={entry['classifier']}"
+        )
+
+    print("\nLeaderboard saved at:", leaderboard_path)
+
+    # Refit the winner on the full training split and save it
+    best = leaderboard[0]
+    best_vectorizer = dict(best["vectorizer"])
+
+    if "ngram_range" in best_vectorizer:
+        best_vectorizer["ngram_range"] = tuple(best_vectorizer["ngram_range"])
+
+    print("\nTraining best candidate...")
+    pipeline = build_pipeline(best_vectorizer, best["classifier"])
+    pipeline.fit(X_train, y_train)
+
+    metrics = evaluate_candidate(pipeline, X_test, y_test, args)
+
+    if metrics is None:
+        return
+
+    model_path = save_model(pipeline, MODEL_DIR)
+    save_runtime_model(pipeline, model_path, check_texts=list(X_test[:1000]))
+
+    save_metrics(metrics, MODEL_DIR, model_version=os.path.basename(model_path))
 
 
 # =====================================
-# Save Metrics
+# Entry Point
 # =====================================
-metrics_path = os.path.join(MODEL_DIR, "metrics.json")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the stress classifier")
+    parser.add_argument("--mode", choices=["batch", "streaming", "search"], default="batch")
+    parser.add_argument("--data", default=DATA_PATH)
+
+    streaming = parser.add_argument_group("streaming mode")
+    streaming.add_argument("--batch-size", type=int, default=50_000)
+    streaming.add_argument("--epochs", type=int, default=1)
+    streaming.add_argument("--shuffle-buffer", type=int, default=1_000_000)
+    streaming.add_argument("--n-features", type=int, default=2 ** 20)
+    streaming.add_argument("--test-size", type=float, default=0.2)
+    streaming.add_argument("--max-holdout", type=int, default=200_000)
+    streaming.add_argument(
+        "--resume", metavar="PATH|latest",
+        help="continue training an existing streaming model artifact"
+    )
+
+    search = parser.add_argument_group("search mode")
+    search.add_argument(
+        "--workers", type=int, default=-1,
+        help="search and bootstrap processes; -1 uses all cores"
+    )
+    search.add_argument("--cv", type=int, default=3)
+    search.add_argument("--search-metric", choices=["accuracy", "f1_macro"], default="accuracy")
+    search.add_argument("--search-grid", metavar="FILE.json")
+
+    evaluation = parser.add_argument_group("evaluation")
+    evaluation.add_argument("--bootstrap-samples", type=int, default=1000)
+    evaluation.add_argument("--latency-samples", type=int, default=500)
+    evaluation.add_argument(
+        "--max-p99-latency-ms", type=float,
+        help="reject (do not save) a candidate slower than this per text"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    os.makedirs(MODEL_DIR, exist_ok=True)
+
+    if args.mode == "streaming":
+        train_streaming(args)
+    elif args.mode == "search":
+        train_search(args)
+    else:
+        train_batch(args)
 
-with open(metrics_path, "w") as f:
-    json.dump({
-        "accuracy": accuracy,
-        "report": report,
-        "model_version": model_filename
-    }, f, indent=4)
 
-print("\n📊 Metrics saved at:")
-print(metrics_path)
+if __name__ == "__main__":
+    main()